@@ -0,0 +1 @@
+"""Benchmarks sin ventana (`python -m benchmarks`, ver `__main__.py`)."""
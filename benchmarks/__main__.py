@@ -0,0 +1,83 @@
+"""
+Benchmarks sin ventana de los caminos calientes del juego.
+
+    PYTHONPATH=src python -m benchmarks                  # corre todo
+    PYTHONPATH=src python -m benchmarks -k render        # sólo los que contienen "render"
+    PYTHONPATH=src python -m benchmarks --guardar-base   # fija la base de esta máquina
+    PYTHONPATH=src python -m benchmarks --comparar       # marca regresiones (sale con 1)
+
+Los resultados van a `benchmarks/resultados.json`. Todo corre con
+SDL_VIDEODRIVER=dummy y dentro de un directorio temporal.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from . import harness
+from . import bench_render, bench_sim, bench_io  # noqa: F401  (registran los benchmarks)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTADOS = os.path.join(HERE, "resultados.json")
+BASE = os.path.join(HERE, "base.json")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks de Equestrian Challenge")
+    parser.add_argument("-k", dest="filtro", default="", help="corre sólo los benchmarks cuyo nombre contiene esto")
+    parser.add_argument("--salida", default=RESULTADOS, help="JSON con los resultados")
+    parser.add_argument("--base", default=BASE, help="JSON de referencia para --comparar / --guardar-base")
+    parser.add_argument("--comparar", action="store_true", help="compara contra la base y marca regresiones")
+    parser.add_argument("--guardar-base", action="store_true", help="guarda estos resultados como base")
+    parser.add_argument("--umbral", type=float, default=harness.UMBRAL,
+                        help="empeoramiento tolerado antes de marcar regresión (0.10 = 10 %%)")
+    parser.add_argument("--rapido", action="store_true", help="menos tiempo por benchmark (más ruido)")
+    parser.add_argument("--listar", action="store_true", help="sólo lista los benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.listar:
+        for name in harness.BENCHES:
+            print(name)
+        return 0
+
+    rutas = [os.path.abspath(p) for p in (args.salida, args.base)]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="equestrian-bench-") as tmp:
+        # historial, progreso, telemetría y trazas se escriben acá y se descartan
+        os.chdir(tmp)
+        try:
+            if args.rapido:
+                data = harness.correr(args.filtro, min_time=0.05, repeat=3)
+            else:
+                data = harness.correr(args.filtro)
+            # compactar acá: si no, el atexit del escritor lo haría en el cwd original
+            from equestrian.services.persistence import flush_progreso
+            flush_progreso(compactar=True)
+        finally:
+            os.chdir(cwd)
+
+    salida, base_path = rutas
+    harness.guardar(data, salida)
+    print(f"\nResultados en {salida}")
+    if args.guardar_base:
+        harness.guardar(data, base_path)
+        print(f"Base guardada en {base_path}")
+
+    if args.comparar:
+        base = harness.cargar(base_path)
+        if base is None:
+            print(f"No hay base en {base_path}: corré primero con --guardar-base")
+            return 2
+        regresiones = harness.comparar(data, base, args.umbral)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresión(es) de más de {args.umbral:.0%}: {', '.join(regresiones)}")
+            return 1
+        print("\nSin regresiones.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
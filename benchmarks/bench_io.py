@@ -0,0 +1,82 @@
+"""
+Historial y progreso con tamaños realistas. Corre dentro del directorio
+temporal que arma `python -m benchmarks`, así que no toca los archivos del juego.
+"""
+import json
+import os
+
+from .harness import bench
+
+HISTORY_ROWS = 5000
+PROGRESS_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "equestrian_progress.json")
+
+
+def _entrada(i: int) -> dict:
+    return {
+        "timestamp": f"2025-11-07 10:{i // 60 % 60:02d}:{i % 60:02d}",
+        "jugador": f"Jinete {i % 37}",
+        "puntos": 100 * (i % 13),
+        "caballo": "Cazadora",
+        "sexo": "Yegua",
+        "raza": "Pura Sangre",
+        "clima": ("Soleado", "Lluvioso", "Ventoso", "Barro")[i % 4],
+        "tiempo": round(30 + (i * 7919 % 1500) / 100, 2),
+        "gano": i % 3 == 0,
+    }
+
+
+def _historial_lleno() -> None:
+    """Base con HISTORY_ROWS filas, armada por la migración del JSON viejo."""
+    from equestrian.services import history
+
+    if os.path.exists(history.HISTORY_DB):
+        return
+    with open(history.HISTORY_FILE, "w", encoding="utf-8") as f:
+        json.dump([_entrada(i) for i in range(HISTORY_ROWS)], f)
+    history.load_history(limit=1)
+
+
+@bench("history.append")
+def _append():
+    from equestrian.services.history import append_history
+
+    _historial_lleno()
+    entry = _entrada(HISTORY_ROWS)
+
+    def run():
+        append_history(entry)
+    return run
+
+
+@bench("history.load_ultimas_5")
+def _load():
+    from equestrian.services.history import load_history
+
+    _historial_lleno()
+
+    def run():
+        load_history(limit=5)
+    return run
+
+
+@bench("progreso.guardar_y_flush")
+def _guardar():
+    from equestrian.services.persistence import guardar_progreso, flush_progreso
+
+    # el progreso real del repo (incluye la lista vieja `last_race_perf`)
+    try:
+        with open(PROGRESS_FIXTURE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    data["last_ranking"] = [f"{i + 1}. Rival {i}" for i in range(201)]
+    counter = [0]
+
+    def run():
+        # cambia una clave por llamada: cada guardado es un delta real en el journal
+        counter[0] += 1
+        data["puntos"] = counter[0]
+        guardar_progreso(data)
+        flush_progreso()
+    return run
@@ -0,0 +1,144 @@
+"""Dibujo: helpers del engine, texto y frames completos de `_carrera`."""
+import itertools
+
+from .harness import bench, screen
+
+RACE_FRAMES = 120
+LONG_TEXT = ("Cuanto más preciso el ritmo de pulsos, mayor velocidad. Pulsa ESPACIO "
+             "repetidamente para acelerar durante la carrera y usá el agua con H.")
+
+
+@bench("render.horse_sprite")
+def _horse_sprite():
+    from equestrian.game.engine import _draw_horse_sprite, GROUND_Y
+
+    s = screen()
+    phases = itertools.cycle([i * 0.1 for i in range(63)])
+
+    def run():
+        _draw_horse_sprite(s, 400, GROUND_Y, 1.0, (130, 92, 54), (95, 72, 46), (60, 100, 190),
+                           next(phases), 0.0, True, 0.5)
+    return run
+
+
+@bench("render.side_background")
+def _side_background():
+    from equestrian.game.engine import _draw_side_background
+
+    s = screen()
+    cams = itertools.cycle(range(0, 3500, 7))
+
+    def run():
+        _draw_side_background(s, next(cams), "Soleado")
+    return run
+
+
+@bench("render.fence")
+def _fence():
+    from equestrian.game.engine import _draw_fence
+
+    s = screen()
+    offsets = itertools.cycle(range(0, -80, -1))
+
+    def run():
+        _draw_fence(s, next(offsets))
+    return run
+
+
+@bench("render.gradient_rect")
+def _gradient():
+    from equestrian.game.engine import _gradient_rect, THEME_PRIMARY, THEME_SECONDARY, WIDTH, HEIGHT
+
+    s = screen()
+
+    def run():
+        _gradient_rect(s, THEME_PRIMARY, THEME_SECONDARY, (0, 0, WIDTH, HEIGHT))
+    return run
+
+
+@bench("render.card")
+def _card():
+    import pygame
+    from equestrian.game.engine import _draw_card
+
+    s = screen()
+    rect = pygame.Rect(140, 120, 680, 280)
+
+    def run():
+        _draw_card(s, rect, border=22)
+    return run
+
+
+@bench("text.wrap")
+def _wrap():
+    from equestrian.game.engine import _wrap_text, FONT_NAME
+    from equestrian.game.text import get_font
+
+    screen()
+    font = get_font(FONT_NAME, 18)
+
+    def run():
+        _wrap_text(font, LONG_TEXT, 400)
+    return run
+
+
+@bench("text.wrap_sin_cache")
+def _wrap_uncached():
+    from equestrian.game.engine import FONT_NAME
+    from equestrian.game.text import get_font, _wrap_uncached
+
+    screen()
+    font = get_font(FONT_NAME, 18)
+
+    def run():
+        _wrap_uncached(font, LONG_TEXT, 400)
+    return run
+
+
+class _RelojGuion:
+    """Reemplazo de `pygame.time.Clock`: no duerme, tapea y sale con ESC al frame `frames`."""
+
+    def __init__(self, frames: int):
+        self.frames = frames
+        self.n = 0
+
+    def tick(self, fps: int = 0) -> int:
+        import pygame
+
+        self.n += 1
+        if self.n % 4 == 0:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, unicode=" ", mod=0))
+        if self.n == self.frames:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, unicode="", mod=0))
+        return 1000 // 60
+
+    def get_fps(self) -> float:
+        return 60.0
+
+
+def _carrera_frames(rivales: int):
+    import pygame
+    from equestrian.game.engine import _carrera, FONT_NAME
+    from equestrian.game.text import get_font
+    from equestrian.domain import PuraSangre, Jinete
+
+    s = screen()
+    font = get_font(FONT_NAME, 22)
+    hudfont = get_font(FONT_NAME, 18)
+
+    def run():
+        pygame.event.clear()
+        # +1: el primer tick de _carrera descarta el tiempo del menú
+        _carrera(s, _RelojGuion(RACE_FRAMES + 1), font, hudfont, PuraSangre("Luna"), Jinete("Oriana"),
+                 "Soleado", {}, seed=7, rivales=rivales)
+    return run
+
+
+@bench("carrera.frame_3_rivales", per=RACE_FRAMES)
+def _frame_3():
+    return _carrera_frames(3)
+
+
+@bench("carrera.frame_200_rivales", per=RACE_FRAMES)
+def _frame_200():
+    return _carrera_frames(200)
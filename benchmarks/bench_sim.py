@@ -0,0 +1,65 @@
+"""Física de la carrera sin ventana (`equestrian.sim`)."""
+from .harness import bench
+
+
+def _steps(rivales: int):
+    from equestrian import sim
+    from equestrian.domain import PuraSangre
+
+    box = {}
+
+    def nueva():
+        box["state"] = sim.nueva_carrera(PuraSangre("Luna"), "Soleado", rivales=rivales, seed=11)
+
+    nueva()
+    inputs = sim.RaceInputs(taps=1)
+
+    def run():
+        state = box["state"]
+        if state.finished:
+            nueva()
+            state = box["state"]
+        sim.step(state, sim.PHYSICS_DT, inputs)
+    return run
+
+
+@bench("sim.step_3_rivales")
+def _step_3():
+    return _steps(3)
+
+
+@bench("sim.step_200_rivales")
+def _step_200():
+    return _steps(200)
+
+
+def _carreras(motor: str, rivales: int):
+    from equestrian import sim
+    from equestrian.domain import PuraSangre
+
+    correr = getattr(sim, motor)
+    seeds = iter(range(1 << 30))
+
+    def run():
+        correr(sim.nueva_carrera(PuraSangre("Luna"), "Soleado", rivales=rivales, seed=next(seeds)))
+    return run
+
+
+@bench("sim.simular_carrera")
+def _simular():
+    return _carreras("simular", 3)
+
+
+@bench("sim.simular_eventos")
+def _eventos():
+    return _carreras("simular_eventos", 3)
+
+
+@bench("sim.simular_carrera_200_rivales")
+def _simular_200():
+    return _carreras("simular", 200)
+
+
+@bench("sim.simular_eventos_200_rivales")
+def _eventos_200():
+    return _carreras("simular_eventos", 200)
@@ -0,0 +1,145 @@
+"""
+Medición, resultados en JSON y comparación contra una base guardada.
+
+Cada benchmark es una fábrica registrada con `@bench(nombre)`: la fábrica
+prepara todo (fuera del tiempo medido) y devuelve el callable a medir.
+"""
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+Factory = Callable[[], Callable[[], None]]
+
+BENCHES: Dict[str, Tuple[Factory, int]] = {}
+MIN_TIME = 0.2   # segundos por repetición (se ajusta la cantidad de llamadas)
+REPEAT = 5
+UMBRAL = 0.10    # más de un 10 % más lento que la base cuenta como regresión
+
+_screen = None
+
+
+def bench(name: str, per: int = 1):
+    """
+    Registra una fábrica. `per` divide el tiempo de cada llamada (p. ej. una
+    carrera de 120 frames reporta el tiempo por frame).
+    """
+    def deco(factory: Factory) -> Factory:
+        BENCHES[name] = (factory, per)
+        return factory
+    return deco
+
+
+def screen():
+    """Ventana compartida con el driver `dummy` (sin monitor)."""
+    global _screen
+    if _screen is None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from equestrian.game.engine import WIDTH, HEIGHT
+
+        pygame.display.init()
+        pygame.font.init()
+        _screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    return _screen
+
+
+def _time(fn: Callable[[], None], loops: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(loops):
+        fn()
+    return (time.perf_counter_ns() - start) / 1e9
+
+
+def medir(fn: Callable[[], None], per: int = 1, min_time: float = MIN_TIME,
+          repeat: int = REPEAT) -> Dict[str, float]:
+    """Como `timeit`: calibra las llamadas por repetición y toma `repeat` repeticiones."""
+    gc_was_on = gc.isenabled()
+    gc.disable()
+    try:
+        fn()  # calentamiento (cachés, imports)
+        loops = 1
+        while True:
+            elapsed = _time(fn, loops)
+            if elapsed >= min_time or loops >= 1 << 20:
+                break
+            loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+        times = [_time(fn, loops) / loops / per * 1e6 for _ in range(repeat)]
+    finally:
+        if gc_was_on:
+            gc.enable()
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "min_us": round(min(times), 3),
+        "median_us": round(statistics.median(times), 3),
+        "max_us": round(max(times), 3),
+    }
+
+
+def correr(filtro: str = "", min_time: float = MIN_TIME, repeat: int = REPEAT) -> Dict[str, object]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name, (factory, per) in BENCHES.items():
+        if filtro and filtro not in name:
+            continue
+        fn = factory()
+        results[name] = medir(fn, per, min_time, repeat)
+        print(f"{name:<34} {results[name]['min_us']:>12.2f} µs  (mediana {results[name]['median_us']:.2f})")
+    return {"meta": _meta(), "results": results}
+
+
+def _meta() -> Dict[str, str]:
+    meta = {
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpu": platform.processor() or platform.machine(),
+    }
+    try:
+        import pygame
+        meta["pygame"] = pygame.version.ver
+    except ImportError:
+        pass
+    return meta
+
+
+def guardar(data: Dict[str, object], path: str) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def cargar(path: str) -> Optional[Dict[str, object]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def comparar(actual: Dict[str, object], base: Dict[str, object], umbral: float = UMBRAL) -> List[str]:
+    """
+    Imprime actual vs base y devuelve los nombres que empeoraron más que
+    `umbral`. Se compara el mínimo: es el número menos afectado por ruido.
+    """
+    regresiones = []
+    base_results = base.get("results", {})
+    print(f"\n{'benchmark':<34} {'base µs':>12} {'actual µs':>12} {'cambio':>8}")
+    for name, res in actual["results"].items():
+        prev = base_results.get(name)
+        if prev is None:
+            print(f"{name:<34} {'—':>12} {res['min_us']:>12.2f}   (nuevo)")
+            continue
+        ratio = res["min_us"] / prev["min_us"] if prev["min_us"] else 1.0
+        flag = ""
+        if ratio > 1 + umbral:
+            flag = "  REGRESIÓN"
+            regresiones.append(name)
+        elif ratio < 1 - umbral:
+            flag = "  mejora"
+        print(f"{name:<34} {prev['min_us']:>12.2f} {res['min_us']:>12.2f} {ratio - 1:>+8.1%}{flag}")
+    return regresiones
@@ -0,0 +1,131 @@
+"""
+Barrido de balance: razas, bonos de terreno y climas contra carreras Monte Carlo.
+
+    python -m equestrian.balance --listar                     # parámetros y valores actuales
+    python -m equestrian.balance --param "raza.Percherón.velocidad=-0.4,-0.3,-0.2"
+    python -m equestrian.balance --param clima.Barro.friction=0.92:0.96:5 \\
+                                 --param terreno.Yegua.Barro=1.0:1.08:5
+    python -m equestrian.balance --param raza.Árabe.velocidad=0.1:0.5 --muestras 40
+
+Cada valor es una lista (`a,b,c`) o un intervalo (`lo:hi:n` reparte n
+valores). Sin `--muestras` se prueba la grilla completa; con `--muestras N`
+se sortean N candidatos con cada parámetro uniforme en su intervalo. Los
+parámetros que no se nombran quedan como están en el código.
+
+Para cada candidato se corren `--carreras` carreras por raza y clima en todos
+los núcleos, y se muestra la matriz de win rate de los más parejos. Los
+resultados quedan en `equestrian_balance.json`: repetir un candidato no
+vuelve a simular.
+"""
+import sys, os
+import argparse
+import time
+from typing import Dict, List, Sequence, Tuple
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from equestrian.services.balance import (
+    BALANCE_FILE, CARRERAS, CLIMAS, BalanceCache, Matriz, Params,
+    aleatorios, barrer, clave, desbalance, grilla, parametros_actuales,
+)
+
+
+def _valores(texto: str) -> List[float]:
+    partes = texto.split(":")
+    if len(partes) == 1:
+        return [float(v) for v in texto.split(",")]
+    if len(partes) == 2:
+        return [float(partes[0]), float(partes[1])]
+    lo, hi, n = float(partes[0]), float(partes[1]), int(partes[2])
+    if n < 2:
+        return [lo]
+    return [round(lo + (hi - lo) * k / (n - 1), 6) for k in range(n)]
+
+
+def _parsear(specs: Sequence[str], base: Params, parser: argparse.ArgumentParser) -> Dict[str, List[float]]:
+    ejes: Dict[str, List[float]] = {}
+    for spec in specs:
+        nombre, _, valores = spec.partition("=")
+        if nombre not in base:
+            parser.error(f"parámetro desconocido: {nombre!r} (ver --listar)")
+        try:
+            ejes[nombre] = _valores(valores)
+        except ValueError:
+            parser.error(f"valores inválidos para {nombre}: {valores!r}")
+    return ejes
+
+
+def _matriz(matriz: Matriz) -> List[str]:
+    ancho = max(len(raza) for raza in matriz)
+    lineas = [" " * ancho + "".join(f"{clima:>10}" for clima in CLIMAS)]
+    for raza, fila in matriz.items():
+        lineas.append(f"{raza:<{ancho}}" + "".join(f"{w / max(1, n):>10.1%}" for w, n in
+                                                   (fila[clima] for clima in CLIMAS)))
+    return lineas
+
+
+def _cambios(params: Params, base: Params) -> str:
+    distintos = [f"{k}={v:g}" for k, v in params.items() if v != base[k]]
+    return " ".join(distintos) if distintos else "(valores actuales)"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de balance")
+    parser.add_argument("--param", action="append", default=[], metavar="NOMBRE=VALORES",
+                        help="parámetro a barrer: a,b,c o lo:hi:n (lo:hi con --muestras)")
+    parser.add_argument("--muestras", type=int, default=0, help="búsqueda aleatoria de N candidatos en vez de grilla")
+    parser.add_argument("--carreras", type=int, default=CARRERAS, help="carreras por raza y clima")
+    parser.add_argument("--rivales", type=int, default=3, help="caballos IA por carrera")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de las carreras y del sorteo")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos del pool (por defecto, núcleos - 1)")
+    parser.add_argument("--top", type=int, default=3, help="candidatos a mostrar")
+    parser.add_argument("--cache", default=BALANCE_FILE, help="JSON con los resultados ya simulados")
+    parser.add_argument("--sin-cache", action="store_true", help="simula todo de nuevo y no guarda")
+    parser.add_argument("--listar", action="store_true", help="sólo lista los parámetros con su valor actual")
+    args = parser.parse_args(argv)
+
+    base = parametros_actuales()
+    if args.listar:
+        for nombre, valor in base.items():
+            print(f"{nombre} = {valor:g}")
+        return 0
+
+    ejes = _parsear(args.param, base, parser)
+    if args.muestras > 0:
+        rangos: Dict[str, Tuple[float, float]] = {k: (min(v), max(v)) for k, v in ejes.items()}
+        candidatos = aleatorios(base, rangos, args.muestras, seed=args.semilla)
+    else:
+        if any(":" in spec and spec.count(":") == 1 for spec in args.param):
+            parser.error("un intervalo lo:hi necesita --muestras (o lo:hi:n para la grilla)")
+        candidatos = grilla(base, ejes) if ejes else []
+    # la configuración actual siempre, para comparar; sin repetidos
+    unicos = {clave(p, args.carreras, args.rivales, args.semilla): p for p in [base] + candidatos}
+    candidatos = list(unicos.values())
+
+    cache = None if args.sin_cache else BalanceCache(args.cache)
+    simulados = [0]
+
+    def avance(hechos: int, total: int) -> None:
+        simulados[0] = hechos
+        print(f"\r{hechos}/{total} candidatos simulados", end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    resultados = barrer(candidatos, args.carreras, args.rivales, args.semilla,
+                        procesos=args.procesos, cache=cache, avance=avance)
+    wall = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    _, matriz_base = resultados[0]
+    print(f"Actual: desbalance {desbalance(matriz_base) * 100:.1f} puntos")
+    print("\n".join(_matriz(matriz_base)))
+
+    orden = sorted(resultados[1:], key=lambda pm: desbalance(pm[1]))
+    for puesto, (params, matriz) in enumerate(orden[:args.top], 1):
+        print(f"\n#{puesto} desbalance {desbalance(matriz) * 100:.1f} puntos: {_cambios(params, base)}")
+        print("\n".join(_matriz(matriz)))
+
+    carreras = simulados[0] * args.carreras * len(matriz_base) * len(CLIMAS)
+    print(f"\n{len(candidatos)} candidatos, {simulados[0]} simulados ({carreras} carreras) en {wall:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
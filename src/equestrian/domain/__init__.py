@@ -1,2 +1,2 @@
-from .caballo import Caballo, Yegua, PuraSangre
+from .caballo import Caballo, Yegua, PuraSangre, crear_caballo, RAZAS
 from .jinete import Jinete
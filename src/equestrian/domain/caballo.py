@@ -1,4 +1,20 @@
 from abc import ABC, abstractmethod
+from typing import Dict
+
+# Tablas de balance (las barre `python -m equestrian.balance`)
+AJUSTES_RAZA: Dict[str, Dict[str, float]] = {
+    "Pura Sangre": {},
+    "Criollo": {"resistencia": 0.1},
+    "Árabe": {"velocidad": 0.3},
+    "Cuarto de Milla": {"velocidad": 0.4, "resistencia": -0.05},
+    "Percherón": {"velocidad": -0.4, "resistencia": 0.2},
+}
+RAZAS = list(AJUSTES_RAZA)
+# multiplicador de velocidad por clima (1.0 si no figura)
+BONO_TERRENO: Dict[str, Dict[str, float]] = {
+    "Yegua": {"Barro": 1.05, "Ventoso": 0.97},
+    "Pura Sangre": {"Lluvioso": 0.94, "Soleado": 1.06},
+}
 
 class Caballo(ABC):
     def __init__(self, nombre: str, raza: str, velocidad: float, energia: float, resistencia: float):
@@ -33,11 +49,7 @@ class Yegua(Caballo):
         super().__init__(nombre, "Yegua", velocidad=8.0, energia=100.0, resistencia=1.2)
 
     def bonificacion_terreno(self, clima: str) -> float:
-        if clima == "Barro":
-            return 1.05
-        if clima == "Ventoso":
-            return 0.97
-        return 1.0
+        return BONO_TERRENO["Yegua"].get(clima, 1.0)
 
 
 class PuraSangre(Caballo):
@@ -45,8 +57,21 @@ class PuraSangre(Caballo):
         super().__init__(nombre, "Pura Sangre", velocidad=9.5, energia=100.0, resistencia=0.9)
 
     def bonificacion_terreno(self, clima: str) -> float:
-        if clima == "Lluvioso":
-            return 0.94
-        if clima == "Soleado":
-            return 1.06
-        return 1.0
+        return BONO_TERRENO["Pura Sangre"].get(clima, 1.0)
+
+
+def crear_caballo(nombre: str, raza: str, sexo: str = "Yegua") -> Caballo:
+    """Arma el caballo del jugador aplicando los ajustes de cada raza."""
+    if raza == "Pura Sangre":
+        caballo = PuraSangre(nombre)
+    else:
+        caballo = Yegua(nombre)
+    ajustes = AJUSTES_RAZA.get(raza, {})
+    if "velocidad" in ajustes:
+        caballo.velocidad += ajustes["velocidad"]
+    if "resistencia" in ajustes:
+        caballo.resistencia += ajustes["resistencia"]
+    caballo.raza = f"{raza} ({sexo})"
+    caballo.sexo = sexo
+    caballo.raza_base = raza
+    return caballo
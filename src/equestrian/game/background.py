@@ -0,0 +1,54 @@
+"""
+Capas de fondo pre-dibujadas para el parallax.
+
+Cada capa se dibuja una vez (por clima y tamaño de ventana) en una tira que
+ya contiene todas las repeticiones necesarias; en cada frame sólo se hace un
+`blit` desplazado según la cámara.
+"""
+from typing import Callable
+
+DrawFn = Callable[[object, int], None]  # (superficie, x de origen) -> None
+COLORKEY = (255, 0, 255)  # color "transparente" de las tiras (no se usa en el fondo)
+
+
+class ParallaxLayer:
+    """Tira horneada que se desplaza `factor` píxeles por píxel de cámara."""
+
+    def __init__(self, surface, x: int, y: int, period: float, factor: float):
+        self.surface = surface
+        self.x = x
+        self.y = y
+        self.period = period
+        self.factor = factor
+
+    def blit(self, screen, scroll: float) -> None:
+        offset = int((scroll * self.factor) % self.period) if self.period else 0
+        screen.blit(self.surface, (self.x - offset, self.y))
+
+
+def bake_layer(draw: DrawFn, width: int, height: int, period: float, factor: float,
+               origin_x: int = 0, opaque: bool = False) -> ParallaxLayer:
+    """
+    Dibuja la capa con desplazamiento 0 sobre una superficie de `width` × `height`
+    (con el origen corrido `origin_x` para que entren las repeticiones a la
+    izquierda) y la recorta a su contenido.
+    """
+    import pygame
+
+    # Las capas son formas opacas: con colorkey + RLE el blit es mucho más
+    # barato que con alfa por píxel.
+    strip = pygame.Surface((width, height))
+    strip.fill(COLORKEY)
+    strip.set_colorkey(COLORKEY)
+    draw(strip, origin_x)
+    bounds = strip.get_bounding_rect()
+    if bounds.w == 0 or bounds.h == 0:
+        bounds = pygame.Rect(0, 0, 1, 1)
+    surface = strip.subsurface(bounds).copy()
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    if opaque:
+        surface.set_colorkey(None)
+    else:
+        surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return ParallaxLayer(surface, bounds.x - origin_x, bounds.y, period, factor)
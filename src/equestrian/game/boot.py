@@ -0,0 +1,60 @@
+"""
+Línea de tiempo del arranque (`python -m equestrian.main --arranque`).
+
+Cada `mark()` anota cuánto pasó desde que arrancó el proceso; al mostrarse
+el menú `finish()` anota la última etapa e imprime la tabla, al estilo de `python -X importtime`. Sin el
+flag (o la variable EQUESTRIAN_BOOT=1) no se imprime nada.
+"""
+import os
+import sys
+import time
+from typing import List, Tuple
+
+_T0 = time.perf_counter()
+_marks: List[Tuple[str, float]] = []
+enabled = os.environ.get("EQUESTRIAN_BOOT") == "1"
+_reported = False
+
+
+def _process_start() -> float:
+    # en Linux se puede medir desde el exec del intérprete, no sólo desde este import
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        ticks = os.sysconf("SC_CLK_TCK")
+        return time.perf_counter() - (uptime - start_ticks / ticks)
+    except (OSError, ValueError, IndexError):
+        return _T0
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def mark(label: str) -> None:
+    # siempre se anota (es un append): así el flag puede llegar después de los imports
+    _marks.append((label, time.perf_counter()))
+
+
+def report() -> None:
+    """Imprime la línea de tiempo una sola vez (se llama al mostrar el menú)."""
+    global _reported
+    if not enabled or _reported:
+        return
+    _reported = True
+    start = _process_start()
+    prev = start
+    print("boot:  desde inicio |   paso (ms) | etapa", file=sys.stderr)
+    for label, t in _marks:
+        print(f"boot: {(t - start) * 1000:12.1f} | {(t - prev) * 1000:11.1f} | {label}", file=sys.stderr)
+        prev = t
+
+
+def finish(label: str) -> None:
+    """Última marca y reporte; sólo la primera vez (el menú se redibuja muchas)."""
+    if enabled and not _reported:
+        mark(label)
+        report()
@@ -0,0 +1,75 @@
+"""
+Gráfico de velocidad/energía dibujado directo con pygame.
+
+Se usa en la pantalla de resultados: aparece al instante (no depende de
+matplotlib) y se hornea una sola vez en una superficie que después sólo se
+blitea. Las series se reducen a un punto por columna de píxeles.
+"""
+import math
+from typing import List, Sequence, Tuple
+
+Color = Tuple[int, int, int]
+Series = Tuple[str, Sequence[float], Color]
+
+CHART_BG = (255, 255, 255)
+CHART_GRID = (225, 228, 236)
+CHART_AXIS = (30, 30, 30)
+
+
+def _decimate(values: Sequence[float], width: int) -> List[float]:
+    n = len(values)
+    if n <= width:
+        return [float(v) for v in values]
+    return [float(values[x * (n - 1) // (width - 1)]) for x in range(width)]
+
+
+def render_chart(size: Tuple[int, int], t: Sequence[float], series: Sequence[Series], font,
+                 title: str = "Rendimiento de la carrera"):
+    """
+    Superficie con las `series` ((etiqueta, valores, color)) contra `t`.
+    Mismo eje Y para todas, como el PNG de matplotlib.
+    """
+    import pygame
+
+    w, h = size
+    surface = pygame.Surface(size)
+    surface.fill(CHART_BG)
+    pygame.draw.rect(surface, CHART_AXIS, surface.get_rect(), 2, border_radius=10)
+
+    title_surf = font.render(title, True, CHART_AXIS)
+    surface.blit(title_surf, (12, 8))
+    plot = pygame.Rect(44, 16 + title_surf.get_height(), w - 60, h - 44 - title_surf.get_height())
+    if len(t) < 2 or plot.w < 2 or plot.h < 2:
+        return surface
+
+    t0, t1 = float(t[0]), float(t[-1])
+    # tope redondeado a múltiplos de 20 para que las marcas queden enteras
+    y_top = max(max(vals) for _, vals, _ in series if len(vals))
+    y_max = max(20, math.ceil(y_top * 1.05 / 20) * 20)
+    for i in range(5):
+        y = plot.bottom - plot.h * i // 4
+        pygame.draw.line(surface, CHART_GRID, (plot.left, y), (plot.right, y))
+        label = font.render(f"{y_max * i / 4:.0f}", True, CHART_AXIS)
+        surface.blit(label, (plot.left - label.get_width() - 6, y - label.get_height() // 2))
+    pygame.draw.line(surface, CHART_AXIS, plot.bottomleft, plot.bottomright, 2)
+    pygame.draw.line(surface, CHART_AXIS, plot.bottomleft, plot.topleft, 2)
+    for value, anchor in ((t0, plot.left), (t1, plot.right)):
+        label = font.render(f"{value:.0f} s", True, CHART_AXIS)
+        surface.blit(label, (min(anchor, w - label.get_width() - 4), plot.bottom + 4))
+
+    ts = _decimate(t, plot.w)
+    span = max(1e-6, t1 - t0)
+    xs = [plot.left + (tv - t0) / span * (plot.w - 1) for tv in ts]
+    legend_x = w - 12  # leyenda en la fila del título, alineada a la derecha
+    legend_y = 8 + title_surf.get_height() // 2
+    for label, values, color in reversed(series):
+        vs = _decimate(values, plot.w)
+        points = [(x, plot.bottom - v / y_max * plot.h) for x, v in zip(xs, vs)]
+        if len(points) >= 2:
+            pygame.draw.lines(surface, color, False, points, 2)
+        text = font.render(label, True, CHART_AXIS)
+        legend_x -= text.get_width()
+        surface.blit(text, (legend_x, legend_y - text.get_height() // 2))
+        pygame.draw.line(surface, color, (legend_x - 24, legend_y), (legend_x - 6, legend_y), 3)
+        legend_x -= 24 + 14
+    return surface
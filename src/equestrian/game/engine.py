@@ -1,19 +1,37 @@
 import math
+import os
 import random
 import time
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 
-from equestrian.domain.caballo import Caballo, Yegua, PuraSangre
+from equestrian.domain.caballo import Caballo, PuraSangre, RAZAS, crear_caballo
 from equestrian.domain.jinete import Jinete
-from equestrian.services.persistence import cargar_progreso, guardar_progreso
-from equestrian.services.performance import guardar_grafico_performance
+from equestrian.services.persistence import cargar_progreso, guardar_progreso, flush_progreso, SAVE_FILE
+from equestrian.services.performance import ChartWorker, PERF_PNG
 from equestrian.services.history import load_history, append_history
+from equestrian.services.odds import OddsEstimator
+from equestrian.services.season import MIN_CABALLOS, Temporada, armar_series
+from equestrian.services.telemetry import TelemetryRecorder
+from equestrian.services.ghosts import GhostRecorder, cargar_fantasma, guardar_fantasma
+from equestrian import sim
+from equestrian.sim.replay import InputRecorder
+from equestrian.game.sprites import SpriteCache
+from equestrian.game.background import ParallaxLayer, bake_layer
+from equestrian.game.surfaces import gradient_surface, card_surface
+from equestrian.game.text import get_font, render_text, wrap_text
+from equestrian.game.redraw import RedrawScheduler
+from equestrian.game.chart import render_chart
+from equestrian.game.profiler import (FrameProfiler, RACE_PHASES, overlay_visible, prune_traces, toggle_overlay,
+                                      trace_path)
+from equestrian.game import boot
+from equestrian.sim import GOAL_DISTANCE
 
 # --- Ajustes del juego ---
 WIDTH, HEIGHT = 960, 540
 FPS = 60
+MAX_FRAME_DT = 0.25  # un tirón largo no debe "teletransportar" a los caballos
 GROUND_Y = HEIGHT - 90
-GOAL_DISTANCE = 3500.0  # metros virtuales para ganar
 PIXELS_PER_METER = 0.35
 BG_PX_PER_M = 10.0
 
@@ -29,13 +47,6 @@ GRAY = (120, 120, 120)
 DARK = (30, 30, 30)
 LIGHT = (230, 230, 230)
 
-CLIMATE_SETTINGS: Dict[str, Dict[str, float]] = {
-    "Soleado": {"friction": 0.99, "regen": 1.05},
-    "Lluvioso": {"friction": 0.96, "regen": 0.9},
-    "Ventoso": {"friction": 0.97, "regen": 0.95},
-    "Barro": {"friction": 0.94, "regen": 0.85},
-}
-
 PINK = (245, 115, 155)
 PINK_DARK = (220, 85, 125)
 PINK_SOFT = (255, 210, 225)
@@ -52,89 +63,107 @@ FONT_NAME = "Times New Roman"
 PARALLAX_FAR = 0.2
 PARALLAX_MID = 0.5
 PARALLAX_NEAR = 0.8
-RAZAS = ["Pura Sangre", "Criollo", "Árabe", "Cuarto de Milla", "Percherón"]
+
+# Campo grande (más de LARGE_FIELD competidores): carriles comprimidos,
+# rivales con sprite simplificado y etiquetas agrupadas.
+LARGE_FIELD = 8
+MAX_RIVALES = 200
+MAX_LANES = 12
+LOD_SCALE = 0.75  # carriles dibujados más chicos que esto usan el sprite simplificado
+LABEL_CLUSTER_PX = 140
+
+GHOST_PALETTE = ((236, 238, 248), (200, 204, 222), (214, 220, 240))  # fantasma del récord
 
 def _color_lerp(c1: Tuple[int, int, int], c2: Tuple[int, int, int], t: float) -> Tuple[int, int, int]:
     t = max(0.0, min(1.0, t))
     return tuple(int(c1[i] + (c2[i] - c1[i]) * t) for i in range(3))
 
 def _gradient_rect(surface, color_start, color_end, rect):
-    import pygame
     x, y, w, h = rect
-    for i in range(h):
-        t = i / max(1, h - 1)
-        col = _color_lerp(color_start, color_end, t)
-        pygame.draw.line(surface, col, (x, y + i), (x + w, y + i))
+    surface.blit(gradient_surface(tuple(color_start), tuple(color_end), (w, h)), (x, y))
 
-def _draw_side_background(screen, camera_x: float, clima: str) -> None:
+SKY_PALETTES = {
+    "Soleado": ((135, 195, 255), (220, 245, 255)),
+    "Ventoso": ((120, 180, 240), (210, 235, 250)),
+    "Lluvioso": ((110, 140, 170), (170, 190, 210)),
+    "Barro": ((120, 140, 150), (180, 195, 205)),
+}
+
+@lru_cache(maxsize=8)
+def _side_background_layers(clima: str, size: Tuple[int, int]) -> List[ParallaxLayer]:
+    """Capas del fondo lateral horneadas una vez por clima y tamaño de ventana."""
     import pygame
 
-    width, height = screen.get_size()
-    sky_palettes = {
-        "Soleado": ((135, 195, 255), (220, 245, 255)),
-        "Ventoso": ((120, 180, 240), (210, 235, 250)),
-        "Lluvioso": ((110, 140, 170), (170, 190, 210)),
-        "Barro": ((120, 140, 150), (180, 195, 205)),
-    }
-    top_color, bottom_color = sky_palettes.get(clima, ((135, 195, 255), (220, 245, 255)))
-
-    bands = 10
-    band_h = height // bands
-    for i in range(bands):
-        rect = pygame.Rect(0, i * band_h, width, band_h + 1)
-        pygame.draw.rect(screen, _color_lerp(top_color, bottom_color, i / (bands - 1)), rect)
-
-    if clima == "Soleado":
-        pygame.draw.circle(screen, (255, 245, 160), (width - 120, 90), 36)
-        pygame.draw.circle(screen, (255, 255, 210), (width - 120, 90), 50, width=6)
+    width, height = size
+    top_color, bottom_color = SKY_PALETTES.get(clima, ((135, 195, 255), (220, 245, 255)))
+
+    def sky(surface, x0):
+        bands = 10
+        band_h = height // bands
+        for i in range(bands):
+            rect = pygame.Rect(x0, i * band_h, width, band_h + 1)
+            pygame.draw.rect(surface, _color_lerp(top_color, bottom_color, i / (bands - 1)), rect)
+        if clima == "Soleado":
+            pygame.draw.circle(surface, (255, 245, 160), (x0 + width - 120, 90), 36)
+            pygame.draw.circle(surface, (255, 255, 210), (x0 + width - 120, 90), 50, width=6)
+
+    def mountains_far(surface, x0):
+        for i in range(-1, 3):
+            base_x = x0 + i * width
+            points = [
+                (base_x - 80, GROUND_Y - 120),
+                (base_x + width * 0.25, GROUND_Y - 220),
+                (base_x + width * 0.55, GROUND_Y - 160),
+                (base_x + width + 80, GROUND_Y - 120),
+            ]
+            pygame.draw.polygon(surface, (150, 170, 200), points)
+
+    def mountains_near(surface, x0):
+        for i in range(-1, 3):
+            base_x = x0 + i * width
+            points = [
+                (base_x - 100, GROUND_Y - 80),
+                (base_x + width * 0.2, GROUND_Y - 165),
+                (base_x + width * 0.6, GROUND_Y - 110),
+                (base_x + width + 100, GROUND_Y - 80),
+            ]
+            pygame.draw.polygon(surface, (120, 150, 190), points)
 
-    camera_px = camera_x * PIXELS_PER_METER
+    cloud_color = (245, 245, 250) if clima != "Lluvioso" else (210, 215, 220)
 
-    mountain_color_far = (150, 170, 200)
-    offset = (camera_px * 0.2) % (width)
-    for i in range(-1, 3):
-        base_x = -offset + i * width
-        points = [
-            (base_x - 80, GROUND_Y - 120),
-            (base_x + width * 0.25, GROUND_Y - 220),
-            (base_x + width * 0.55, GROUND_Y - 160),
-            (base_x + width + 80, GROUND_Y - 120),
-        ]
-        pygame.draw.polygon(screen, mountain_color_far, points)
-
-    mountain_color_near = (120, 150, 190)
-    offset = (camera_px * 0.35) % (width)
-    for i in range(-1, 3):
-        base_x = -offset + i * width
-        points = [
-            (base_x - 100, GROUND_Y - 80),
-            (base_x + width * 0.2, GROUND_Y - 165),
-            (base_x + width * 0.6, GROUND_Y - 110),
-            (base_x + width + 100, GROUND_Y - 80),
-        ]
-        pygame.draw.polygon(screen, mountain_color_near, points)
+    def clouds(surface, x0):
+        for i in range(-2, 5):
+            x = x0 + i * 220
+            y = 90 + (i % 3) * 20
+            pygame.draw.ellipse(surface, cloud_color, (x, y, 120, 45))
+            pygame.draw.ellipse(surface, cloud_color, (x + 50, y - 10, 90, 40))
+            pygame.draw.ellipse(surface, cloud_color, (x + 70, y + 5, 80, 35))
 
-    cloud_color = (245, 245, 250) if clima != "Lluvioso" else (210, 215, 220)
-    spacing = 220
-    offset = (camera_px * 0.15) % spacing
-    for i in range(-2, 5):
-        x = -offset + i * spacing
-        y = 90 + (i % 3) * 20
-        pygame.draw.ellipse(screen, cloud_color, (x, y, 120, 45))
-        pygame.draw.ellipse(screen, cloud_color, (x + 50, y - 10, 90, 40))
-        pygame.draw.ellipse(screen, cloud_color, (x + 70, y + 5, 80, 35))
-
-    stand_color = (180, 90, 90)
-    stand_offset = (camera_px * 0.5) % (width // 2)
+    stand_w = width // 2
     stand_y = GROUND_Y - 60
-    for i in range(-3, 5):
-        x = -stand_offset + i * (width // 2)
-        pygame.draw.rect(screen, (80, 55, 55), (x, stand_y - 40, width // 2, 6))
-        pygame.draw.rect(screen, stand_color, (x, stand_y - 34, width // 2, 34))
-        for p in range(12):
-            seat_x = x + 10 + p * 20
-            seat_y = stand_y - 30 + (p % 2) * 4
-            pygame.draw.rect(screen, (235, 235, 240), (seat_x, seat_y, 14, 8))
+
+    def stands(surface, x0):
+        for i in range(-3, 5):
+            x = x0 + i * stand_w
+            pygame.draw.rect(surface, (80, 55, 55), (x, stand_y - 40, stand_w, 6))
+            pygame.draw.rect(surface, (180, 90, 90), (x, stand_y - 34, stand_w, 34))
+            for p in range(12):
+                seat_x = x + 10 + p * 20
+                seat_y = stand_y - 30 + (p % 2) * 4
+                pygame.draw.rect(surface, (235, 235, 240), (seat_x, seat_y, 14, 8))
+
+    return [
+        bake_layer(sky, width, height, 0, 0.0, opaque=True),
+        bake_layer(mountains_far, 4 * width + 160, height, width, 0.2, origin_x=width + 80),
+        bake_layer(mountains_near, 4 * width + 200, height, width, 0.35, origin_x=width + 100),
+        bake_layer(clouds, 7 * 220 + 160, height, 220, 0.15, origin_x=440),
+        bake_layer(stands, 8 * stand_w, height, stand_w, 0.5, origin_x=3 * stand_w),
+    ]
+
+def _draw_side_background(screen, camera_x: float, clima: str) -> None:
+    camera_px = camera_x * PIXELS_PER_METER
+    for layer in _side_background_layers(clima, screen.get_size()):
+        layer.blit(screen, camera_px)
 
 def _draw_horse_sprite(screen, x: int, base_y: int, scale: float, body_color: Tuple[int, int, int],
                        accent_color: Tuple[int, int, int], rider_color: Tuple[int, int, int],
@@ -261,6 +290,15 @@ def _draw_horse_sprite(screen, x: int, base_y: int, scale: float, body_color: Tu
 
     # boost shading handled via colors; no additional glow to avoid halos
 
+_SPRITES: Optional[SpriteCache] = None
+
+def _sprite_cache() -> SpriteCache:
+    """Caché de cuadros compartido entre carreras (las paletas se repiten)."""
+    global _SPRITES
+    if _SPRITES is None:
+        _SPRITES = SpriteCache(_draw_horse_sprite)
+    return _SPRITES
+
 # -----------------------------
 # Utilidades de UI (pygame)
 # -----------------------------
@@ -286,19 +324,19 @@ def _draw_button(screen, font, rect, label, hovered=False, active=False, disable
     pygame.draw.rect(screen, color, rect, border_radius=10)
     pygame.draw.rect(screen, INK, rect, 2, border_radius=10)
     text_font = font
-    text = text_font.render(label, True, PANEL_BG)
+    text = render_text(text_font, label, PANEL_BG)
     if text.get_width() > rect.w - 16:
         size = max(12, font.get_height() - 2)
         while size >= 12:
-            text_font = pygame.font.SysFont(FONT_NAME, size, bold=False)
-            text = text_font.render(label, True, PANEL_BG)
+            text_font = get_font(FONT_NAME, size)
+            text = render_text(text_font, label, PANEL_BG)
             if text.get_width() <= rect.w - 16 or size == 12:
                 break
             size -= 2
     screen.blit(text, (rect.x + (rect.w - text.get_width()) // 2,
                        rect.y + (rect.h - text.get_height()) // 2))
 
-def _draw_input(screen, font, rect, value, placeholder="", focused=False):
+def _draw_input(screen, font, rect, value, placeholder="", focused=False, caret=False):
     import pygame
     bg_color = PANEL_BG if focused else PINK_SOFT
     pygame.draw.rect(screen, bg_color, rect, border_radius=10)
@@ -309,12 +347,15 @@ def _draw_input(screen, font, rect, value, placeholder="", focused=False):
         pygame.draw.rect(screen, (*PINK, 30), glow, border_radius=12)
     txt = value if value else placeholder
     col = INK if value else THEME_MUTED
-    render = font.render(txt, True, col)
+    render = render_text(font, txt, col)
     screen.blit(render, (rect.x + 14, rect.y + (rect.h - render.get_height()) // 2))
+    if focused and caret:
+        cx = rect.x + 14 + (render.get_width() + 2 if value else 0)
+        pygame.draw.line(screen, INK, (cx, rect.y + 9), (cx, rect.bottom - 10), 2)
 
 def _title(screen, bigfont, text, y=30):
     import pygame
-    t = bigfont.render(text, True, PINK)
+    t = render_text(bigfont, text, PINK)
     text_rect = t.get_rect()
     pill = pygame.Rect((screen.get_width() - text_rect.width) // 2 - 24,
                        y - 12, text_rect.width + 48, text_rect.height + 24)
@@ -328,22 +369,20 @@ def _draw_card(screen, rect, border=20):
     import pygame
     shadow = pygame.Rect(rect.x + 4, rect.y + 6, rect.w, rect.h)
     pygame.draw.rect(screen, (0, 0, 0, 35), shadow, border_radius=border)
-    panel_surface = screen.subsurface(rect).copy()
-    _gradient_rect(panel_surface, THEME_PANEL, _color_lerp(THEME_PANEL, (228, 232, 240), 0.3),
-                   (0, 0, rect.w, rect.h))
-    screen.blit(panel_surface, (rect.x, rect.y))
-    pygame.draw.rect(screen, (255, 255, 255, 120), rect, 1, border_radius=border)
+    card = card_surface((rect.w, rect.h), border, THEME_PANEL,
+                        _color_lerp(THEME_PANEL, (228, 232, 240), 0.3))
+    screen.blit(card, (rect.x, rect.y))
 
-def _draw_band(screen, offset_x, height, color, base_y):
+def _draw_band(screen, offset_x, height, color, base_y, width=None):
     import pygame
-    width = screen.get_width()
+    width = width or screen.get_width()
     for shift in (0, width):
         rect = pygame.Rect(offset_x + shift, base_y - height, width, height)
         pygame.draw.rect(screen, color, rect)
 
-def _draw_fence(screen, offset_x):
+def _draw_fence(screen, offset_x, width=None):
     import pygame
-    width = screen.get_width()
+    width = width or screen.get_width()
     fence_y = GROUND_Y - 50
     for shift in (0, width):
         x = offset_x + shift
@@ -354,8 +393,45 @@ def _draw_fence(screen, offset_x):
             post_x = x + i * post_spacing
             pygame.draw.rect(screen, (230, 230, 230), (post_x, fence_y - 4, 6, 32))
 
+@lru_cache(maxsize=8)
+def _race_background_layers(size: Tuple[int, int]) -> Tuple[List[ParallaxLayer], List[ParallaxLayer]]:
+    """
+    Capas de la pista horneadas una vez por tamaño de ventana: (detrás del
+    suelo, delante del suelo). El suelo mismo es una capa fija.
+    """
+    import pygame
+
+    width, height = size
+    track_top = GROUND_Y - 80
+    grass_top = track_top - 70
+
+    def ground(surface, x0):
+        pygame.draw.rect(surface, (96, 150, 88), (x0, grass_top, width, 70))
+        pygame.draw.rect(surface, (184, 140, 96), (x0, track_top, width, height - track_top))
+        pygame.draw.rect(surface, (160, 120, 80), (x0, GROUND_Y - 18, width, 18))
+
+    mark_spacing = 82
+    mark_y = GROUND_Y - 28
+
+    def marks(surface, x0):
+        for x in range(0, width + mark_spacing, mark_spacing):
+            pygame.draw.rect(surface, (190, 150, 110), (x0 + x, mark_y, 32, 5))
+
+    back = [
+        bake_layer(lambda surf, x0: _draw_band(surf, x0, 140, (150, 180, 210), GROUND_Y - 200, width),
+                   2 * width, height, width, PARALLAX_FAR, opaque=True),
+        bake_layer(lambda surf, x0: _draw_band(surf, x0, 90, (120, 190, 130), GROUND_Y - 120, width),
+                   2 * width, height, width, PARALLAX_MID, opaque=True),
+        bake_layer(lambda surf, x0: _draw_fence(surf, x0, width), 2 * width, height, width, PARALLAX_NEAR),
+    ]
+    front = [
+        bake_layer(ground, width, height, 0, 0.0, opaque=True),
+        bake_layer(marks, width + mark_spacing, height, mark_spacing, PARALLAX_NEAR),
+    ]
+    return back, front
+
 def draw_label(screen, font, text, x, y, color):
-    surf = font.render(text, True, color)
+    surf = render_text(font, text, color)
     screen.blit(surf, (x, y))
     return surf.get_width(), surf.get_height()
 
@@ -365,28 +441,34 @@ def draw_bar(screen, x, y, w, h, frac, fg, border=(0, 0, 0)):
     fill_w = int((w - 4) * max(0.0, min(1.0, frac)))
     pygame.draw.rect(screen, fg, (x + 2, y + 2, fill_w, h - 4))
 
+@lru_cache(maxsize=4)
+def _menu_backdrop(size: Tuple[int, int]):
+    """Fondo del menú con los círculos translúcidos ya compuestos."""
+    import pygame
+    w, h = size
+    surface = pygame.Surface(size)
+    surface.fill(PINK_SOFT)
+    overlay = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.circle(overlay, (255, 255, 255, 35), (w - 160, 140), 200)
+    pygame.draw.circle(overlay, (255, 255, 255, 20), (160, h - 140), 260)
+    surface.blit(overlay, (0, 0))
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
 def _wrap_text(font, text, max_width):
-    words = text.split()
-    lines = []
-    current = ""
-    for word in words:
-        test = word if not current else current + " " + word
-        if font.size(test)[0] <= max_width:
-            current = test
-        else:
-            if current:
-                lines.append(current)
-            current = word
-    if current:
-        lines.append(current)
-    return lines
+    # el corte en líneas queda cacheado por (fuente, texto, ancho)
+    return wrap_text(font, text, max_width)
 
 # -----------------------------
 # Pantalla de MENÚ INICIAL
 # -----------------------------
-def _menu_inicial(screen, clock, font, bigfont, progress) -> Tuple[Jinete, Caballo, str, bool]:
+def _menu_inicial(screen, clock, font, bigfont, progress, odds: Optional[OddsEstimator] = None,
+                  rivales: int = 3) -> Tuple[Jinete, Caballo, str, bool]:
     """
     Devuelve: (jinete, caballo, clima, clima_aleatorio)
+    Si se pasa `odds`, muestra la probabilidad estimada de ganar con la
+    raza/sexo/clima elegidos contra `rivales` (se calcula en segundo plano).
     """
     import pygame
 
@@ -432,26 +514,35 @@ def _menu_inicial(screen, clock, font, bigfont, progress) -> Tuple[Jinete, Cabal
     raza_box_w = max(140, COL_W - ARROW_W * 2 - ARROW_GAP * 2)
     raza_box = pygame.Rect(raza_prev.right + ARROW_GAP, line_y(5), raza_box_w, 38)
     raza_next = pygame.Rect(raza_box.right + ARROW_GAP, line_y(5), ARROW_W, 38)
+    odds_box = pygame.Rect(col_x(0), line_y(4) + 8, COL_W, 32)
 
     BTN_W = min((COL_W - GAP_X) // 2, 220)
     btn_jugar = pygame.Rect(col_x(0), line_y(6), BTN_W, 44)
     btn_salir = pygame.Rect(btn_jugar.right + GAP_X, line_y(6), BTN_W, 44)
 
-    history_entries = load_history()[-5:]
+    history_entries = load_history(limit=5)
     history_lines = max(1, len(history_entries) + 1)
     history_block = history_lines * 18
     content_bottom = max(line_y(6) + LINE_H, line_y(5) + history_block)
     panel_rect.h = content_bottom - panel_rect.y + PANEL_PAD
 
+    hint_font = get_font(FONT_NAME, max(12, font.get_height() - 2))
+    history_font = get_font(FONT_NAME, 18)
+
     focused = None  # 'jinete' | 'caballo' | None
     running = True
+    inputs = {'jinete': input_jinete, 'caballo': input_caballo}
+    buttons = [btn_clima_prev, btn_clima_next, btn_sex_yegua, btn_sex_macho,
+               raza_prev, raza_next, btn_jugar, btn_salir]
+    redraw = RedrawScheduler()
+    odds_txt = None
 
     while running:
-        dt = clock.tick(FPS) / 1000.0
-        for event in pygame.event.get():
+        for event in redraw.wait(clock):
             if event.type == pygame.QUIT:
                 return None, None, "", True  # señal de salida
             if event.type == pygame.MOUSEBUTTONDOWN:
+                redraw.invalidate()
                 mx, my = event.pos
                 if input_jinete.collidepoint(mx, my):
                     focused = 'jinete'
@@ -477,27 +568,9 @@ def _menu_inicial(screen, clock, font, bigfont, progress) -> Tuple[Jinete, Cabal
                         caballo_nombre = "Luna"
                     # Construir objetos y salir
                     jinete = Jinete(jinete_nombre, experiencia=progress.get("exp", 1), puntos=progress.get("puntos", 0))
-                    raza = RAZAS[raza_idx]
-                    if raza == "Pura Sangre":
-                        caballo = PuraSangre(caballo_nombre)
-                    else:
-                        caballo = Yegua(caballo_nombre)
-                        caballo.raza = raza
-                        if raza == "Criollo":
-                            caballo.resistencia += 0.1
-                        elif raza == "Árabe":
-                            caballo.velocidad += 0.3
-                        elif raza == "Cuarto de Milla":
-                            caballo.velocidad += 0.4
-                            caballo.resistencia -= 0.05
-                        elif raza == "Percherón":
-                            caballo.velocidad -= 0.4
-                            caballo.resistencia += 0.2
-                    caballo.raza = f"{raza} ({sexo})"
+                    caballo = crear_caballo(caballo_nombre, RAZAS[raza_idx], sexo)
                     clima_aleatorio = clima_options[clima_idx] == "Aleatorio"
                     clima = random.choice(["Soleado", "Lluvioso", "Ventoso", "Barro"]) if clima_aleatorio else clima_options[clima_idx]
-                    caballo.sexo = sexo
-                    caballo.raza_base = raza
                     return jinete, caballo, clima, clima_aleatorio
                 elif btn_salir.collidepoint(mx, my):
                     return None, None, "", True
@@ -505,6 +578,9 @@ def _menu_inicial(screen, clock, font, bigfont, progress) -> Tuple[Jinete, Cabal
                     focused = None
 
             if event.type == pygame.KEYDOWN:
+                if focused in inputs:
+                    # incluye el brillo del foco, que se apaga con ENTER
+                    redraw.invalidate(inputs[focused].inflate(12, 12))
                 if focused == 'jinete':
                     if event.key == pygame.K_BACKSPACE:
                         jinete_nombre = jinete_nombre[:-1]
@@ -527,12 +603,27 @@ def _menu_inicial(screen, clock, font, bigfont, progress) -> Tuple[Jinete, Cabal
                     if event.key == pygame.K_ESCAPE:
                         return None, None, "", True
 
+        redraw.track_hover(buttons)
+        caret_on = redraw.caret(inputs.get(focused))
+        if odds is not None:
+            est = odds.consultar(RAZAS[raza_idx], sexo, clima_options[clima_idx], rivales)
+            p, lo, hi = est.intervalo
+            titulo = f"Probabilidad de ganar vs {rivales} rivales"
+            if est.n == 0:
+                txt = f"{titulo}: calculando…"
+            elif est.done:
+                txt = f"{titulo}: {p:.0%} (IC95 {lo:.0%}–{hi:.0%})"
+            else:
+                txt = f"{titulo}: ~{p:.0%} (±{(hi - lo) / 2:.0%}, {est.n} carreras)"
+            if txt != odds_txt:
+                odds_txt = txt
+                redraw.invalidate(odds_box)
+        if not redraw.dirty:
+            continue
+
         # Render
-        screen.fill(PINK_SOFT)
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        pygame.draw.circle(overlay, (255, 255, 255, 35), (WIDTH - 160, 140), 200)
-        pygame.draw.circle(overlay, (255, 255, 255, 20), (160, HEIGHT - 140), 260)
-        screen.blit(overlay, (0, 0))
+        redraw.begin(screen)
+        screen.blit(_menu_backdrop((WIDTH, HEIGHT)), (0, 0))
 
         _title(screen, bigfont, "Equestrian Challenge")
         pygame.draw.rect(screen, (*SHADOW, 40), panel_rect.move(3, 3), border_radius=18)
@@ -540,8 +631,6 @@ def _menu_inicial(screen, clock, font, bigfont, progress) -> Tuple[Jinete, Cabal
         pygame.draw.rect(screen, INK, panel_rect, 2, border_radius=18)
 
         label_font = font
-        hint_font = pygame.font.SysFont(FONT_NAME, max(12, font.get_height() - 2))
-        history_font = pygame.font.SysFont(FONT_NAME, 18)
 
         draw_label(screen, font, "Nombre del Jinete", col_x(0), line_y(0) - 20, INK)
         draw_label(screen, font, "Clima", col_x(1), line_y(0) - 20, INK)
@@ -550,15 +639,15 @@ def _menu_inicial(screen, clock, font, bigfont, progress) -> Tuple[Jinete, Cabal
         draw_label(screen, font, "Raza del Caballo", col_x(0), line_y(4) - 20, INK)
         draw_label(screen, font, "Últimos 5 jugadores", col_x(1), line_y(4) - 20, INK)
 
-        _draw_input(screen, label_font, input_jinete, jinete_nombre, "Ej: Oriana", focused == 'jinete')
-        _draw_input(screen, label_font, input_caballo, caballo_nombre, "Ej: Luna", focused == 'caballo')
+        _draw_input(screen, label_font, input_jinete, jinete_nombre, "Ej: Oriana", focused == 'jinete', caret_on)
+        _draw_input(screen, label_font, input_caballo, caballo_nombre, "Ej: Luna", focused == 'caballo', caret_on)
 
         mx, my = pygame.mouse.get_pos()
         _draw_button(screen, label_font, btn_clima_prev, "◀", hovered=btn_clima_prev.collidepoint(mx, my))
         _draw_button(screen, label_font, btn_clima_next, "▶", hovered=btn_clima_next.collidepoint(mx, my))
         pygame.draw.rect(screen, PANEL_BG, clima_box, border_radius=10)
         pygame.draw.rect(screen, INK, clima_box, 2, border_radius=10)
-        ctext = label_font.render(clima_options[clima_idx], True, INK)
+        ctext = render_text(label_font, clima_options[clima_idx], INK)
         screen.blit(ctext, (clima_box.centerx - ctext.get_width() // 2,
                             clima_box.centery - ctext.get_height() // 2))
 
@@ -571,10 +660,16 @@ def _menu_inicial(screen, clock, font, bigfont, progress) -> Tuple[Jinete, Cabal
         _draw_button(screen, label_font, raza_next, "▶", hovered=raza_next.collidepoint(mx, my))
         pygame.draw.rect(screen, PANEL_BG, raza_box, border_radius=10)
         pygame.draw.rect(screen, INK, raza_box, 2, border_radius=10)
-        raza_text = label_font.render(RAZAS[raza_idx], True, INK)
+        raza_text = render_text(label_font, RAZAS[raza_idx], INK)
         screen.blit(raza_text, (raza_box.centerx - raza_text.get_width() // 2,
                                 raza_box.centery - raza_text.get_height() // 2))
 
+        if odds is not None:
+            pygame.draw.rect(screen, PANEL_BG, odds_box, border_radius=10)
+            pygame.draw.rect(screen, PINK, odds_box, 2, border_radius=10)
+            otext = render_text(hint_font, odds_txt, INK if est.done else THEME_MUTED)
+            screen.blit(otext, (odds_box.x + 12, odds_box.centery - otext.get_height() // 2))
+
         hist_y = line_y(5)
         hist_entries = list(reversed(history_entries))
         if not hist_entries:
@@ -583,7 +678,7 @@ def _menu_inicial(screen, clock, font, bigfont, progress) -> Tuple[Jinete, Cabal
         for entry in hist_entries:
             txt = f"{entry.get('jugador','?')} · {entry.get('caballo','?')} ({entry.get('raza','?')}) · {entry.get('tiempo','?')}s"
             for line in _wrap_text(history_font, txt, COL_W):
-                screen.blit(history_font.render(line, True, INK), (col_x(1), text_y))
+                screen.blit(render_text(history_font, line, INK), (col_x(1), text_y))
                 text_y += 18
 
         _draw_button(screen, label_font, btn_jugar, "¡A la pista!", hovered=btn_jugar.collidepoint(mx, my), active=True)
@@ -594,10 +689,11 @@ def _menu_inicial(screen, clock, font, bigfont, progress) -> Tuple[Jinete, Cabal
             "Podés cambiar clima y caballo antes de cada carrera."
         ]
         for i, hint in enumerate(hints):
-            text = hint_font.render(hint, True, _color_lerp(THEME_TEXT, (255, 255, 255), 0.5))
+            text = render_text(hint_font, hint, _color_lerp(THEME_TEXT, (255, 255, 255), 0.5))
             screen.blit(text, (panel_rect.x + PANEL_PAD, panel_rect.bottom + 12 + i * 20))
 
-        pygame.display.flip()
+        redraw.present(screen)
+        boot.finish("menú visible")
 
 # -----------------------------
 # MODO CUIDADO entre carreras
@@ -616,13 +712,15 @@ def _modo_cuidado(screen, clock, font, bigfont, caballo: Caballo, jinete: Jinete
     btn_descansar = pygame.Rect(620, 360, 180, 48)
     btn_seguir    = pygame.Rect(380, 430, 200, 48)
 
+    buttons = [btn_alimentar, btn_cepillar, btn_descansar, btn_seguir]
+    redraw = RedrawScheduler()
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0
-        for event in pygame.event.get():
+        for event in redraw.wait(clock):
             if event.type == pygame.QUIT:
                 return
             if event.type == pygame.MOUSEBUTTONDOWN:
+                redraw.invalidate()
                 mx, my = event.pos
                 if btn_alimentar.collidepoint(mx, my) and tickets > 0:
                     caballo.recuperar_energia(20)
@@ -641,7 +739,12 @@ def _modo_cuidado(screen, clock, font, bigfont, caballo: Caballo, jinete: Jinete
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 return
 
+        redraw.track_hover(buttons)
+        if not redraw.dirty:
+            continue
+
         # Render
+        redraw.begin(screen)
         _gradient_rect(screen, _color_lerp(THEME_PRIMARY, (255, 255, 255), 0.6),
                        _color_lerp(THEME_SECONDARY, (255, 255, 255), 0.3),
                        (0, 0, WIDTH, HEIGHT))
@@ -658,7 +761,7 @@ def _modo_cuidado(screen, clock, font, bigfont, caballo: Caballo, jinete: Jinete
         ]
         y = panel_rect.y + 30
         for line in info:
-            screen.blit(font.render(line, True, THEME_TEXT), (panel_rect.x + 30, y)); y += 28
+            screen.blit(render_text(font, line, THEME_TEXT), (panel_rect.x + 30, y)); y += 28
 
         mx, my = pygame.mouse.get_pos()
         _draw_button(screen, font, btn_alimentar, "Alimentar", hovered=btn_alimentar.collidepoint(mx, my))
@@ -667,10 +770,10 @@ def _modo_cuidado(screen, clock, font, bigfont, caballo: Caballo, jinete: Jinete
         _draw_button(screen, font, btn_seguir, "Volver al menú", hovered=btn_seguir.collidepoint(mx, my), active=True)
 
         if msg:
-            tip_font = pygame.font.SysFont(FONT_NAME, font.get_height())
-            screen.blit(tip_font.render(msg, True, (30, 120, 50)), (panel_rect.x + 30, panel_rect.bottom - 40))
+            tip_font = get_font(FONT_NAME, font.get_height())
+            screen.blit(render_text(tip_font, msg, (30, 120, 50)), (panel_rect.x + 30, panel_rect.bottom - 40))
 
-        pygame.display.flip()
+        redraw.present(screen)
 
 # -----------------------------
 # PAUSA en carrera
@@ -683,10 +786,10 @@ def _pausa(screen, clock, font, bigfont) -> bool:
     btn_cont = pygame.Rect(320, 260, 140, 48)
     btn_menu = pygame.Rect(500, 260, 140, 48)
 
+    redraw = RedrawScheduler()
     paused = True
     while paused:
-        dt = clock.tick(FPS) / 1000.0
-        for event in pygame.event.get():
+        for event in redraw.wait(clock):
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -698,6 +801,11 @@ def _pausa(screen, clock, font, bigfont) -> bool:
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 return True
 
+        redraw.track_hover([btn_cont, btn_menu])
+        if not redraw.dirty:
+            continue
+
+        redraw.begin(screen)
         _gradient_rect(screen, _color_lerp(THEME_PRIMARY, (255, 255, 255), 0.65),
                        _color_lerp(THEME_SECONDARY, (255, 255, 255), 0.4),
                        (0, 0, WIDTH, HEIGHT))
@@ -706,48 +814,36 @@ def _pausa(screen, clock, font, bigfont) -> bool:
         mx, my = pygame.mouse.get_pos()
         _draw_button(screen, font, btn_cont, "Continuar", hovered=btn_cont.collidepoint(mx, my), active=True)
         _draw_button(screen, font, btn_menu, "Menú", hovered=btn_menu.collidepoint(mx, my))
-        pygame.display.flip()
+        redraw.present(screen)
 
 # -----------------------------
 # CARRERA (loop del juego)
 # -----------------------------
-def _carrera(screen, clock, font, hudfont, caballo: Caballo, jinete: Jinete, clima: str, progress) -> Tuple[str, bool, float, List[Dict[str, float]]]:
+def _carrera(screen, clock, font, hudfont, caballo: Caballo, jinete: Jinete, clima: str, progress,
+             seed: Optional[int] = None,
+             rivales: int = 3,
+             elenco: Optional[List[Caballo]] = None
+             ) -> Tuple[str, bool, float, TelemetryRecorder, Dict[str, object], List[int]]:
     import pygame
 
-    settings = CLIMATE_SETTINGS.get(clima, {"friction": 0.97, "regen": 1.0})
-    friction = settings["friction"]
-    regen_factor = settings["regen"]
-
     caballo.energia = max(30.0, caballo.energia)  # asegura que la segunda carrera no arranque sin energía
-    base_player_speed = caballo.velocidad * caballo.bonificacion_terreno(clima)
-    agua = 2
+    state = sim.nueva_carrera(caballo, clima, rivales=rivales, seed=seed, elenco=elenco)
+    large_field = len(state.competitors) > LARGE_FIELD
+    lanes = min(MAX_LANES, len(state.competitors)) if large_field else len(state.competitors)
+    player_state = state.player
     race_time = 0.0
-    perf_samples: List[Dict[str, float]] = []
+    # telemetría a resolución completa de la física; con el campo grande sólo
+    # el jugador (todos los rivales a 120 Hz son megas por carrera)
+    registrados = state.competitors[:1] if large_field else state.competitors
+    telemetry = TelemetryRecorder([c.name for c in registrados], sim.PHYSICS_DT)
+    # semilla + entradas por paso de física: alcanza para re-simular la carrera
+    input_log = InputRecorder(state, len(state.competitors) - 1, elenco)
+    # fantasma del mejor tiempo de este jugador en este clima (si existe)
+    ghost = cargar_fantasma(jinete.nombre, clima)
+    ghost_rec = GhostRecorder(sim.PHYSICS_HZ)
     won = False
-    ranking: List[Dict[str, object]] = []
     bg_t = 0.0
     camera_x = 0.0
-    tap_meter = 0.0
-    tap_combo = 0
-    TAP_GAIN = 0.18
-    TAP_DECAY = 0.75
-    COMBO_DECAY = 1.6
-    TAP_ENERGY_COST = 4.0
-
-    opponent_pool = [
-        ("Centella", PuraSangre),
-        ("Aurora", Yegua),
-        ("Relampago", PuraSangre),
-        ("Canela", Yegua),
-        ("Orion", PuraSangre),
-        ("Bruma", Yegua),
-    ]
-    random.shuffle(opponent_pool)
-    opponents = []
-    for name, cls in opponent_pool:
-        if len(opponents) >= 3:
-            break
-        opponents.append(cls(name))
 
     colors = [
         ((168, 110, 70), (130, 84, 46), (60, 90, 170)),
@@ -756,51 +852,46 @@ def _carrera(screen, clock, font, hudfont, caballo: Caballo, jinete: Jinete, cli
         ((140, 118, 70), (100, 88, 56), (110, 80, 150)),
     ]
 
-    player_state = {
-        "caballo": caballo,
-        "dist": 0.0,
-        "speed": 0.0,
-        "is_player": True,
-        "name": caballo.nombre,
+    # Datos de dibujo por competidor (la física vive en equestrian.sim)
+    visuals: List[Dict[str, object]] = [{
         "body_color": (130, 92, 54),
         "accent_color": (95, 72, 46),
         "rider_color": (60, 100, 190),
-        "base_speed": base_player_speed,
         "phase": 0.0,
         "lane": 0,
         "scale": 1.05,
-        "tap_meter": 0.0,
-        "combo": 0.0,
-    }
-
-    ai_states: List[Dict[str, object]] = []
-    for idx, opp in enumerate(opponents):
-        base = opp.velocidad * opp.bonificacion_terreno(clima)
+        "lod": False,
+    }]
+    for idx in range(len(state.competitors) - 1):
         palette = colors[idx % len(colors)]
-        scale = max(0.78, 1.0 - 0.08 * (idx + 1))
-        ai_states.append({
-            "caballo": opp,
-            "dist": 0.0,
-            "speed": 0.0,
-            "is_player": False,
-            "name": opp.nombre,
+        lane = 1 + idx % (lanes - 1)
+        # en campo grande los carriles de atrás se achican más (perspectiva)
+        scale = (round(0.95 - 0.45 * (lane - 1) / max(1, lanes - 2), 2) if large_field
+                 else max(0.78, 1.0 - 0.08 * (idx + 1)))
+        visuals.append({
             "body_color": palette[0],
             "accent_color": palette[1],
             "rider_color": palette[2],
-            "base_speed": base + random.uniform(-0.25, 0.6),
             "phase": random.uniform(0, math.tau),
-            "lane": idx + 1,
+            "lane": lane,
             "scale": scale,
-            "tap_meter": random.uniform(0.1, 0.3),
-            "tap_rate": random.uniform(2.4, 3.4),
-            "tap_gain": random.uniform(0.15, 0.22),
-            "tap_decay": random.uniform(0.6, 0.9),
-            "combo": 0.0,
+            # sprite simplificado sólo en los carriles de atrás, que se ven chicos
+            "lod": large_field and scale < LOD_SCALE,
         })
 
-    competitors = [player_state] + ai_states
-    lane_count = len(competitors)
-    lane_spacing = 32
+    lane_spacing = min(32, 96 // max(1, lanes - 1))
+    # los carriles no cambian durante la carrera: el orden de dibujo (de atrás
+    # hacia adelante) se calcula una sola vez y cada caballo visible se ubica
+    # por su puesto en ese orden
+    vis_of = {id(c): vis for c, vis in zip(state.competitors, visuals)}
+    draw_rank = {id(c): rank for rank, (c, _) in enumerate(
+        sorted(zip(state.competitors, visuals), key=lambda cv: cv[1]["lane"], reverse=True))}
+    # ventana de la cámara en metros, con margen para el ancho del sprite
+    view_behind = (140 + 120) / PIXELS_PER_METER
+    view_ahead = (WIDTH + 200 - 140) / PIXELS_PER_METER
+    sprites = _sprite_cache()
+    sky_color = (180, 220, 255) if clima in ("Soleado", "Ventoso") else (140, 170, 200)
+    bg_back, bg_front = _race_background_layers(screen.get_size())
 
     help_lines = [
         "Controles: ESPACIO (tap) acelera | H Agua | P Pausa | ESC Salir",
@@ -810,162 +901,166 @@ def _carrera(screen, clock, font, hudfont, caballo: Caballo, jinete: Jinete, cli
     def world_to_screen(dist: float) -> int:
         return int(140 + (dist - camera_x) * PIXELS_PER_METER)
 
+    # Paso fijo: la física avanza de a PHYSICS_DT consumiendo el tiempo real
+    # acumulado, y el dibujo interpola entre el paso anterior y el actual.
+    accumulator = 0.0
+    inputs = sim.RaceInputs()
+    clock.tick()  # descarta el tiempo pasado en el menú
+
+    def lerp_dist(c: sim.Competitor) -> float:
+        return c.prev_dist + (c.dist - c.prev_dist) * alpha
+
+    # tiempos por fase de cada frame (F3 los muestra); la traza se guarda al salir
+    prof = FrameProfiler(RACE_PHASES)
+
+    def fin(resultado: str) -> Tuple[str, bool, float, TelemetryRecorder, Dict[str, object], List[int]]:
+        _guardar_traza(prof)
+        # orden de llegada por índice de competidor (la temporada no depende de los nombres)
+        lugar = {id(c): idx for idx, c in enumerate(state.competitors)}
+        orden = [lugar[id(c)] for c in state.ranking]
+        return resultado, won, race_time, telemetry, input_log.log(state), orden
+
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0
-        race_time += dt
+        dt = min(MAX_FRAME_DT, clock.tick(FPS) / 1000.0)
+        prof.begin_frame()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                return "quit", False, race_time, perf_samples
+                return fin("quit")
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    return "menu", False, race_time, perf_samples
+                    return fin("menu")
                 elif event.key == pygame.K_SPACE:
-                    tap_meter = min(1.0, tap_meter + TAP_GAIN)
-                    tap_combo = min(10, tap_combo + 1)
-                    caballo.consumir_energia(TAP_ENERGY_COST)
-                elif event.key == pygame.K_h and agua > 0 and caballo.energia < 100:
-                    caballo.recuperar_energia(20)
-                    agua -= 1
+                    inputs.taps += 1
+                elif event.key == pygame.K_h:
+                    inputs.agua += 1
+                elif event.key == pygame.K_F3:
+                    toggle_overlay()
                 elif event.key == pygame.K_p:
-                    if not _pausa(screen, clock, font, pygame.font.SysFont(FONT_NAME, 36, bold=True)):
-                        return False, race_time, perf_samples
-
-        if not running:
-            break
-
-        tap_meter = max(0.0, tap_meter - TAP_DECAY * dt)
-        tap_combo = max(0.0, tap_combo - COMBO_DECAY * dt)
-        player_state["tap_meter"] = tap_meter
-        player_state["combo"] = tap_combo
-
-        if caballo.energia < 100 and tap_meter < 0.4:
-            caballo.recuperar_energia(5.0 * dt * regen_factor)
-
-        combo_bonus = min(0.35, tap_combo * 0.03)
-        speed_factor = 0.55 + tap_meter * 1.35 + combo_bonus
-        energy_factor = 0.5 + 0.5 * (caballo.energia / 100.0)
-        target_speed = player_state["base_speed"] * speed_factor
-        player_speed = max(0.0, target_speed * energy_factor) * friction
-        player_state["speed"] = player_speed
-        player_state["dist"] += player_speed * dt * 10.0
-        player_state["phase"] = (player_state["phase"] + dt * (player_speed + 12) * 0.085) % math.tau
-        current_speed = player_speed
+                    pausa_desde = time.perf_counter()
+                    if not _pausa(screen, clock, font, get_font(FONT_NAME, 36, bold=True)):
+                        return fin("menu")
+                    input_log.pausa(state.t, time.perf_counter() - pausa_desde)
+                    clock.tick()  # el tiempo en pausa no cuenta para la física
+                    dt = 0.0
+                    prof.begin_frame()  # ni para el perfil
+        prof.mark("eventos")
+
+        accumulator += dt
+        while accumulator >= sim.PHYSICS_DT and not state.finished:
+            if inputs.taps or inputs.agua:
+                input_log.aplicar(state.steps + 1, inputs)
+            sim.step(state, sim.PHYSICS_DT, inputs)
+            inputs = sim.RaceInputs()
+            accumulator -= sim.PHYSICS_DT
+            telemetry.record(state.t, registrados)
+            if not state.finished:
+                ghost_rec.record(state.steps, player_state.dist)
+        alpha = 1.0 if state.finished else accumulator / sim.PHYSICS_DT
+        race_time = state.t
+        caballo.energia = player_state.energia
+        tap_meter = player_state.tap_meter
+        agua = state.agua
+        prof.mark("física")
+
+        for c, vis in zip(state.competitors, visuals):
+            rate = (c.speed + 12) * 0.085 if c.is_player else (c.speed + 10) * 0.08
+            vis["phase"] = (vis["phase"] + dt * rate) % math.tau
+        current_speed = player_state.speed
         bg_t += current_speed * dt * BG_PX_PER_M
 
-        for state in ai_states:
-            horse: Caballo = state["caballo"]  # type: ignore[assignment]
-            tap_meter_ai = max(0.0, state["tap_meter"] - state["tap_decay"] * dt)  # type: ignore[index]
-            if random.random() < (state["tap_rate"] + (0.8 if GOAL_DISTANCE - state["dist"] < 260 else 0)) * dt:  # type: ignore[index]
-                tap_meter_ai = min(1.0, tap_meter_ai + state["tap_gain"])  # type: ignore[index]
-                horse.consumir_energia(TAP_ENERGY_COST * random.uniform(0.7, 1.1))
-                state["combo"] = min(10.0, state["combo"] + 1.0)
-            else:
-                state["combo"] = max(0.0, state["combo"] - COMBO_DECAY * dt)
-            state["tap_meter"] = tap_meter_ai
-
-            if horse.energia < 100 and tap_meter_ai < 0.4:
-                horse.recuperar_energia(4.5 * dt * regen_factor * 0.9)
-
-            combo_bonus_ai = min(0.35, state["combo"] * 0.03)  # type: ignore[index]
-            speed_factor_ai = 0.55 + tap_meter_ai * 1.35 + combo_bonus_ai
-            energy_factor_ai = 0.5 + 0.5 * (horse.energia / 100.0)
-            speed = max(0.0, state["base_speed"] * speed_factor_ai * energy_factor_ai) * friction  # type: ignore[index]
-            state["speed"] = speed
-            state["dist"] += speed * dt * 10.0
-            state["phase"] = (state["phase"] + dt * (speed + 10) * 0.08) % math.tau
-
-        if not perf_samples or race_time - perf_samples[-1]["t"] >= 0.2:
-            perf_samples.append({
-                "t": round(race_time, 2),
-                "vel": round(player_state["speed"], 2),
-                "eng": round(caballo.energia, 2)
-            })
-
-        finished = [s for s in competitors if s["dist"] >= GOAL_DISTANCE]
-        if finished:
-            ranking = sorted(competitors, key=lambda s: s["dist"], reverse=True)
-            won = ranking[0]["is_player"]  # type: ignore[index]
+        if state.finished:
+            won = state.won
             running = False
 
-        camera_target = max(player_state["dist"] - 300, 0.0)
+        player_dist_view = lerp_dist(player_state)
+        camera_target = max(player_dist_view - 300, 0.0)
         camera_x += (camera_target - camera_x) * min(1.0, dt * 3.2)
+        prof.mark("animación")  # zancadas y cámara; la IA corre dentro de la física
 
-        sky_color = (180, 220, 255) if clima in ("Soleado", "Ventoso") else (140, 170, 200)
         screen.fill(sky_color)
-        width = screen.get_width()
-        far_x = -int((bg_t * PARALLAX_FAR) % width)
-        mid_x = -int((bg_t * PARALLAX_MID) % width)
-        near_x = -int((bg_t * PARALLAX_NEAR) % width)
-        _draw_band(screen, far_x, 140, (150, 180, 210), GROUND_Y - 200)
-        _draw_band(screen, mid_x, 90, (120, 190, 130), GROUND_Y - 120)
-        _draw_fence(screen, near_x)
-
-        track_top = GROUND_Y - 80
-        grass_top = track_top - 70
-        pygame.draw.rect(screen, (96, 150, 88), (0, grass_top, WIDTH, 70))
-        pygame.draw.rect(screen, (184, 140, 96), (0, track_top, WIDTH, HEIGHT - track_top))
-        pygame.draw.rect(screen, (160, 120, 80), (0, GROUND_Y - 18, WIDTH, 18))
-
-        mark_spacing = 82
-        mark_offset = int((bg_t * PARALLAX_NEAR) % mark_spacing)
-        mark_y = GROUND_Y - 28
-        for x in range(-mark_spacing, WIDTH + mark_spacing, mark_spacing):
-            px = x - mark_offset
-            pygame.draw.rect(screen, (190, 150, 110), (px, mark_y, 32, 5))
-
-        player_ratio = min(1.0, player_state["dist"] / GOAL_DISTANCE)
+        for layer in bg_back:
+            layer.blit(screen, bg_t)
+        for layer in bg_front:
+            layer.blit(screen, bg_t)
+
+        player_ratio = min(1.0, player_dist_view / GOAL_DISTANCE)
         goal_screen_x = WIDTH - int(player_ratio * WIDTH)
         if -40 <= goal_screen_x <= WIDTH + 60:
             pygame.draw.rect(screen, WHITE, (goal_screen_x, GROUND_Y - 130, 18, 90))
             for stripe in range(0, 90, 12):
                 color = BLACK if (stripe // 12) % 2 == 0 else WHITE
                 pygame.draw.rect(screen, color, (goal_screen_x, GROUND_Y - 130 + stripe, 18, 12))
-
-        live_ranking = sorted(competitors, key=lambda s: s["dist"], reverse=True)
-
-        draw_order = sorted(competitors, key=lambda s: s.get("lane", 0), reverse=True)
-        for state in draw_order:
-            lane_idx = state.get("lane", 0)
+        prof.mark("fondo")
+
+        live_ranking = state.leaderboard
+
+        if ghost is not None:
+            # mismo instante que el dibujo interpolado del jugador; lookup O(1) en la grilla
+            ghost_x = world_to_screen(ghost.dist_at(state.t - (1.0 - alpha) * sim.PHYSICS_DT))
+            if -120 <= ghost_x <= WIDTH + 200:
+                scale = visuals[0]["scale"]
+                frame, (anchor_x, anchor_y) = sprites.ghost_frame(GHOST_PALETTE, scale, visuals[0]["phase"])
+                screen.blit(frame, (ghost_x - anchor_x, GROUND_Y - anchor_y))
+                # el rótulo va debajo de la pista: arriba lo taparía el propio jugador
+                screen.blit(render_text(hudfont, f"Récord {ghost.tiempo:.2f}s", THEME_MUTED),
+                            (ghost_x - 40, GROUND_Y + 48))
+
+        # sólo se consideran los caballos dentro de la ventana de la cámara
+        # (búsqueda binaria sobre la clasificación, que ya está ordenada por distancia)
+        visible = live_ranking.window(camera_x - view_behind, camera_x + view_ahead)
+        visible.sort(key=lambda c: draw_rank[id(c)])
+        labels: List[Tuple[int, sim.Competitor]] = []
+        for comp in visible:
+            vis = vis_of[id(comp)]
+            lane_idx = vis["lane"]
             base_y = GROUND_Y - lane_idx * lane_spacing
-            screen_x = world_to_screen(state["dist"])
-            scale = state.get("scale", 1.0)
-            bob = math.sin(state.get("phase", 0.0)) * 4 * scale
+            screen_x = world_to_screen(lerp_dist(comp))
+            scale = vis["scale"]
 
             if screen_x < -120 or screen_x > WIDTH + 200:
                 continue
 
-            shadow_w = int(64 * scale)
-            shadow_h = int(18 * scale)
-            shadow_surface = pygame.Surface((shadow_w, shadow_h), pygame.SRCALPHA)
-            pygame.draw.ellipse(shadow_surface, (0, 0, 0, 90), shadow_surface.get_rect())
-            screen.blit(shadow_surface, (screen_x - shadow_w // 2, base_y - shadow_h // 2 + 10))
-
-            if state["is_player"]:
-                boost_level = min(1.0, player_state["tap_meter"] + player_state["combo"] * 0.05)
+            # sombra + caballo + jinete salen pre-dibujados del caché: un blit por caballo
+            palette = (vis["body_color"], vis["accent_color"], vis["rider_color"])
+            if vis["lod"]:
+                frame, (anchor_x, anchor_y) = sprites.lod_frame(palette, scale, vis["phase"])
+            else:
+                # en campo grande los rivales van sin brillo: con él no entran en el caché de cuadros
+                boost_level = (0.0 if large_field and not comp.is_player
+                               else min(1.0, comp.tap_meter + comp.combo * 0.05))
+                frame, (anchor_x, anchor_y) = sprites.frame(palette, scale, vis["phase"], boost_level)
+            screen.blit(frame, (screen_x - anchor_x, base_y - anchor_y))
+
+            if large_field and not comp.is_player:
+                labels.append((screen_x, comp))
             else:
-                boost_level = min(1.0, state.get("tap_meter", 0.0) + state.get("combo", 0.0) * 0.05)
-            _draw_horse_sprite(
-                screen,
-                screen_x,
-                base_y,
-                scale,
-                state["body_color"],
-                state["accent_color"],
-                state["rider_color"],
-                state["phase"],
-                bob,
-                state["is_player"],  # type: ignore[arg-type]
-                boost_level,
-            )
-
-            name_label = f"{state['name']}" + (" (vos)" if state["is_player"] else "")
-            screen.blit(font.render(name_label, True, BLACK), (screen_x - 40, base_y - int(70 * scale)))
-
-        player_dist = min(GOAL_DISTANCE, player_state["dist"])
+                name_label = f"{comp.name}" + (" (vos)" if comp.is_player else "")
+                screen.blit(render_text(font, name_label, BLACK), (screen_x - 40, base_y - int(70 * scale)))
+
+        if labels:
+            # etiquetas agrupadas: un rótulo por pelotón ("Centella +12") sobre la pista,
+            # debajo del carril del frente
+            labels.sort(key=lambda xc: xc[0])
+            label_y = GROUND_Y + 24
+            start = 0
+            for end in range(1, len(labels) + 1):
+                if end == len(labels) or labels[end][0] - labels[start][0] > LABEL_CLUSTER_PX:
+                    group = labels[start:end]
+                    lead = group[-1][1]
+                    text = lead.name if len(group) == 1 else f"{lead.name} +{len(group) - 1}"
+                    screen.blit(render_text(hudfont, text, BLACK), (group[0][0] - 30, label_y))
+                    start = end
+        prof.mark("sprites")
+
+        player_dist = min(GOAL_DISTANCE, player_dist_view)
         positions_to_show = min(6, len(live_ranking))
-        panel_height = 150 + positions_to_show * 18
+        top_positions = live_ranking.top(positions_to_show)
+        player_pos = None
+        if not any(c.is_player for c in top_positions):
+            player_pos = next(i for i, c in enumerate(live_ranking) if c.is_player) + 1
+        panel_height = 150 + (positions_to_show + (player_pos is not None)) * 18
         panel_rect = pygame.Rect(12, 8, WIDTH - 24, panel_height)
         pygame.draw.rect(screen, (*SHADOW, 40), panel_rect.move(2, 2), border_radius=12)
         pygame.draw.rect(screen, PANEL_BG, panel_rect, border_radius=12)
@@ -1010,10 +1105,13 @@ def _carrera(screen, clock, font, hudfont, caballo: Caballo, jinete: Jinete, cli
         right_y += 6
         draw_label(screen, hudfont, "Posiciones en pista", RIGHT_X, right_y, INK)
         right_y += 22
-        for idx, state in enumerate(live_ranking[:positions_to_show]):
-            entry = f"{idx + 1}. {state['name']}"
-            color = INK if state["is_player"] else THEME_MUTED
+        for idx, comp in enumerate(top_positions):
+            entry = f"{idx + 1}. {comp.name}"
+            color = INK if comp.is_player else THEME_MUTED
             right_y += draw_wrapped(entry, RIGHT_X, right_y, COL_WIDTH, color)
+        if player_pos is not None:
+            right_y += draw_wrapped(f"{player_pos}. {player_state.name} (de {len(live_ranking)})",
+                                    RIGHT_X, right_y, COL_WIDTH, INK)
 
         progress_rect = pygame.Rect(panel_rect.x + PAD, panel_rect.bottom - 24, panel_rect.w - PAD * 2, 10)
         pygame.draw.rect(screen, (220, 225, 235), progress_rect.inflate(4, 4), border_radius=6)
@@ -1026,47 +1124,125 @@ def _carrera(screen, clock, font, hudfont, caballo: Caballo, jinete: Jinete, cli
         for i, hl in enumerate(help_lines):
             draw_label(screen, hudfont, hl, info_panel.x + 20, info_panel.y + 18 + i * 24,
                        _color_lerp(INK, (255, 255, 255), 0.15))
+        prof.mark("HUD")
+
+        if overlay_visible():
+            prof.draw_overlay(screen, clock.get_fps())
+        prof.mark("perfil")
 
         pygame.display.flip()
+        prof.mark("flip")
+        prof.end_frame()
+
+    if won:
+        # state.t es el instante exacto del cruce: ahí el jugador está justo en la meta
+        guardar_fantasma(jinete.nombre, clima, ghost_rec.cerrar(state.t, GOAL_DISTANCE))
 
-    if ranking:
+    if state.ranking:
         progress["last_ranking"] = [
-            f"{idx + 1}. {state['name']}" + (" (vos)" if state["is_player"] else "")
-            for idx, state in enumerate(ranking)
+            f"{idx + 1}. {comp.name}" + (" (vos)" if comp.is_player else "")
+            for idx, comp in enumerate(state.ranking)
         ]
     else:
         progress["last_ranking"] = []
 
-    return "done", won, race_time, perf_samples
+    return fin("done")
+
+
+def _guardar_traza(prof: FrameProfiler) -> None:
+    """Guarda los tiempos por frame de la carrera en un CSV propio junto al archivo de progreso."""
+    directory = os.path.dirname(SAVE_FILE)
+    try:
+        prof.dump_csv(trace_path(directory))
+        prune_traces(directory)
+    except OSError as e:
+        print("No se pudo guardar la traza de frames:", e)
+
+def _temporada(season: Optional[Temporada], progress, caballo: Caballo, caballos: int) -> Temporada:
+    """La temporada en curso: la de esta sesión, la guardada en el progreso o una nueva."""
+    if season is None:
+        season = Temporada.desde_dict(progress.get("temporada"))
+    if season is None or season.terminada or len(season.inscriptos) != caballos:
+        if season is not None:
+            season.cerrar()
+        season = Temporada.nueva(caballo.nombre, caballos=caballos)
+    return season
+
+
+def _rivales_menu(rivales: int, temporada: int, season: Optional[Temporada]) -> int:
+    """Rivales de la próxima carrera, para la probabilidad del menú."""
+    if not temporada:
+        return rivales
+    if season is not None and not season.terminada:
+        return len(season.series[season.serie_jugador]) - 1
+    return len(armar_series(range(temporada))[0]) - 1
+
+
+def _lineas_temporada(season: Temporada, top: int = 5) -> List[str]:
+    if not season.lista:
+        return [f"Temporada · fecha {season.fecha + 1}/{season.fechas}", "Simulando las otras series…"]
+    tabla = season.tabla()
+    if season.terminada:
+        lineas = [f"Temporada terminada · campeón: {tabla[0].nombre}"]
+    else:
+        lineas = [f"Temporada · fecha {season.fecha}/{season.fechas} · próxima serie lista"]
+    for puesto, ins in enumerate(tabla):
+        if puesto < top or ins.jugador:
+            lineas.append(f"{puesto + 1}. {ins.nombre}" + (" (vos)" if ins.jugador else "") + f" · {ins.puntos} pts")
+    return lineas
 
 # -----------------------------
 # Entry principal
 # -----------------------------
-def run_game():
+def run_game(rivales: int = 3, temporada: int = 0):
     if not _ensure_pygame():
         return
     import pygame
-    pygame.init()
+    rivales = max(1, min(MAX_RIVALES, rivales))
+    # el mismo número con que se compara la temporada guardada
+    temporada = max(MIN_CABALLOS, temporada) if temporada > 0 else 0
+    # sólo video y fuentes: pygame.init() también levanta audio y joysticks,
+    # que el juego no usa y que son lo más lento del arranque
+    pygame.display.init()
+    pygame.font.init()
+    boot.mark("pygame (display + font)")
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Equestrian Challenge 🐎")
+    boot.mark("ventana")
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont(FONT_NAME, 22)
-    bigfont = pygame.font.SysFont(FONT_NAME, 44, bold=True)
-    hudfont = pygame.font.SysFont(FONT_NAME, 20)
+    font = get_font(FONT_NAME, 22)
+    bigfont = get_font(FONT_NAME, 44, bold=True)
+    hudfont = get_font(FONT_NAME, 20)
+    boot.mark("fuentes")
+    odds = OddsEstimator()
+    charts = ChartWorker()
+    season: Optional[Temporada] = None
 
     exit_game = False
     while not exit_game:
         # --- MENÚ INICIAL ---
         progress = cargar_progreso()
-        menu = _menu_inicial(screen, clock, font, bigfont, progress)
+        menu = _menu_inicial(screen, clock, font, bigfont, progress, odds,
+                             _rivales_menu(rivales, temporada, season))
         if menu == (None, None, "", True):
             exit_game = True
             break
         jinete, caballo, clima, clima_aleatorio = menu
+        # el proceso de gráficos arranca recién ahora (no demora el menú) y
+        # tiene toda la carrera para importar matplotlib
+        charts.precalentar()
+
+        # --- TEMPORADA: las otras series salen al pool antes de la carrera ---
+        elenco, seed = None, None
+        if temporada:
+            season = _temporada(season, progress, caballo, temporada)
+            elenco, seed = season.preparar_serie(caballo, clima)
 
         # --- CARRERA ---
         try:
-            status, won, race_time, perf_samples = _carrera(screen, clock, font, hudfont, caballo, jinete, clima, progress)
+            status, won, race_time, telemetry, input_log, orden = _carrera(
+                screen, clock, font, hudfont, caballo, jinete, clima, progress,
+                seed=seed, rivales=rivales, elenco=elenco)
         except Exception as exc:  # pragma: no cover - seguridad en runtime
             import traceback
             traceback.print_exc()
@@ -1086,8 +1262,6 @@ def run_game():
             if best_time is None or race_time < best_time:
                 best_time = round(race_time, 2)
 
-        perf_history = perf_samples[-240:] if len(perf_samples) > 240 else perf_samples
-
         progress.update({
             "last_player": jinete.nombre,
             "last_horse": caballo.nombre,
@@ -1098,12 +1272,16 @@ def run_game():
             "puntos": jinete.puntos,
             "best_time": best_time,
             "last_climate": clima,
-            "last_race_perf": perf_history
         })
+        progress.pop("last_race_perf", None)  # las muestras viven en la telemetría
+        if elenco is not None:
+            if season.registrar(orden) and season.actualizar():
+                progress["temporada"] = season.a_dict()
         guardar_progreso(progress)
 
-        # Gráfico rendimiento
-        guardar_grafico_performance(perf_history)
+        # Telemetría + PNG de rendimiento en el proceso de gráficos (no bloquea)
+        telemetry.guardar()
+        grafico = charts.encargar()
         append_history({
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "jugador": jinete.nombre,
@@ -1113,18 +1291,35 @@ def run_game():
             "raza": progress.get("last_horse_breed", getattr(caballo, "raza_base", getattr(caballo, "raza", "Yegua"))),
             "clima": clima,
             "tiempo": round(race_time, 2),
-            "gano": bool(won)
+            "gano": bool(won),
+            "inputs": input_log,  # para `python -m equestrian.replay`
         })
 
         # --- PANTALLA RESULTADO ---
         result_running = True
         quit_from_results = False
-        btn_nueva = pygame.Rect(250, 380, 200, 50)
-        btn_cuidado = pygame.Rect(480, 380, 230, 50)
+        btn_nueva = pygame.Rect(250, 450, 200, 50)
+        btn_cuidado = pygame.Rect(480, 450, 230, 50)
         msg = "🏆 ¡Ganaste!" if won else "Carrera terminada."
+        # gráfico nativo: se hornea una vez con las columnas ya en memoria
+        # en temporada el gráfico se achica para dejar lugar a la tabla
+        chart_rect = pygame.Rect(WIDTH // 2 + 10, 110, WIDTH // 2 - 50, 150 if temporada else 260)
+        chart = render_chart(chart_rect.size, telemetry.t, [
+            ("Velocidad", telemetry.cols[0]["vel"], BLUE),
+            ("Energía", telemetry.cols[0]["eng"], GREEN),
+        ], get_font(FONT_NAME, 16))
+        status_rect = pygame.Rect(chart_rect.x, chart_rect.bottom + 8, chart_rect.w, 24)
+        status_png = None
+        season_rect = pygame.Rect(chart_rect.x, status_rect.bottom + 8, chart_rect.w, 440 - status_rect.bottom - 8)
+        season_lines = None
+        ranking_lines = progress.get("last_ranking", [])
+        if len(ranking_lines) > 6:
+            # campo grande: top 6 y el puesto del jugador
+            mine = [line for line in ranking_lines[6:] if line.endswith("(vos)")]
+            ranking_lines = ranking_lines[:6] + (["…"] + mine if mine else [])
+        redraw = RedrawScheduler()
         while result_running:
-            dt = clock.tick(FPS) / 1000.0
-            for event in pygame.event.get():
+            for event in redraw.wait(clock):
                 if event.type == pygame.QUIT:
                     quit_from_results = True
                     result_running = False
@@ -1138,28 +1333,62 @@ def run_game():
                         result_running = False   # vuelve al menú post-cuidado
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
                     result_running = False
+            if not result_running:
+                break
+
+            redraw.track_hover([btn_nueva, btn_cuidado])
+            if not grafico.done():
+                png_txt = f"Generando {PERF_PNG}…"
+            elif not grafico.cancelled() and grafico.exception() is None and grafico.result():
+                png_txt = f"Se guardó {PERF_PNG}."
+            else:
+                png_txt = f"No se pudo generar {PERF_PNG} (¿matplotlib?)."
+            if png_txt != status_png:
+                status_png = png_txt
+                redraw.invalidate(status_rect)
+            if temporada:
+                # las series del pool terminan mucho antes que la carrera; si no, se espera acá sin bloquear
+                if not season.lista and season.actualizar():
+                    progress["temporada"] = season.a_dict()
+                    guardar_progreso(progress)
+                lines = _lineas_temporada(season)
+                if lines != season_lines:
+                    season_lines = lines
+                    redraw.invalidate(season_rect)
+            if not redraw.dirty:
+                continue
 
+            redraw.begin(screen)
             screen.fill((250, 250, 250))
             _title(screen, bigfont, msg)
-            ranking_lines = progress.get("last_ranking", [])
             stats = [
                 f"Tiempo: {race_time:.2f}s",
                 f"Mejor tiempo: {best_time if best_time else '—'}",
-                "Se generó performance_last_race.png (si tenés matplotlib).",
             ]
             if ranking_lines:
                 stats.append("Clasificación:")
                 stats.extend(ranking_lines)
             stats.append("Elegí: nueva carrera o modo cuidado.")
-            y = 160
+            y = 110
             for s in stats:
-                screen.blit(font.render(s, True, DARK), ( (WIDTH-700)//2, y)); y += 28
+                screen.blit(render_text(font, s, DARK), (50, y)); y += 26
+            screen.blit(chart, chart_rect)
+            screen.blit(render_text(get_font(FONT_NAME, 16), status_png, THEME_MUTED), status_rect)
+            if season_lines:
+                y = season_rect.y
+                for line in season_lines:
+                    screen.blit(render_text(get_font(FONT_NAME, 16), line, DARK), (season_rect.x, y)); y += 20
 
             mx, my = pygame.mouse.get_pos()
             _draw_button(screen, font, btn_nueva, "Nueva carrera", hovered=btn_nueva.collidepoint(mx, my), active=True)
             _draw_button(screen, font, btn_cuidado, "Modo Cuidado 🧴", hovered=btn_cuidado.collidepoint(mx, my))
-            pygame.display.flip()
+            redraw.present(screen)
         if quit_from_results:
             exit_game = True
             break
+    odds.cerrar()
+    charts.cerrar()
+    if season is not None:
+        season.cerrar()
+    flush_progreso(compactar=True)
     pygame.quit()
@@ -0,0 +1,179 @@
+"""
+Perfil de tiempos por frame (overlay con F3).
+
+Cada frame se parte en fases (eventos, física, fondo, sprites, HUD, flip...)
+y se anota cuánto tardó cada una con `time.perf_counter_ns` en un buffer
+circular de tamaño fijo (`array("q")`): medir no reserva memoria por frame.
+El overlay muestra los percentiles del frame y el promedio de cada fase; al
+terminar cada carrera el buffer se vuelca a un CSV propio junto al progreso
+(`equestrian_frames_<fecha-hora>.csv`); se conservan las últimas `TRACE_KEEP`.
+"""
+import csv
+import glob
+import math
+import os
+import time
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+RACE_PHASES = ("eventos", "física", "animación", "fondo", "sprites", "HUD", "perfil", "flip")
+SCREEN_PHASES = ("eventos", "dibujo", "perfil", "flip")
+CAPACITY = 8192          # ~2 minutos de carrera a 60 FPS
+SCREEN_CAPACITY = 512    # las pantallas estáticas redibujan poco
+TRACE_PREFIX = "equestrian_frames_"
+TRACE_KEEP = 20
+OVERLAY_WIDTH = 280
+OVERLAY_REFRESH_NS = 250_000_000  # el texto del overlay se rehace 4 veces por segundo
+FRAME_BUDGET_MS = 1000 / 60
+
+_overlay = False  # compartido por todas las pantallas
+
+
+def overlay_visible() -> bool:
+    return _overlay
+
+
+def toggle_overlay() -> bool:
+    global _overlay
+    _overlay = not _overlay
+    return _overlay
+
+
+class FrameProfiler:
+    """
+    Buffer circular de `capacity` frames. Cada fila guarda el total del frame
+    y el tiempo de cada fase en nanosegundos.
+
+    Uso: `begin_frame()`, un `mark(fase)` al terminar cada fase y
+    `end_frame()`. Un frame sin `end_frame()` se descarta en el próximo
+    `begin_frame()`.
+    """
+
+    def __init__(self, phases: Sequence[str], capacity: int = CAPACITY):
+        self.phases = tuple(phases)
+        self.capacity = capacity
+        self._width = len(self.phases) + 1
+        self._buf = array("q", bytes(8 * capacity * self._width))
+        self._zero = array("q", bytes(8 * self._width))
+        self._col = {p: i + 1 for i, p in enumerate(self.phases)}
+        self._count = 0
+        self._base = 0
+        self._t0 = self._last = 0
+        self._overlay_surf = None
+        self._overlay_at = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def begin_frame(self) -> None:
+        self._base = (self._count % self.capacity) * self._width
+        self._buf[self._base:self._base + self._width] = self._zero
+        self._t0 = self._last = time.perf_counter_ns()
+
+    def mark(self, phase: str) -> None:
+        """Suma a `phase` el tiempo desde la marca anterior."""
+        now = time.perf_counter_ns()
+        self._buf[self._base + self._col[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self) -> None:
+        self._buf[self._base] = self._last - self._t0
+        self._count += 1
+
+    def rows(self, last: int = 0) -> Iterator[array]:
+        """
+        Frames del más viejo al más nuevo: [total, fase0, fase1, ...] en ns.
+        Con `last`, sólo los últimos `last`.
+        """
+        n = min(len(self), last) if last else len(self)
+        first = self._count - n
+        for i in range(first, self._count):
+            base = (i % self.capacity) * self._width
+            yield self._buf[base:base + self._width]
+
+    def percentiles(self, qs: Sequence[float] = (50, 95, 99), last: int = 0) -> List[float]:
+        """Percentiles (por rango más cercano) del tiempo de frame, en ms."""
+        totals = sorted(row[0] for row in self.rows(last))
+        if not totals:
+            return [0.0 for _ in qs]
+        n = len(totals)
+        return [totals[min(n - 1, max(0, math.ceil(q * n / 100) - 1))] / 1e6 for q in qs]
+
+    def phase_means(self, last: int = 120) -> Dict[str, float]:
+        """Promedio de cada fase en los últimos `last` frames, en ms."""
+        rows = list(self.rows(last))
+        if not rows:
+            return {p: 0.0 for p in self.phases}
+        return {p: sum(r[i] for r in rows) / len(rows) / 1e6 for p, i in self._col.items()}
+
+    def dump_csv(self, path: str) -> None:
+        """Vuelca el buffer (a lo sumo `capacity` frames) como CSV en milisegundos."""
+        first = self._count - len(self)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + [f"{p}_ms" for p in self.phases])
+            for i, row in enumerate(self.rows(), start=first):
+                writer.writerow([i] + [f"{v / 1e6:.3f}" for v in row])
+
+    # -- overlay ---------------------------------------------------------
+
+    def overlay_rect(self, screen):
+        import pygame
+
+        font = _overlay_font()
+        h = 12 + font.get_linesize() * (2 + len(self.phases))
+        sw, sh = screen.get_size()
+        return pygame.Rect(sw - OVERLAY_WIDTH - 10, sh - h - 10, OVERLAY_WIDTH, h)
+
+    def draw_overlay(self, screen, fps: float = 0.0):
+        """Dibuja el panel abajo a la derecha y devuelve su rect."""
+        rect = self.overlay_rect(screen)
+        now = time.perf_counter_ns()
+        if self._overlay_surf is None or now - self._overlay_at >= OVERLAY_REFRESH_NS:
+            self._overlay_surf = self._render_overlay(rect.size, fps)
+            self._overlay_at = now
+        screen.blit(self._overlay_surf, rect)
+        return rect
+
+    def _render_overlay(self, size: Tuple[int, int], fps: float):
+        import pygame
+
+        font = _overlay_font()
+        line_h = font.get_linesize()
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf.fill((20, 22, 30, 200))
+        p50, p95, p99 = self.percentiles(last=600)
+        header = f"frame (ms)  p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}"
+        surf.blit(font.render(header, True, (255, 255, 255)), (8, 6))
+        sub = f"F3 · {len(self)} frames" + (f" · {fps:.0f} FPS" if fps else "") + " · promedio por fase"
+        surf.blit(font.render(sub, True, (180, 186, 200)), (8, 6 + line_h))
+        bar_x, bar_w = 128, size[0] - 136
+        for i, (phase, ms) in enumerate(self.phase_means().items()):
+            y = 6 + line_h * (2 + i)
+            surf.blit(font.render(phase, True, (230, 232, 240)), (8, y))
+            value = font.render(f"{ms:.2f}", True, (230, 232, 240))
+            surf.blit(value, (bar_x - 8 - value.get_width(), y))
+            # barra contra el presupuesto de un frame a 60 FPS
+            w = int(bar_w * min(1.0, ms / FRAME_BUDGET_MS))
+            color = (120, 200, 120) if ms < FRAME_BUDGET_MS / 4 else (230, 180, 80)
+            pygame.draw.rect(surf, color, (bar_x, y + line_h // 4, max(1, w), line_h // 2))
+        return surf
+
+
+def trace_path(directory: str = "") -> str:
+    """Ruta nueva para la traza de una carrera; los nombres ordenan por fecha."""
+    now = time.time()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+    return os.path.join(directory, f"{TRACE_PREFIX}{stamp}.csv")
+
+
+def prune_traces(directory: str = "", keep: int = TRACE_KEEP) -> None:
+    """Borra las trazas más viejas y deja las últimas `keep`."""
+    paths = sorted(glob.glob(os.path.join(glob.escape(directory), f"{TRACE_PREFIX}*.csv")))
+    for path in paths[:max(0, len(paths) - keep)]:
+        os.remove(path)
+
+
+def _overlay_font():
+    from equestrian.game.text import get_font
+    return get_font(None, 16)
@@ -0,0 +1,144 @@
+"""
+Redibujo por eventos para las pantallas estáticas (menú, pausa, cuidado, resultados).
+
+La pantalla sólo se vuelve a dibujar cuando algo cambió (entrada, cambio de
+hover, parpadeo del cursor) y se envían al display únicamente los
+rectángulos sucios con `pygame.display.update(rects)`. Sin cambios el loop
+se queda bloqueado en `pygame.event.wait` y no consume CPU.
+
+Cada redibujo se mide con `FrameProfiler` (F3 muestra el overlay): el tiempo
+bloqueado esperando eventos no cuenta como frame.
+"""
+from typing import List, Optional, Sequence
+
+from equestrian.game.profiler import FrameProfiler, SCREEN_PHASES, SCREEN_CAPACITY, overlay_visible, toggle_overlay
+
+IDLE_MS = 250    # despertar periódico sin eventos (p. ej. para sondear las odds)
+CARET_MS = 530   # semiperíodo del parpadeo del cursor
+MAX_FPS = 60     # tope de redibujos por segundo mientras hay cambios
+
+
+class RedrawScheduler:
+    """
+    Lleva la cuenta de qué hay que redibujar en la pantalla actual.
+    Arranca con la pantalla entera sucia para pintar el primer frame.
+    """
+
+    def __init__(self, idle_ms: int = IDLE_MS, caret_ms: int = CARET_MS):
+        self.idle_ms = idle_ms
+        self.caret_ms = caret_ms
+        self._full = True
+        self._rects: List = []
+        self._hovered = None
+        self._caret_rect = None
+        self._caret_on = False
+        self._next_blink: Optional[int] = None
+        self.profiler = FrameProfiler(SCREEN_PHASES, SCREEN_CAPACITY)
+
+    @property
+    def dirty(self) -> bool:
+        return self._full or bool(self._rects)
+
+    def invalidate(self, rect=None) -> None:
+        """Marca `rect` como sucio; sin argumento, la pantalla entera."""
+        import pygame
+
+        if rect is None:
+            self._full = True
+        else:
+            self._rects.append(pygame.Rect(rect))
+
+    def track_hover(self, rects: Sequence, margin: int = 8):
+        """Invalida los botones que ganan o pierden el hover; devuelve el rect bajo el mouse."""
+        import pygame
+
+        mx, my = pygame.mouse.get_pos()
+        current = next((tuple(r) for r in rects if r.collidepoint(mx, my)), None)
+        if current != self._hovered:
+            for r in (self._hovered, current):
+                if r is not None:
+                    # el margen cubre la sombra desplazada del botón
+                    self.invalidate(pygame.Rect(r).inflate(margin, margin))
+            self._hovered = current
+        return current
+
+    def caret(self, rect) -> bool:
+        """
+        Estado del cursor parpadeante dentro de `rect` (None = sin cursor).
+        Invalida el rect cuando cambia la fase del parpadeo.
+        """
+        import pygame
+
+        if rect is None:
+            if self._caret_rect is not None:
+                self.invalidate(self._caret_rect)
+            self._caret_rect = None
+            self._next_blink = None
+            return False
+        now = pygame.time.get_ticks()
+        on = (now // self.caret_ms) % 2 == 0
+        rect = pygame.Rect(rect)
+        if on != self._caret_on or rect != self._caret_rect:
+            self.invalidate(rect)
+        self._caret_on = on
+        self._caret_rect = rect
+        self._next_blink = (now // self.caret_ms + 1) * self.caret_ms
+        return on
+
+    def wait(self, clock) -> List:
+        """
+        Devuelve los eventos pendientes. Si no hay nada sucio, bloquea hasta
+        el próximo evento, el próximo parpadeo o `idle_ms`.
+        """
+        import pygame
+
+        clock.tick(MAX_FPS)
+        events = []
+        if not self.dirty:
+            timeout = self.idle_ms
+            if self._next_blink is not None:
+                timeout = min(timeout, max(1, self._next_blink - pygame.time.get_ticks()))
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                events.append(event)
+        events.extend(pygame.event.get())
+        for event in events:
+            if event.type in _expose_events():
+                self._full = True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                toggle_overlay()
+                self._full = True
+        self.profiler.begin_frame()
+        return events
+
+    def begin(self, screen) -> None:
+        """Recorta el dibujo a la unión de los rects sucios."""
+        self.profiler.mark("eventos")
+        if overlay_visible() and not self._full:
+            self._rects.append(self.profiler.overlay_rect(screen))
+        if not self._full and self._rects:
+            screen.set_clip(self._rects[0].unionall(self._rects[1:]))
+
+    def present(self, screen) -> None:
+        import pygame
+
+        screen.set_clip(None)
+        self.profiler.mark("dibujo")
+        if overlay_visible():
+            self.profiler.draw_overlay(screen)
+        self.profiler.mark("perfil")
+        if self._full:
+            pygame.display.flip()
+        elif self._rects:
+            pygame.display.update(self._rects)
+        self._full = False
+        self._rects = []
+        self.profiler.mark("flip")
+        self.profiler.end_frame()
+
+
+def _expose_events():
+    import pygame
+
+    names = ("VIDEOEXPOSE", "WINDOWEXPOSED", "WINDOWRESTORED", "WINDOWSHOWN")
+    return tuple(getattr(pygame, n) for n in names if hasattr(pygame, n))
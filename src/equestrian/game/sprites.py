@@ -0,0 +1,145 @@
+"""
+Caché de cuadros pre-dibujados del caballo.
+
+Cada cuadro (sombra + caballo + jinete) se hornea una sola vez en una
+superficie con alfa y después la carrera sólo hace un `blit` por caballo.
+Los cuadros se generan a demanda y se descartan con política LRU.
+
+Para campos grandes hay además un nivel de detalle reducido (`lod_frame`):
+una silueta con pocos cuadros de galope, sin sombra ni alfa por píxel.
+`ghost_frame` es el mismo cuadro completo con la transparencia ya aplicada
+(el fantasma del mejor tiempo).
+"""
+import math
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+Color = Tuple[int, int, int]
+Palette = Tuple[Color, Color, Color]  # cuerpo, crin/cola, jinete
+
+PHASE_STEPS = 16   # cuadros por ciclo de galope
+BOOST_STEPS = 4    # niveles de brillo del tap meter
+LOD_PHASE_STEPS = 4  # cuadros por ciclo en la silueta simplificada
+MAX_FRAMES = 512  # un campo grande usa ~430 (4 paletas × 5 escalas × 16 fases + siluetas)
+LOD_COLORKEY = (255, 0, 255)
+GHOST_ALPHA = 110
+
+
+def quantize_phase(phase: float, steps: int = PHASE_STEPS) -> int:
+    return int(round((phase % math.tau) / math.tau * steps)) % steps
+
+
+def quantize_boost(boost: float) -> int:
+    return int(round(max(0.0, min(1.0, boost)) * (BOOST_STEPS - 1)))
+
+
+class SpriteCache:
+    """
+    Cuadros de animación indexados por (paleta, escala, fase, brillo).
+    `draw_fn` es la función que dibuja el caballo (`_draw_horse_sprite`).
+    """
+
+    def __init__(self, draw_fn: Callable, max_frames: int = MAX_FRAMES):
+        self.draw_fn = draw_fn
+        self.max_frames = max_frames
+        self._frames: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def frame(self, palette: Palette, scale: float, phase: float, boost: float):
+        """Devuelve (superficie, (ancla_x, ancla_y)); el ancla es el punto (x, base_y)."""
+        key = (palette, round(scale, 2), quantize_phase(phase), quantize_boost(boost))
+        return self._get(key, self._bake)
+
+    def lod_frame(self, palette: Palette, scale: float, phase: float):
+        """Silueta simplificada para caballos lejanos o chicos; mismo contrato que `frame`."""
+        key = ("lod", palette, round(scale, 2), quantize_phase(phase, LOD_PHASE_STEPS))
+        return self._get(key, lambda _tag, *args: self._bake_lod(*args))
+
+    def ghost_frame(self, palette: Palette, scale: float, phase: float, alpha: int = GHOST_ALPHA):
+        """Cuadro translúcido (sin brillo de tap); mismo contrato que `frame`."""
+        key = ("ghost", palette, round(scale, 2), quantize_phase(phase), alpha)
+        return self._get(key, lambda _tag, *args: self._bake_ghost(*args))
+
+    def _get(self, key: tuple, bake: Callable):
+        cached = self._frames.get(key)
+        if cached is not None:
+            self._frames.move_to_end(key)
+            return cached
+        cached = bake(*key)
+        self._frames[key] = cached
+        while len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+        return cached
+
+    def _bake(self, palette: Palette, scale: float, phase_idx: int, boost_idx: int):
+        import pygame
+
+        # Márgenes holgados alrededor del ancla: cola/cabeza a los lados,
+        # casco del jinete arriba y la sombra por debajo de los cascos.
+        width = int(130 * scale) + 24
+        height = int(150 * scale) + 24
+        anchor_x = int(70 * scale) + 12
+        anchor_y = height - int(22 * scale) - 12
+
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        shadow_w = int(64 * scale)
+        shadow_h = int(18 * scale)
+        pygame.draw.ellipse(surface, (0, 0, 0, 90),
+                            (anchor_x - shadow_w // 2, anchor_y - shadow_h // 2 + 10, shadow_w, shadow_h))
+
+        phase = phase_idx / PHASE_STEPS * math.tau
+        boost = boost_idx / (BOOST_STEPS - 1)
+        bob = math.sin(phase) * 4 * scale
+        body, accent, rider = palette
+        self.draw_fn(surface, anchor_x, anchor_y, scale, body, accent, rider, phase, bob, False, boost)
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface, (anchor_x, anchor_y)
+
+    def _bake_ghost(self, palette: Palette, scale: float, phase_idx: int, alpha: int):
+        import pygame
+
+        surface, anchor = self._bake(palette, scale, phase_idx, 0)
+        # multiplica el alfa por píxel: la sombra y los bordes suaves se conservan
+        surface.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        return surface, anchor
+
+    def _bake_lod(self, palette: Palette, scale: float, phase_idx: int):
+        import pygame
+
+        width = int(105 * scale) + 8
+        height = int(115 * scale) + 6
+        anchor_x = int(60 * scale) + 4
+        anchor_y = height - 3
+
+        surface = pygame.Surface((width, height))
+        surface.fill(LOD_COLORKEY)
+        body, accent, rider = palette
+        phase = phase_idx / LOD_PHASE_STEPS * math.tau
+        bob = int(math.sin(phase) * 3 * scale)
+
+        body_rect = pygame.Rect(anchor_x - int(35 * scale), anchor_y - int(62 * scale) + bob,
+                                int(70 * scale), int(28 * scale))
+        leg_w = max(2, int(5 * scale))
+        for i, (lx, offset) in enumerate(((18, 0.0), (28, math.pi), (54, math.pi), (62, 0.4))):
+            x = body_rect.left + int(lx * scale)
+            swing = int(math.sin(phase + offset) * 8 * scale)
+            color = body if i >= 2 else accent
+            pygame.draw.line(surface, color, (x, body_rect.bottom - 2), (x + swing, anchor_y), leg_w)
+        pygame.draw.ellipse(surface, body, body_rect)
+        pygame.draw.line(surface, accent, (body_rect.left + 2, body_rect.top + int(6 * scale)),
+                         (body_rect.left - int(14 * scale), body_rect.top + int(20 * scale)), leg_w)
+        pygame.draw.ellipse(surface, body, (body_rect.right - int(22 * scale), body_rect.top - int(14 * scale),
+                                            int(24 * scale), int(20 * scale)))
+        torso = pygame.Rect(body_rect.centerx - int(7 * scale), body_rect.top - int(26 * scale),
+                            int(14 * scale), int(24 * scale))
+        pygame.draw.rect(surface, rider, torso)
+        pygame.draw.circle(surface, (255, 224, 189), (torso.centerx, torso.top - int(5 * scale)),
+                           max(2, int(6 * scale)))
+
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.set_colorkey(LOD_COLORKEY, pygame.RLEACCEL)
+        return surface, (anchor_x, anchor_y)
@@ -0,0 +1,52 @@
+"""
+Caché de superficies estáticas de la UI: degradés y tarjetas.
+
+Los fondos de pausa, cuidado y las tarjetas no cambian entre frames, así que
+se construyen una sola vez (con NumPy/surfarray si está disponible) y
+después sólo se blitean.
+"""
+from functools import lru_cache
+from typing import Tuple
+
+Color = Tuple[int, int, int]
+
+
+def _gradient_rows(color_start: Color, color_end: Color, h: int):
+    # mismo redondeo que _color_lerp: int() de c1 + (c2 - c1) * t
+    for i in range(h):
+        t = max(0.0, min(1.0, i / max(1, h - 1)))
+        yield tuple(int(color_start[c] + (color_end[c] - color_start[c]) * t) for c in range(3))
+
+
+@lru_cache(maxsize=32)
+def gradient_surface(color_start: Color, color_end: Color, size: Tuple[int, int]):
+    """Degradé vertical de `color_start` (arriba) a `color_end` (abajo)."""
+    import pygame
+
+    w, h = size
+    surface = pygame.Surface((max(1, w), max(1, h)))
+    try:
+        import numpy as np
+        import pygame.surfarray
+
+        t = np.arange(h, dtype=np.float64) / max(1, h - 1)
+        start = np.array(color_start, dtype=np.float64)
+        rows = (start + (np.array(color_end, dtype=np.float64) - start) * t[:, None]).astype(np.int32)
+        pygame.surfarray.blit_array(surface, np.broadcast_to(rows[None, :, :], (w, h, 3)).copy())
+    except ImportError:
+        for i, col in enumerate(_gradient_rows(color_start, color_end, h)):
+            pygame.draw.line(surface, col, (0, i), (w, i))
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+
+@lru_cache(maxsize=32)
+def card_surface(size: Tuple[int, int], radius: int, color_start: Color, color_end: Color,
+                 outline: Color = (255, 255, 255)):
+    """Tarjeta con degradé y borde fino redondeado."""
+    import pygame
+
+    surface = gradient_surface(color_start, color_end, size).copy()
+    pygame.draw.rect(surface, outline, surface.get_rect(), 1, border_radius=radius)
+    return surface
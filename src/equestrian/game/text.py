@@ -0,0 +1,120 @@
+"""
+Registro de fuentes y caché de textos renderizados.
+
+- `get_font(name, size, bold)` crea cada fuente una sola vez. La ruta del
+  archivo se resuelve una vez y queda guardada en `equestrian_fonts.json`, así
+  que en los arranques siguientes no se vuelve a escanear el sistema (fc-list).
+- `render_text(font, text, color)` guarda las superficies ya rasterizadas (LRU).
+- `wrap_text(font, text, width)` guarda el corte en líneas (LRU).
+Un texto que no cambió nunca se vuelve a rasterizar.
+"""
+import json
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+MAX_RENDERED = 512
+MAX_LAYOUTS = 256
+FONT_CACHE_FILE = "equestrian_fonts.json"
+
+_font_paths: Optional[Dict[str, list]] = None  # "nombre|bold" -> [ruta o None, negrita sintética]
+
+_rendered: "OrderedDict[tuple, object]" = OrderedDict()
+_layouts: "OrderedDict[tuple, List[str]]" = OrderedDict()
+
+
+def _load_font_paths() -> Dict[str, list]:
+    try:
+        with open(FONT_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_font_paths(paths: Dict[str, list]) -> None:
+    tmp = FONT_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(paths, f, ensure_ascii=False)
+        os.replace(tmp, FONT_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def font_path(name: Optional[str], bold: bool = False) -> Tuple[Optional[str], bool]:
+    """
+    (archivo, negrita sintética) que elegiría `SysFont(name, bold=bold)`.
+    None como archivo es la fuente por defecto de pygame.
+    """
+    global _font_paths
+    if _font_paths is None:
+        _font_paths = _load_font_paths()
+    key = f"{name}|{int(bold)}"
+    cached = _font_paths.get(key)
+    if cached is not None and (cached[0] is None or os.path.exists(cached[0])):
+        return cached[0], bool(cached[1])
+
+    import pygame
+    # misma regla que SysFont: si la familia no tiene variante negrita se usa
+    # la normal y se engrosa al renderizar
+    path = pygame.font.match_font(name, bold=bold) if name else None
+    fake_bold = bold and (path is None or path == pygame.font.match_font(name))
+    _font_paths[key] = [path, fake_bold]
+    _save_font_paths(_font_paths)
+    return path, fake_bold
+
+
+@lru_cache(maxsize=None)
+def get_font(name: Optional[str], size: int, bold: bool = False):
+    import pygame
+    path, fake_bold = font_path(name, bold)
+    font = pygame.font.Font(path, size)
+    if fake_bold:
+        font.set_bold(True)
+    return font
+
+
+def _lru_get(cache: OrderedDict, key, build, limit: int):
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache[key] = value
+        if len(cache) > limit:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return value
+
+
+def render_text(font, text: str, color: Tuple[int, ...], antialias: bool = True):
+    key = (font, text, tuple(color), antialias)
+    return _lru_get(_rendered, key, lambda: font.render(text, antialias, color), MAX_RENDERED)
+
+
+def _wrap_uncached(font, text: str, max_width: int) -> List[str]:
+    words = text.split()
+    lines = []
+    current = ""
+    for word in words:
+        test = word if not current else current + " " + word
+        if font.size(test)[0] <= max_width:
+            current = test
+        else:
+            if current:
+                lines.append(current)
+            current = word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def wrap_text(font, text: str, max_width: int) -> List[str]:
+    key = (font, text, max_width)
+    return _lru_get(_layouts, key, lambda: _wrap_uncached(font, text, max_width), MAX_LAYOUTS)
+
+
+def clear() -> None:
+    _rendered.clear()
+    _layouts.clear()
@@ -1,6 +1,29 @@
 import sys, os
+import argparse
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-from equestrian.game.engine import run_game
+from equestrian.game import boot
+from equestrian.game.engine import run_game, MAX_RIVALES, MIN_CABALLOS
+boot.mark("imports")
+
+
+def _caballos(texto: str) -> int:
+    try:
+        n = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"no es un número: {texto!r}")
+    if n < MIN_CABALLOS:
+        raise argparse.ArgumentTypeError(f"la temporada necesita al menos {MIN_CABALLOS} caballos")
+    return n
 
 if __name__ == "__main__":
-    run_game()
+    parser = argparse.ArgumentParser(description="Equestrian Challenge")
+    parser.add_argument("--rivales", type=int, default=3,
+                        help=f"caballos IA en la pista (1-{MAX_RIVALES}; más de 7 activa el modo de campo grande)")
+    parser.add_argument("--temporada", type=_caballos, nargs="?", const=64, default=0, metavar="CABALLOS",
+                        help="modo temporada: series de 8 contra un campeonato de CABALLOS (64 si no se indica)")
+    parser.add_argument("--arranque", action="store_true",
+                        help="imprime la línea de tiempo del arranque hasta que se ve el menú")
+    args = parser.parse_args()
+    if args.arranque:
+        boot.enable()
+    run_game(rivales=args.rivales, temporada=args.temporada)
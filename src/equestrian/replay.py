@@ -0,0 +1,59 @@
+"""
+Re-simula sin ventana las carreras del historial y verifica el resultado.
+
+    python -m equestrian.replay                 # todas las carreras con registro de entradas
+    python -m equestrian.replay --ultimas 20
+    python -m equestrian.replay --procesos 8    # corpus grande repartido en procesos
+
+Sale con código 1 si alguna carrera no da el mismo tiempo y ranking que se
+registró (un `best_time` sospechoso o un cambio en la física). Las carreras
+registradas con otra versión de la física se cuentan como omitidas.
+"""
+import sys, os
+import argparse
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from equestrian.services.history import load_history
+from equestrian.sim.replay import verificar_varias
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Re-simulación de carreras registradas")
+    parser.add_argument("--ultimas", type=int, default=None, help="sólo las últimas N carreras del historial")
+    parser.add_argument("--procesos", type=int, default=1, help="procesos para verificar en paralelo")
+    parser.add_argument("-v", "--verbose", action="store_true", help="muestra también las carreras que coinciden")
+    args = parser.parse_args(argv)
+
+    entries = [e for e in load_history(limit=args.ultimas) if isinstance(e.get("inputs"), dict)]
+    if not entries:
+        print("No hay carreras con registro de entradas en el historial.")
+        return 0
+
+    start = time.perf_counter()
+    results = verificar_varias([e["inputs"] for e in entries], procesos=args.procesos)
+    wall = time.perf_counter() - start
+
+    fallas = 0
+    omitidas = sum(r.omitida for r in results)
+    for entry, res in zip(entries, results):
+        if res.ok and not args.verbose:
+            continue
+        fallas += not res.ok
+        if res.omitida:
+            estado, detalle = "-- ", f"  omitida: {res.motivo}"
+        elif res.ok:
+            estado, detalle = "ok ", ""
+        else:
+            estado = "MAL"
+            detalle = f"  {res.motivo}: registrado {res.tiempo_registrado:.4f}s, re-simulado {res.tiempo:.4f}s"
+        print(f"{estado} {entry.get('timestamp', '?')}  {entry.get('jugador', '?')} · {entry.get('caballo', '?')} "
+              f"({entry.get('clima', '?')}) {entry.get('tiempo', '?')}s{detalle}")
+
+    simulado = sum(r.tiempo for r in results)
+    print(f"{len(results)} carreras, {fallas} con diferencias, {omitidas} omitidas. "
+          f"{simulado:.0f}s de carrera en {wall:.2f}s ({simulado / max(wall, 1e-9):.0f}× tiempo real)")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,34 @@
-from .persistence import cargar_progreso, guardar_progreso
-from .performance import guardar_grafico_performance
-from .history import load_history, append_history
+# Los submódulos se importan al pedir el nombre (PEP 562): importar el paquete
+# no arrastra sqlite3, mmap ni multiprocessing si el llamador no los usa.
+_EXPORTS = {
+    "cargar_progreso": "persistence",
+    "guardar_progreso": "persistence",
+    "flush_progreso": "persistence",
+    "guardar_grafico_performance": "performance",
+    "ChartWorker": "performance",
+    "load_history": "history",
+    "append_history": "history",
+    "OddsEstimator": "odds",
+    "TelemetryRecorder": "telemetry",
+    "TelemetryFile": "telemetry",
+    "abrir_telemetria": "telemetry",
+    "cargar_fantasma": "ghosts",
+    "guardar_fantasma": "ghosts",
+    "Temporada": "season",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
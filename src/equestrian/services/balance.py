@@ -0,0 +1,204 @@
+"""
+Banco de balance: win rate de cada raza en cada clima para un juego de
+parámetros, con carreras Monte Carlo repartidas en un pool de procesos.
+
+Los parámetros son las tablas de balance aplanadas en un vector con nombres:
+
+- `raza.<raza>.velocidad` / `raza.<raza>.resistencia` (`AJUSTES_RAZA`);
+- `terreno.<Yegua|Pura Sangre>.<clima>` (`BONO_TERRENO`);
+- `clima.<clima>.friction` / `clima.<clima>.regen` (`CLIMATE_SETTINGS`).
+
+Cada candidato se aplica sobre las tablas dentro del proceso que lo simula
+(`aplicado`) y todas las celdas usan la misma semilla en todos los
+candidatos, así que las diferencias entre candidatos no son ruido del
+sorteo. Los resultados se guardan en disco por vector de parámetros.
+"""
+import hashlib
+import json
+import os
+import random
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from equestrian.domain.caballo import AJUSTES_RAZA, BONO_TERRENO, RAZAS
+from equestrian.sim.race import CLIMATE_SETTINGS, PHYSICS_VERSION
+
+BALANCE_FILE = "equestrian_balance.json"
+CLIMAS = list(CLIMATE_SETTINGS)
+CARRERAS = 1000  # por celda raza × clima
+
+Params = Dict[str, float]
+# matriz[raza][clima] = [victorias, carreras]
+Matriz = Dict[str, Dict[str, List[int]]]
+
+
+def parametros_actuales() -> Params:
+    """Las tablas de balance vigentes como vector (los ajustes ausentes valen 0 o 1)."""
+    params: Params = {}
+    for raza in RAZAS:
+        for attr in ("velocidad", "resistencia"):
+            params[f"raza.{raza}.{attr}"] = AJUSTES_RAZA[raza].get(attr, 0.0)
+    for tipo, bonos in BONO_TERRENO.items():
+        for clima in CLIMAS:
+            params[f"terreno.{tipo}.{clima}"] = bonos.get(clima, 1.0)
+    for clima, settings in CLIMATE_SETTINGS.items():
+        for attr in ("friction", "regen"):
+            params[f"clima.{clima}.{attr}"] = settings[attr]
+    return params
+
+
+def _tabla(nombre: str) -> Tuple[Dict[str, Dict[str, float]], str, str]:
+    grupo, fila, attr = nombre.split(".")
+    tablas = {"raza": AJUSTES_RAZA, "terreno": BONO_TERRENO, "clima": CLIMATE_SETTINGS}
+    return tablas[grupo], fila, attr
+
+
+@contextmanager
+def aplicado(params: Params) -> Iterator[None]:
+    """Pisa las tablas de balance con `params` y las restaura al salir."""
+    viejos = []
+    for nombre, valor in params.items():
+        tabla, fila, attr = _tabla(nombre)
+        viejos.append((tabla[fila], attr, tabla[fila].get(attr)))
+        tabla[fila][attr] = valor
+    try:
+        yield
+    finally:
+        for fila, attr, viejo in reversed(viejos):
+            if viejo is None:
+                del fila[attr]
+            else:
+                fila[attr] = viejo
+
+
+def clave(params: Params, carreras: int, rivales: int, seed: int) -> str:
+    """Clave del caché: el vector redondeado más todo lo que cambia el resultado."""
+    datos = [PHYSICS_VERSION, carreras, rivales, seed, sorted((k, round(v, 6)) for k, v in params.items())]
+    return hashlib.sha1(json.dumps(datos, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _semilla_celda(seed: int, raza: str, clima: str) -> int:
+    # misma semilla por celda en todos los candidatos
+    return seed * 1000 + RAZAS.index(raza) * 10 + CLIMAS.index(clima)
+
+
+def evaluar_celda(params: Params, raza: str, clima: str, carreras: int = CARRERAS,
+                  rivales: int = 3, seed: int = 0) -> List[int]:
+    """[victorias, carreras] del jugador (automático) con `raza` en `clima`."""
+    from .odds import odds_key, simular_tanda
+
+    with aplicado(params):
+        wins, n = simular_tanda(odds_key(raza, "Yegua", clima, rivales), carreras,
+                                _semilla_celda(seed, raza, clima))
+    return [wins, n]
+
+
+def evaluar(params: Params, carreras: int = CARRERAS, rivales: int = 3, seed: int = 0) -> Matriz:
+    """Win rate de cada raza en cada clima, en este proceso."""
+    return {raza: {clima: evaluar_celda(params, raza, clima, carreras, rivales, seed) for clima in CLIMAS}
+            for raza in RAZAS}
+
+
+def desbalance(matriz: Matriz) -> float:
+    """Promedio por clima de la distancia entre la raza que más gana y la que menos."""
+    rangos = []
+    for clima in CLIMAS:
+        rates = [v[0] / max(1, v[1]) for v in (matriz[raza][clima] for raza in matriz)]
+        rangos.append(max(rates) - min(rates))
+    return sum(rangos) / len(rangos)
+
+
+class BalanceCache:
+    """Resultados por clave de `clave()`, en un JSON que se reescribe entero (son pocos)."""
+
+    def __init__(self, path: str = BALANCE_FILE):
+        self.path = path
+        self._data: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except Exception:
+                self._data = {}
+
+    def get(self, key: str) -> Optional[Matriz]:
+        entry = self._data.get(key)
+        return entry["matriz"] if entry else None
+
+    def put(self, key: str, params: Params, matriz: Matriz) -> None:
+        self._data[key] = {"params": params, "matriz": matriz}
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print("Error guardando el caché de balance:", e)
+
+
+def grilla(base: Params, ejes: Dict[str, Sequence[float]]) -> List[Params]:
+    """Todas las combinaciones de los valores de `ejes` sobre `base`."""
+    candidatos = [dict(base)]
+    for nombre, valores in ejes.items():
+        candidatos = [dict(c, **{nombre: v}) for c in candidatos for v in valores]
+    return candidatos
+
+
+def aleatorios(base: Params, rangos: Dict[str, Tuple[float, float]], n: int, seed: int = 0) -> List[Params]:
+    """`n` candidatos con cada parámetro de `rangos` uniforme en su intervalo."""
+    rng = random.Random(seed)
+    # 3 decimales: lo mismo que redondea `odds_key`
+    return [dict(base, **{k: round(rng.uniform(lo, hi), 3) for k, (lo, hi) in rangos.items()})
+            for _ in range(n)]
+
+
+def barrer(candidatos: Sequence[Params], carreras: int = CARRERAS, rivales: int = 3, seed: int = 0,
+           procesos: Optional[int] = None, cache: Optional[BalanceCache] = None,
+           avance: Optional[Callable[[int, int], None]] = None) -> List[Tuple[Params, Matriz]]:
+    """
+    Evalúa los candidatos (los que ya están en el caché no se corren) y
+    devuelve (params, matriz) en el mismo orden. Con `procesos` > 1 cada
+    celda raza × clima es una tarea del pool, así que hasta un solo
+    candidato ocupa todos los núcleos.
+    """
+    resultados: List[Optional[Matriz]] = []
+    faltan = []
+    for i, params in enumerate(candidatos):
+        matriz = cache.get(clave(params, carreras, rivales, seed)) if cache else None
+        resultados.append(matriz)
+        if matriz is None:
+            faltan.append(i)
+
+    def terminado(i: int, matriz: Matriz, hechos: int) -> None:
+        resultados[i] = matriz
+        if cache:
+            cache.put(clave(candidatos[i], carreras, rivales, seed), candidatos[i], matriz)
+        if avance:
+            avance(hechos, len(faltan))
+
+    if procesos is None:
+        procesos = max(1, (os.cpu_count() or 2) - 1)
+    if procesos <= 1 or not faltan:
+        for hechos, i in enumerate(faltan, 1):
+            terminado(i, evaluar(candidatos[i], carreras, rivales, seed), hechos)
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        celdas = len(RAZAS) * len(CLIMAS)
+        parciales: Dict[int, Matriz] = {i: {raza: {} for raza in RAZAS} for i in faltan}
+        hechos = 0
+        # "spawn", como los demás pools: los procesos arrancan con las tablas del módulo
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futuros = {pool.submit(evaluar_celda, candidatos[i], raza, clima, carreras, rivales, seed): (i, raza, clima)
+                       for i in faltan for raza in RAZAS for clima in CLIMAS}
+            for fut in as_completed(futuros):
+                i, raza, clima = futuros[fut]
+                matriz = parciales[i]
+                matriz[raza][clima] = fut.result()
+                if sum(len(fila) for fila in matriz.values()) == celdas:
+                    hechos += 1
+                    # las celdas llegan en cualquier orden: el caché las guarda en el de las tablas
+                    terminado(i, {raza: {clima: matriz[raza][clima] for clima in CLIMAS} for raza in RAZAS},
+                              hechos)
+                    del parciales[i]
+    return list(zip(candidatos, resultados))
@@ -0,0 +1,126 @@
+"""
+Fantasma del mejor tiempo: la trayectoria (distancia en el tiempo) de la
+mejor carrera ganada por cada (jugador, clima).
+
+La trayectoria se guarda remuestreada en una grilla uniforme (`GHOST_HZ`),
+así que la posición del fantasma en un instante es un índice y una
+interpolación, O(1), sin buscar nada. Viven en SQLite (una fila por jugador
+y clima, float32 en un BLOB) y se carga sólo la de la carrera que empieza.
+"""
+import os
+import sqlite3
+import time
+from array import array
+from contextlib import closing
+from typing import Optional
+
+GHOSTS_DB = "equestrian_ghosts.sqlite3"
+GHOST_HZ = 20         # muestras por segundo de carrera
+BUSY_TIMEOUT = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ghosts (
+    jugador   TEXT NOT NULL,
+    clima     TEXT NOT NULL,
+    tiempo    REAL NOT NULL,
+    hz        INTEGER NOT NULL,
+    dist      BLOB NOT NULL,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (jugador, clima)
+);
+"""
+
+
+class GhostTrajectory:
+    """
+    `dist[k]` es la distancia en t = k / hz; el último valor es la distancia
+    al cruzar la meta (en t = `tiempo`, que no cae en la grilla).
+    """
+
+    def __init__(self, tiempo: float, dist: array, hz: int = GHOST_HZ):
+        self.tiempo = tiempo
+        self.dist = dist
+        self.hz = hz
+
+    def dist_at(self, t: float) -> float:
+        dist = self.dist
+        if t >= self.tiempo:
+            return dist[-1]
+        if t <= 0.0:
+            return dist[0]
+        x = t * self.hz
+        i = int(x)
+        last = len(dist) - 2  # última muestra de la grilla
+        if i < last:
+            return dist[i] + (dist[i + 1] - dist[i]) * (x - i)
+        # tramo final: de la última muestra de la grilla hasta la meta
+        t_last = last / self.hz
+        frac = (t - t_last) / max(1e-9, self.tiempo - t_last)
+        return dist[last] + (dist[-1] - dist[last]) * frac
+
+
+class GhostRecorder:
+    """Junta la distancia del jugador cada `physics_hz / GHOST_HZ` pasos de física."""
+
+    def __init__(self, physics_hz: int, hz: int = GHOST_HZ):
+        self.hz = hz
+        self.every = max(1, physics_hz // hz)
+        self.dist = array("f", [0.0])
+
+    def record(self, steps: int, dist: float) -> None:
+        if steps % self.every == 0:
+            self.dist.append(dist)
+
+    def cerrar(self, tiempo: float, dist_final: float) -> GhostTrajectory:
+        dist = array("f", self.dist)
+        dist.append(dist_final)
+        return GhostTrajectory(tiempo, dist, self.hz)
+
+
+_ready = set()  # rutas absolutas de las bases ya creadas en este proceso
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    key = os.path.abspath(path)
+    if key not in _ready:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _ready.add(key)
+    return conn
+
+
+def cargar_fantasma(jugador: str, clima: str, path: str = GHOSTS_DB) -> Optional[GhostTrajectory]:
+    """Mejor trayectoria del jugador en ese clima (None si todavía no ganó ahí)."""
+    try:
+        with closing(_connect(path)) as conn:
+            row = conn.execute("SELECT tiempo, hz, dist FROM ghosts WHERE jugador = ? AND clima = ?",
+                               (jugador, clima)).fetchone()
+    except sqlite3.Error as e:
+        print("Error leyendo el fantasma:", e)
+        return None
+    if row is None:
+        return None
+    tiempo, hz, blob = row
+    dist = array("f")
+    dist.frombytes(blob)
+    if len(dist) < 2:
+        return None
+    return GhostTrajectory(tiempo, dist, hz)
+
+
+def guardar_fantasma(jugador: str, clima: str, ghost: GhostTrajectory, path: str = GHOSTS_DB) -> bool:
+    """Guarda la trayectoria sólo si mejora la anterior; devuelve si se guardó."""
+    try:
+        with closing(_connect(path)) as conn:
+            cur = conn.execute(
+                "INSERT INTO ghosts (jugador, clima, tiempo, hz, dist, timestamp) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (jugador, clima) DO UPDATE SET "
+                "tiempo = excluded.tiempo, hz = excluded.hz, dist = excluded.dist, timestamp = excluded.timestamp "
+                "WHERE excluded.tiempo < ghosts.tiempo",
+                (jugador, clima, ghost.tiempo, ghost.hz, ghost.dist.tobytes(), time.strftime("%Y-%m-%d %H:%M:%S")))
+            return cur.rowcount > 0
+    except sqlite3.Error as e:
+        print("Error guardando el fantasma:", e)
+        return False
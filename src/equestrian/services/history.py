@@ -1,26 +1,115 @@
+"""
+Historial de carreras en SQLite (modo WAL).
+
+Cada carrera es una fila nueva: anexar es O(1), leer las últimas N usa el
+índice de la clave primaria sin parsear todo el archivo y dos instancias del
+juego pueden escribir a la vez (SQLite serializa las escrituras). No hay
+tope: se conserva todo el historial.
+
+La primera vez se importa el `equestrian_history.json` heredado que esté
+junto a la base (el archivo no se toca; la migración queda registrada en la
+tabla `meta`).
+"""
 import json
 import os
+import sqlite3
 import time
-from typing import Dict, Any, List
+from contextlib import closing
+from typing import Dict, Any, List, Optional
+
+HISTORY_DB = "equestrian_history.sqlite3"
+HISTORY_FILE = "equestrian_history.json"  # formato anterior, sólo para migrar
+BUSY_TIMEOUT = 5.0  # segundos esperando el lock si otra instancia está escribiendo
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    jugador   TEXT,
+    clima     TEXT,
+    tiempo    REAL,
+    gano      INTEGER,
+    data      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
 
-HISTORY_FILE = "equestrian_history.json"
 
-def load_history() -> List[Dict[str, Any]]:
-    if os.path.exists(HISTORY_FILE):
+def _row(entry: Dict[str, Any]) -> tuple:
+    return (
+        entry.get("timestamp", ""),
+        entry.get("jugador"),
+        entry.get("clima"),
+        entry.get("tiempo"),
+        None if entry.get("gano") is None else int(bool(entry.get("gano"))),
+        json.dumps(entry, ensure_ascii=False),
+    )
+
+
+def _migrar_json(conn: sqlite3.Connection, legacy: str) -> None:
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone():
+        return
+    entries: List[Dict[str, Any]] = []
+    if os.path.exists(legacy):
         try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(legacy, "r", encoding="utf-8") as f:
+                entries = [e for e in json.load(f) if isinstance(e, dict)]
         except Exception:
-            return []
-    return []
+            entries = []
+    conn.executemany(
+        "INSERT INTO history (timestamp, jugador, clima, tiempo, gano, data) VALUES (?, ?, ?, ?, ?, ?)",
+        [_row(e) for e in entries])
+    conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_json', ?)", (str(len(entries)),))
+
+
+_ready = set()  # rutas absolutas de las bases ya creadas/migradas en este proceso
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    key = os.path.abspath(path)
+    if key not in _ready:
+        conn.execute("PRAGMA journal_mode=WAL")  # queda grabado en el archivo
+        conn.executescript(_SCHEMA)
+        # BEGIN IMMEDIATE: si dos instancias arrancan juntas, sólo una migra
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _migrar_json(conn, os.path.join(os.path.dirname(path), HISTORY_FILE))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            conn.close()
+            raise
+        _ready.add(key)
+    return conn
+
+
+def load_history(limit: Optional[int] = None, path: str = HISTORY_DB) -> List[Dict[str, Any]]:
+    """Entradas en orden cronológico; con `limit`, sólo las últimas `limit`."""
+    try:
+        with closing(_connect(path)) as conn:
+            if limit is None:
+                rows = conn.execute("SELECT data FROM history ORDER BY id").fetchall()
+            else:
+                rows = conn.execute("SELECT data FROM history ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+                rows.reverse()
+    except sqlite3.Error:
+        return []
+    return [json.loads(data) for (data,) in rows]
+
 
-def append_history(entry: Dict[str, Any]) -> None:
-    history = load_history()
+def append_history(entry: Dict[str, Any], path: str = HISTORY_DB) -> None:
     entry = dict(entry)
     if "timestamp" not in entry:
         entry["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
-    history.append(entry)
-    if len(history) > 500:
-        history = history[-500:]
-    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(history, f, ensure_ascii=False, indent=2)
+    try:
+        with closing(_connect(path)) as conn:
+            conn.execute(
+                "INSERT INTO history (timestamp, jugador, clima, tiempo, gano, data) VALUES (?, ?, ?, ?, ?, ?)",
+                _row(entry))
+    except sqlite3.Error as e:
+        print("Error guardando historial:", e)
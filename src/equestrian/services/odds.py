@@ -0,0 +1,208 @@
+"""
+Probabilidad estimada de ganar (Monte Carlo) para el panel del menú.
+
+Las simulaciones corren en un pool de procesos por tandas; el menú sólo
+consulta futures ya terminados, así que nunca se bloquea. Los resultados se
+guardan en un caché LRU en disco para no recalcular al volver a una opción.
+El archivo lleva la versión de la física y una huella de las tablas de
+balance: si cambia cualquiera de las dos, se descarta entero. La clave
+incluye cuántos rivales hay en la carrera (3 por defecto, `--rivales` o los
+de la serie en la temporada).
+"""
+import json
+import math
+import os
+import random
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from equestrian.domain.caballo import AJUSTES_RAZA, BONO_TERRENO, crear_caballo
+from equestrian.sim.race import CLIMATE_SETTINGS, PHYSICS_VERSION
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+ODDS_FILE = "equestrian_odds.json"
+ODDS_CACHE_MAX = 256
+CLIMAS = ["Soleado", "Lluvioso", "Ventoso", "Barro"]
+
+CHUNK_RACES = 2000       # carreras por tanda enviada al pool
+TARGET_HALF_WIDTH = 0.01  # se corta cuando el IC95 mide ±1 punto
+MAX_RACES = 40000
+CACHE_FORMAT = 2          # 2: la clave lleva los rivales
+
+# raza, sexo, clima, resistencia, velocidad, rivales
+OddsKey = Tuple[str, str, str, float, float, int]
+
+
+def cache_version() -> str:
+    """Física + tablas de balance: las probabilidades guardadas valen sólo con las mismas."""
+    tablas = json.dumps([AJUSTES_RAZA, BONO_TERRENO, CLIMATE_SETTINGS], sort_keys=True, ensure_ascii=False)
+    return f"{CACHE_FORMAT}/{PHYSICS_VERSION}/{zlib.crc32(tablas.encode('utf-8')):08x}"
+
+
+@dataclass
+class Estimacion:
+    wins: int
+    n: int
+    done: bool = False
+
+    @property
+    def intervalo(self) -> Tuple[float, float, float]:
+        return wilson(self.wins, self.n)
+
+
+def wilson(wins: int, n: int, z: float = 1.96) -> Tuple[float, float, float]:
+    """Proporción e intervalo de Wilson: (p, bajo, alto)."""
+    if n <= 0:
+        return 0.0, 0.0, 1.0
+    p = wins / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return p, max(0.0, center - half), min(1.0, center + half)
+
+
+def odds_key(raza: str, sexo: str, clima: str, rivales: int = 3) -> OddsKey:
+    caballo = crear_caballo("_", raza, sexo)
+    return (raza, sexo, clima, round(caballo.resistencia, 3), round(caballo.velocidad, 3), rivales)
+
+
+def simular_tanda(key: OddsKey, races: int, seed: int) -> Tuple[int, int]:
+    """Corre `races` carreras sin ventana contra los rivales IA de `key` y devuelve (victorias, carreras)."""
+    raza, sexo, clima, resistencia, velocidad, rivales = key
+    caballo = crear_caballo("Simulado", raza, sexo)
+    caballo.resistencia = resistencia
+    caballo.velocidad = velocidad
+    climas = CLIMAS if clima == "Aleatorio" else [clima]
+    try:
+        from equestrian.sim.batch import nueva_batch
+    except ImportError:  # sin numpy: motor puro, más lento pero equivalente
+        from equestrian import sim
+        rng = random.Random(seed)
+        wins = 0
+        for _ in range(races):
+            caballo.energia = 100.0
+            state = sim.simular(sim.nueva_carrera(caballo, rng.choice(climas), rivales=rivales,
+                                                  seed=rng.getrandbits(32), jugador_automatico=True))
+            wins += state.won
+        return wins, races
+    batch = nueva_batch(caballo, climas, races, rivales=rivales, seed=seed).run()
+    return int((batch.winner == 0).sum()), int(batch.finished.sum())
+
+
+class OddsCache:
+    """Caché LRU persistente: clave (raza, sexo, clima, resistencia, velocidad, rivales)."""
+
+    def __init__(self, path: str = ODDS_FILE, max_entries: int = ODDS_CACHE_MAX):
+        self.path = path
+        self.max_entries = max_entries
+        self.version = cache_version()
+        self._data: "OrderedDict[OddsKey, Dict[str, int]]" = OrderedDict()
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # el formato viejo (una lista sin versión) también se descarta
+                if isinstance(data, dict) and data.get("version") == self.version:
+                    for key, value in data["entradas"]:
+                        self._data[tuple(key)] = value
+            except Exception:
+                self._data.clear()
+
+    def get(self, key: OddsKey) -> Optional[Dict[str, int]]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: OddsKey, value: Dict[str, int]) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+        self.save()
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": self.version, "entradas": [[list(k), v] for k, v in self._data.items()]},
+                          f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print("Error guardando caché de probabilidades:", e)
+
+
+class OddsEstimator:
+    """
+    Coordina las tandas en el pool. `consultar()` es no bloqueante: devuelve lo
+    que haya hasta el momento y encola más trabajo si el intervalo sigue ancho.
+    """
+
+    def __init__(self, cache: Optional[OddsCache] = None, workers: Optional[int] = None):
+        self.cache = cache or OddsCache()
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self._pool: Optional["ProcessPoolExecutor"] = None
+        self._parciales: Dict[OddsKey, Estimacion] = {}
+        self._pendientes: Dict[OddsKey, List["Future"]] = {}
+        self._tandas: Dict[OddsKey, int] = {}
+
+    def _executor(self) -> "ProcessPoolExecutor":
+        if self._pool is None:
+            # se importan con el primer pedido
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # "spawn": los procesos no heredan la ventana de SDL ni el hilo escritor del progreso
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def consultar(self, raza: str, sexo: str, clima: str, rivales: int = 3) -> Estimacion:
+        key = odds_key(raza, sexo, clima, rivales)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return Estimacion(cached["wins"], cached["n"], done=True)
+
+        est = self._parciales.setdefault(key, Estimacion(0, 0))
+        futures = self._pendientes.setdefault(key, [])
+        for fut in [f for f in futures if f.done()]:
+            futures.remove(fut)
+            if fut.cancelled():
+                continue
+            try:
+                wins, n = fut.result()
+            except Exception as e:
+                print("Falló una tanda de simulación:", e)
+                continue
+            est.wins += wins
+            est.n += n
+
+        _, lo, hi = est.intervalo
+        if est.n >= MAX_RACES or (est.n > 0 and (hi - lo) / 2 <= TARGET_HALF_WIDTH):
+            for fut in futures:
+                fut.cancel()
+            self._pendientes.pop(key, None)
+            self._tandas.pop(key, None)
+            self._parciales.pop(key, None)
+            self.cache.put(key, {"wins": est.wins, "n": est.n})
+            est.done = True
+            return est
+
+        # Mantener el pool ocupado sólo con la opción que el jugador está mirando
+        for other, pend in self._pendientes.items():
+            if other != key:
+                pend[:] = [f for f in pend if not f.cancel()]
+        while len(futures) < self.workers:
+            idx = self._tandas.get(key, 0)
+            self._tandas[key] = idx + 1
+            seed = zlib.crc32(repr(key).encode("utf-8")) * 1000 + idx
+            futures.append(self._executor().submit(simular_tanda, key, CHUNK_RACES, seed))
+        return est
+
+    def cerrar(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -1,19 +1,45 @@
-from typing import List, Dict
+"""
+Gráfico de rendimiento de la última carrera (PNG con matplotlib).
+
+matplotlib nunca se importa en el proceso del juego: `ChartWorker` genera el
+PNG en un proceso aparte (backend Agg) leyendo la telemetría ya guardada, y
+la pantalla de resultados dibuja mientras tanto su propio gráfico con pygame
+(`game/chart.py`).
+"""
+from typing import TYPE_CHECKING, List, Dict, Optional, Union
+
+from .telemetry import TelemetryRace, TelemetryFile, TELEMETRY_FILE
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
 
 PERF_PNG = "performance_last_race.png"
 
-def guardar_grafico_performance(perf_samples: List[Dict[str, float]]) -> None:
-    if not perf_samples:
-        return
+def guardar_grafico_performance(perf: Union[TelemetryRace, List[Dict[str, float]]],
+                                destino: str = PERF_PNG) -> bool:
+    """
+    Grafica velocidad y energía del jugador. Acepta una carrera de la
+    telemetría (columnas float32 leídas del mmap) o la lista de muestras vieja.
+    """
+    if not perf or (isinstance(perf, TelemetryRace) and perf.samples == 0):
+        return False
     try:
+        import matplotlib
+        matplotlib.use("Agg")  # sin ventana: sólo se escribe el PNG
         import matplotlib.pyplot as plt
     except Exception as e:
         print("No se pudo cargar matplotlib:", e)
-        return
+        return False
 
-    t = [s["t"] for s in perf_samples]
-    v = [s["vel"] for s in perf_samples]
-    e = [s["eng"] for s in perf_samples]
+    if isinstance(perf, TelemetryRace):
+        import numpy as np  # viene con matplotlib
+        # una copia directa desde el mmap (sin parsear): la figura puede
+        # sobrevivir al archivo abierto
+        t, v, e = (np.array(perf.column(c), dtype=np.float32) for c in ("t", "vel", "eng"))
+    else:
+        t = [s["t"] for s in perf]
+        v = [s["vel"] for s in perf]
+        e = [s["eng"] for s in perf]
 
     plt.figure(figsize=(8, 4.5))
     plt.title("Rendimiento de la carrera")
@@ -24,6 +50,50 @@ def guardar_grafico_performance(perf_samples: List[Dict[str, float]]) -> None:
     plt.grid(True, linestyle="--", alpha=0.4)
     plt.legend()
     plt.tight_layout()
-    plt.savefig(PERF_PNG)
+    plt.savefig(destino)
     plt.close()
-    print(f"Gráfico de rendimiento guardado en {PERF_PNG}")
+    print(f"Gráfico de rendimiento guardado en {destino}")
+    return True
+
+
+def _png_desde_telemetria(path: str, indice: int, destino: str) -> bool:
+    with TelemetryFile(path) as tel:
+        return guardar_grafico_performance(tel[indice], destino)
+
+
+def _precargar() -> None:
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot  # noqa: F401
+    except Exception:
+        pass
+
+
+class ChartWorker:
+    """Proceso único que genera los PNG; `encargar()` devuelve un Future."""
+
+    def __init__(self):
+        self._pool: Optional["ProcessPoolExecutor"] = None
+
+    def _executor(self) -> "ProcessPoolExecutor":
+        if self._pool is None:
+            # multiprocessing pesa al importar: recién cuando hace falta el proceso
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # "spawn": el hijo no hereda la ventana de SDL ni los hilos del juego
+            self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def precalentar(self) -> None:
+        """Arranca el proceso e importa matplotlib allí antes del primer gráfico."""
+        if self._pool is None:
+            self._executor().submit(_precargar)
+
+    def encargar(self, path: str = TELEMETRY_FILE, indice: int = -1, destino: str = PERF_PNG) -> "Future[bool]":
+        return self._executor().submit(_png_desde_telemetria, path, indice, destino)
+
+    def cerrar(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -1,21 +1,169 @@
+"""
+Guardado del progreso en segundo plano.
+
+- `guardar_progreso(data)` no toca el disco: calcula qué claves cambiaron y
+  encola ese delta para un hilo escritor.
+- El hilo anexa cada delta como una línea JSON en `equestrian_progress.journal`
+  y cada tanto compacta todo en el snapshot `equestrian_progress.json`
+  (archivo temporal + `os.replace`, así que nunca queda a medio escribir).
+- `cargar_progreso()` lee el snapshot y vuelve a aplicar el journal; una
+  última línea cortada por un crash simplemente se ignora.
+"""
+import atexit
+import copy
 import json
 import os
-from typing import Dict, Any
+import queue
+import threading
+from typing import Dict, Any, Optional, Tuple
 
 SAVE_FILE = "equestrian_progress.json"
+JOURNAL_FILE = "equestrian_progress.journal"
+COMPACT_EVERY = 16             # deltas en el journal antes de reescribir el snapshot
+COMPACT_BYTES = 256 * 1024     # o si el journal ya pesa esto
 
-def cargar_progreso() -> Dict[str, Any]:
+_lock = threading.Lock()
+_known: Optional[Dict[str, Any]] = None  # último estado encolado (lo que habrá en disco)
+_writer: Optional["_Writer"] = None
+
+
+def _leer_disco() -> Tuple[Dict[str, Any], int, bool]:
+    """
+    Snapshot + journal. Devuelve (estado, deltas aplicados desde el snapshot,
+    si el journal terminaba en una línea cortada).
+    """
+    data: Dict[str, Any] = {}
     if os.path.exists(SAVE_FILE):
         try:
             with open(SAVE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+                data = json.load(f)
+        except Exception as e:
+            print("Progreso dañado, se reconstruye desde el journal:", e)
+            data = {}
+    applied = 0
+    torn = False
+    if os.path.exists(JOURNAL_FILE):
+        with open(JOURNAL_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    delta = json.loads(line)
+                except ValueError:
+                    torn = True  # línea incompleta: el proceso murió escribiéndola
+                    break
+                _aplicar(data, delta)
+                applied += 1
+    return data, applied, torn
+
+
+def _aplicar(data: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    data.update(delta.get("set", {}))
+    for key in delta.get("del", []):
+        data.pop(key, None)
+
+
+def _delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    delta: Dict[str, Any] = {}
+    changed = {k: v for k, v in new.items() if k not in old or old[k] != v}
+    removed = [k for k in old if k not in new]
+    if changed:
+        delta["set"] = changed
+    if removed:
+        delta["del"] = removed
+    return delta
+
+
+class _Writer(threading.Thread):
+    """Hilo que serializa todas las escrituras del progreso."""
+
+    def __init__(self, pending: int):
+        super().__init__(name="progress-writer", daemon=True)
+        self.queue: "queue.Queue" = queue.Queue()
+        self.pending = pending  # deltas en el journal desde el último snapshot
+
+    def run(self) -> None:
+        while True:
+            kind, delta, full = self.queue.get()
+            try:
+                if kind == "delta":
+                    self._anexar(delta)
+                # "compactar" (al salir) sólo si quedaron deltas; "compact" siempre
+                if (kind == "compact" or (kind == "compactar" and self.pending)
+                        or self.pending >= COMPACT_EVERY or self._journal_bytes() >= COMPACT_BYTES):
+                    self._compactar(full)
+            except Exception as e:
+                print("Error guardando progreso:", e)
+            finally:
+                self.queue.task_done()
+
+    def _journal_bytes(self) -> int:
+        try:
+            return os.path.getsize(JOURNAL_FILE)
+        except OSError:
+            return 0
+
+    def _anexar(self, delta: Dict[str, Any]) -> None:
+        line = json.dumps(delta, ensure_ascii=False, separators=(",", ":"))
+        with open(JOURNAL_FILE, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending += 1
+
+    def _compactar(self, full: Dict[str, Any]) -> None:
+        tmp = SAVE_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(full, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, SAVE_FILE)
+        # si se corta acá, el journal se vuelve a aplicar sobre el snapshot
+        # nuevo: los deltas son "poner clave = valor", así que da lo mismo
+        open(JOURNAL_FILE, "w").close()
+        self.pending = 0
+
+
+def _get_writer() -> "_Writer":
+    global _writer, _known
+    if _writer is None:
+        _known, applied, torn = _leer_disco()
+        _writer = _Writer(applied)
+        _writer.start()
+        if torn:
+            # no anexar detrás de una línea rota: se compacta primero
+            _writer.queue.put(("compact", None, _known))
+        atexit.register(flush_progreso, True)
+    return _writer
+
+
+def cargar_progreso() -> Dict[str, Any]:
+    with _lock:
+        if _writer is not None:
+            # lo encolado es lo que va a quedar en disco: no hace falta esperar al hilo
+            return copy.deepcopy(_known)
+        data, _, _ = _leer_disco()
+        return data
+
 
 def guardar_progreso(data: Dict[str, Any]) -> None:
-    try:
-        with open(SAVE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print("Error guardando progreso:", e)
+    """Encola el guardado y vuelve enseguida (el disco lo toca el hilo escritor)."""
+    global _known
+    with _lock:
+        writer = _get_writer()
+        # copia propia: el juego sigue modificando `data` mientras el hilo escribe
+        new = copy.deepcopy(data)
+        delta = _delta(_known, new)
+        if not delta:
+            return
+        _known = new
+        writer.queue.put(("delta", delta, new))
+
+
+def flush_progreso(compactar: bool = False) -> None:
+    """Espera a que se escriba todo lo encolado; con `compactar`, reescribe el snapshot."""
+    with _lock:
+        if _writer is None:
+            return
+        if compactar:
+            # `pending` es del hilo escritor: que decida él si hace falta
+            _writer.queue.put(("compactar", None, _known))
+        _writer.queue.join()
@@ -0,0 +1,289 @@
+"""
+Modo temporada: un campeonato de muchos caballos (64 por defecto) corrido
+en fechas. En cada fecha los caballos se reparten en series de hasta SERIE;
+el jugador corre la suya en pantalla y las demás se simulan sin ventana en un
+pool de procesos.
+
+Las series se encargan al pool antes de que arranque la carrera del jugador
+(`preparar_serie`) y se recogen sin bloquear (`actualizar`): cuando aparece
+la pantalla de resultados ya están corridas, y con ellas la tabla y las
+series de la fecha siguiente. Cada serie se simula por eventos
+(`simular_eventos`), unos milisegundos por serie.
+
+Todo sale de la semilla de la temporada (sorteo, caballos, semillas de cada
+serie), así que una fecha que se abandona a mitad vuelve a dar lo mismo.
+"""
+import math
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from equestrian.domain.caballo import RAZAS, Caballo, crear_caballo
+from equestrian.sim.race import OPPONENT_POOL
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+SEASON_VERSION = 1
+CABALLOS = 64
+MIN_CABALLOS = 2
+SERIE = 8        # caballos por serie (el jugador más 7 rivales: no es campo grande)
+FECHAS = 6
+PUNTOS = (10, 8, 6, 5, 4, 3, 2, 1)  # por puesto en la serie; del 9.º en adelante, 0
+SERIES_POR_TANDA = 4  # series por tarea del pool
+
+# OPPONENT_POOL ampliado; pasados estos nombres se numera ("Centella II", ...)
+SEASON_POOL = [name for name, _ in OPPONENT_POOL] + [
+    "Tormenta", "Lucero", "Azabache", "Pampa", "Cometa", "Brisa", "Trueno", "Estrella",
+    "Malambo", "Alazan", "Niebla", "Tango", "Saeta", "Gaucho", "Luna", "Huracan",
+    "Ceibo", "Chispa", "Fortin", "Quimera", "Zafiro", "Dulce", "Pegaso", "Arena",
+    "Tordillo", "Rayo", "Vendaval", "Perla", "Corsario", "Ambar", "Sombra", "Nevada",
+]
+SEXOS = ("Yegua", "Macho")
+_ROMANOS = ("", " II", " III", " IV", " V", " VI", " VII", " VIII", " IX", " X")
+
+
+@dataclass
+class Inscripto:
+    nombre: str
+    raza: str
+    sexo: str
+    velocidad: float
+    resistencia: float
+    jugador: bool = False
+    puntos: int = 0
+    victorias: int = 0
+    carreras: int = 0
+
+    def caballo(self) -> Caballo:
+        c = crear_caballo(self.nombre, self.raza, self.sexo)
+        c.velocidad = self.velocidad
+        c.resistencia = self.resistencia
+        return c
+
+
+def _nombre(i: int) -> str:
+    vuelta, i = divmod(i, len(SEASON_POOL))
+    sufijo = _ROMANOS[vuelta] if vuelta < len(_ROMANOS) else f" {vuelta + 1}"
+    return SEASON_POOL[i] + sufijo
+
+
+def _semilla(seed: int, *clave: Any) -> int:
+    return random.Random("/".join(map(str, (seed,) + clave))).getrandbits(32)
+
+
+def armar_series(orden: Sequence[int], tam: int = SERIE) -> List[List[int]]:
+    """Parte `orden` en tramos consecutivos de hasta `tam` y tamaños parejos."""
+    n = len(orden)
+    k = max(1, math.ceil(n / tam))
+    series, i = [], 0
+    for s in range(k):
+        largo = n // k + (1 if s < n % k else 0)
+        series.append(list(orden[i:i + largo]))
+        i += largo
+    return series
+
+
+def simular_series(tareas: List[Tuple[List[Inscripto], str, int]]) -> List[List[int]]:
+    """Corre cada serie (inscriptos, clima, semilla) y devuelve el orden de llegada (índices)."""
+    from equestrian.sim.race import nueva_serie
+    from equestrian.sim.events import simular_eventos
+
+    resultados = []
+    for inscriptos, clima, seed in tareas:
+        state = simular_eventos(nueva_serie([i.caballo() for i in inscriptos], clima, seed))
+        pos = {id(c): idx for idx, c in enumerate(state.competitors)}
+        resultados.append([pos[id(c)] for c in (state.ranking or list(state.leaderboard))])
+    return resultados
+
+
+class Temporada:
+    """
+    Estado de la temporada y coordinación del pool. `series` son índices en
+    `inscriptos`; `a_dict` / `desde_dict` lo guardan dentro del progreso.
+    """
+
+    def __init__(self, inscriptos: List[Inscripto], seed: int, fechas: int = FECHAS,
+                 fecha: int = 0, series: Optional[List[List[int]]] = None,
+                 workers: Optional[int] = None):
+        self.inscriptos = inscriptos
+        self.seed = seed
+        self.fechas = fechas
+        self.fecha = fecha
+        self.series = series if series is not None else self._sortear()
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self._pool: Optional["ProcessPoolExecutor"] = None
+        self._clima: Optional[str] = None
+        self._pendientes: Dict["Future", List[int]] = {}
+        self._resultados: Dict[int, List[int]] = {}
+
+    @classmethod
+    def nueva(cls, jugador: str, caballos: int = CABALLOS, fechas: int = FECHAS,
+              seed: Optional[int] = None) -> "Temporada":
+        """El caballo del jugador y `caballos - 1` rivales con raza, sexo y forma sorteados."""
+        if seed is None:
+            seed = random.getrandbits(32)
+        rng = random.Random(seed)
+        inscriptos = [Inscripto(jugador, "Pura Sangre", "Yegua", 0.0, 0.0, jugador=True)]
+        nombres = (_nombre(i) for i in range(len(SEASON_POOL) * len(_ROMANOS) + caballos))
+        for nombre in nombres:
+            if len(inscriptos) == max(MIN_CABALLOS, caballos):
+                break
+            if nombre == jugador:
+                continue
+            base = crear_caballo(nombre, rng.choice(RAZAS), rng.choice(SEXOS))
+            # la forma es propia de cada caballo y dura toda la temporada
+            inscriptos.append(Inscripto(nombre, base.raza_base, base.sexo,
+                                        round(base.velocidad + rng.uniform(-0.3, 0.4), 3),
+                                        round(base.resistencia + rng.uniform(-0.05, 0.05), 3)))
+        return cls(inscriptos, seed, fechas)
+
+    @classmethod
+    def desde_dict(cls, data: Dict[str, Any]) -> Optional["Temporada"]:
+        if not isinstance(data, dict) or data.get("v") != SEASON_VERSION:
+            return None
+        try:
+            return cls([Inscripto(**d) for d in data["inscriptos"]], data["seed"],
+                       data["fechas"], data["fecha"], data["series"])
+        except (KeyError, TypeError):
+            return None
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "v": SEASON_VERSION,
+            "seed": self.seed,
+            "fechas": self.fechas,
+            "fecha": self.fecha,
+            "inscriptos": [asdict(i) for i in self.inscriptos],
+            "series": self.series,
+        }
+
+    @property
+    def terminada(self) -> bool:
+        return self.fecha >= self.fechas
+
+    @property
+    def _yo(self) -> int:
+        return next(i for i, ins in enumerate(self.inscriptos) if ins.jugador)
+
+    @property
+    def serie_jugador(self) -> int:
+        yo = self._yo
+        return next(s for s, serie in enumerate(self.series) if yo in serie)
+
+    def _sortear(self) -> List[List[int]]:
+        """Primera fecha al azar; después por tabla (los de arriba corren entre sí)."""
+        rng = random.Random(_semilla(self.seed, "series", self.fecha))
+        orden = list(range(len(self.inscriptos)))
+        rng.shuffle(orden)  # desempate al azar
+        if self.fecha > 0:
+            orden.sort(key=lambda i: (-self.inscriptos[i].puntos, -self.inscriptos[i].victorias))
+        return armar_series(orden)
+
+    def tabla(self) -> List[Inscripto]:
+        return sorted(self.inscriptos, key=lambda i: (-i.puntos, -i.victorias, i.nombre))
+
+    def _executor(self) -> "ProcessPoolExecutor":
+        if self._pool is None:
+            # se importan con la primera fecha
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # "spawn": los procesos no heredan la ventana de SDL ni el hilo escritor del progreso
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _tarea(self, s: int, clima: str) -> Tuple[List[Inscripto], str, int]:
+        return [self.inscriptos[i] for i in self.series[s]], clima, _semilla(self.seed, self.fecha, s)
+
+    def preparar_serie(self, caballo: Caballo, clima: str) -> Tuple[List[Caballo], int]:
+        """
+        Encarga al pool las series de los demás (si no estaban ya encargadas
+        con este clima) y devuelve los rivales y la semilla de la del jugador.
+        """
+        yo = self.inscriptos[self._yo]
+        yo.nombre = caballo.nombre
+        yo.raza = getattr(caballo, "raza_base", "Pura Sangre")
+        yo.sexo = getattr(caballo, "sexo", "Yegua")
+        yo.velocidad, yo.resistencia = caballo.velocidad, caballo.resistencia
+        mia = self.serie_jugador
+        usados = {ins.nombre for ins in self.inscriptos}
+        for ins in self.inscriptos:
+            if ins is not yo and ins.nombre == yo.nombre:
+                # que la tabla no muestre dos caballos con el mismo nombre
+                ins.nombre = next(f"{ins.nombre} ({n})" for n in range(2, len(usados) + 3)
+                                  if f"{ins.nombre} ({n})" not in usados)
+
+        if clima != self._clima:
+            for fut in self._pendientes:
+                fut.cancel()
+            self._pendientes.clear()
+            self._resultados.clear()
+            self._clima = clima
+            otras = [s for s in range(len(self.series)) if s != mia]
+            por_tanda = max(1, min(SERIES_POR_TANDA, math.ceil(len(otras) / self.workers)))
+            for i in range(0, len(otras), por_tanda):
+                grupo = otras[i:i + por_tanda]
+                fut = self._executor().submit(simular_series, [self._tarea(s, clima) for s in grupo])
+                self._pendientes[fut] = grupo
+
+        _, _, seed = self._tarea(mia, clima)
+        rivales = [self.inscriptos[i].caballo() for i in self.series[mia] if i != self._yo]
+        return rivales, seed
+
+    def registrar(self, orden: Sequence[int]) -> bool:
+        """
+        Orden de llegada de la serie del jugador como índices de competidor
+        (0 es el jugador y los demás, los rivales en el orden que devolvió
+        `preparar_serie`). Devuelve False si no corresponde a la serie.
+        """
+        serie = self.series[self.serie_jugador]
+        yo = self._yo
+        # competidor → posición en la serie, igual que `simular_series`
+        lugar = [serie.index(yo)] + [k for k, i in enumerate(serie) if i != yo]
+        if sorted(orden) != list(range(len(lugar))):
+            print("El resultado de la serie no coincide con sus caballos; no se registra.")
+            return False
+        self._resultados[self.serie_jugador] = [lugar[c] for c in orden]
+        return True
+
+    def actualizar(self) -> bool:
+        """
+        No bloquea: junta las series terminadas y, si ya están todas (la del
+        jugador incluida), cierra la fecha. Devuelve True al cerrarla.
+        """
+        for fut in [f for f in self._pendientes if f.done()]:
+            grupo = self._pendientes.pop(fut)
+            try:
+                ordenes = fut.result()
+            except Exception as e:
+                # raro (el pool se cayó): la serie se corre acá, son milisegundos
+                print("Falló la simulación de una serie:", e)
+                ordenes = simular_series([self._tarea(s, self._clima) for s in grupo])
+            self._resultados.update(zip(grupo, ordenes))
+        if self.terminada or self._pendientes or len(self._resultados) < len(self.series):
+            return False
+
+        for s, orden in self._resultados.items():
+            serie = self.series[s]
+            for puesto, k in enumerate(orden):
+                ins = self.inscriptos[serie[k]]
+                ins.carreras += 1
+                ins.puntos += PUNTOS[puesto] if puesto < len(PUNTOS) else 0
+                ins.victorias += puesto == 0
+        self._resultados.clear()
+        self._clima = None
+        self.fecha += 1
+        self.series = self._sortear()
+        return True
+
+    @property
+    def lista(self) -> bool:
+        """True si no hay una fecha a medio correr (la tabla está al día)."""
+        return not self._pendientes and not self._resultados
+
+    def cerrar(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,167 @@
+"""
+Telemetría de carreras en formato binario columnar.
+
+Todas las carreras se anexan a un único archivo (`equestrian_telemetry.bin`).
+Cada carrera es un registro con:
+
+- cabecera `struct` fija (magic, versión, competidores, muestras, dt);
+- los nombres de los competidores en UTF-8 (el jugador primero);
+- columnas float32: `t` una vez, y después `vel` y `eng` de cada competidor.
+
+Anexar es O(1): la cola del archivo se revisa una sola vez por proceso (o
+si otro proceso lo cambió) para cortar un registro a medias. La lectura usa `mmap` y `memoryview.cast("f")`, así que un
+gráfico o un análisis toma una columna sin parsear ni copiar nada.
+"""
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+
+TELEMETRY_FILE = "equestrian_telemetry.bin"
+MAGIC = b"EQTR"
+VERSION = 1
+# magic, versión, competidores, muestras, dt entre muestras, bytes de nombres
+_HEADER = struct.Struct("<4sHHIdI")
+_FLOAT = 4
+COLUMNS = ("vel", "eng")
+# ruta → tamaño que dejó el último `guardar` de este proceso
+_fin_conocido: Dict[str, int] = {}
+
+
+def _pad4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+class TelemetryRecorder:
+    """Acumula muestras de una carrera en arreglos float32 y las anexa al archivo."""
+
+    def __init__(self, names: Sequence[str], dt: float):
+        self.names = list(names)
+        self.dt = dt
+        self.t = array("f")
+        self.cols = [{col: array("f") for col in COLUMNS} for _ in self.names]
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def record(self, t: float, competitors: Sequence) -> None:
+        """Una muestra por competidor (`speed` y `energia`), en el orden de `names`."""
+        self.t.append(t)
+        for cols, c in zip(self.cols, competitors):
+            cols["vel"].append(c.speed)
+            cols["eng"].append(c.energia)
+
+    def guardar(self, path: str = TELEMETRY_FILE) -> None:
+        names = "\n".join(self.names).encode("utf-8")
+        header = _HEADER.pack(MAGIC, VERSION, len(self.names), len(self.t), self.dt, len(names))
+        key = os.path.abspath(path)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if _fin_conocido.get(key) != size:
+            _descartar_cola_rota(path)
+        with open(path, "ab") as f:
+            f.write(header)
+            f.write(names.ljust(_pad4(len(names)), b"\0"))  # columnas alineadas a 4 bytes
+            self.t.tofile(f)
+            for cols in self.cols:
+                for col in COLUMNS:
+                    cols[col].tofile(f)
+            _fin_conocido[key] = f.tell()
+
+
+class TelemetryRace:
+    """Vista de una carrera dentro del mmap; las columnas son memoryviews float32."""
+
+    def __init__(self, buf: memoryview, offset: int):
+        magic, version, competitors, samples, dt, name_len = _HEADER.unpack_from(buf, offset)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"registro de telemetría inválido en el byte {offset}")
+        pos = offset + _HEADER.size
+        self.names: List[str] = bytes(buf[pos:pos + name_len]).decode("utf-8").split("\n")
+        self.samples = samples
+        self.dt = dt
+        self._data = pos + _pad4(name_len)
+        self._buf = buf
+        self.size = self._data - offset + samples * _FLOAT * (1 + len(COLUMNS) * competitors)
+
+    def _slice(self, idx: int) -> memoryview:
+        start = self._data + idx * self.samples * _FLOAT
+        return self._buf[start:start + self.samples * _FLOAT].cast("f")
+
+    def column(self, name: str, competitor: int = 0) -> memoryview:
+        """Columna `t`, `vel` o `eng` (del competidor `competitor`) sin copiar."""
+        if name == "t":
+            return self._slice(0)
+        return self._slice(1 + competitor * len(COLUMNS) + COLUMNS.index(name))
+
+    def samples_dict(self, competitor: int = 0, every: float = 0.0) -> List[Dict[str, float]]:
+        """Formato viejo (`[{"t", "vel", "eng"}]`), opcionalmente submuestreado cada `every` s."""
+        t, vel, eng = self.column("t"), self.column("vel", competitor), self.column("eng", competitor)
+        step = max(1, int(round(every / self.dt))) if every else 1
+        return [{"t": round(t[i], 2), "vel": round(vel[i], 2), "eng": round(eng[i], 2)}
+                for i in range(0, self.samples, step)]
+
+
+class TelemetryFile:
+    """
+    Archivo de telemetría mapeado en memoria. Usar como context manager;
+    las columnas devueltas apuntan al mmap, así que hay que soltarlas antes
+    de cerrarlo (si no, `close` levanta BufferError).
+    """
+
+    def __init__(self, path: str = TELEMETRY_FILE):
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._buf = memoryview(self._mmap) if self._mmap is not None else memoryview(b"")
+        self._offsets: List[int] = []
+        pos = 0
+        # sólo se saltan cabeceras: el costo no depende de la cantidad de muestras
+        while pos + _HEADER.size <= len(self._buf):
+            try:
+                race = TelemetryRace(self._buf, pos)
+            except (ValueError, UnicodeDecodeError):
+                break
+            if pos + race.size > len(self._buf):
+                break  # registro cortado (el juego se cerró escribiendo)
+            self._offsets.append(pos)
+            pos += race.size
+        self.end = pos  # fin del último registro completo
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, idx: int) -> TelemetryRace:
+        return TelemetryRace(self._buf, self._offsets[idx])
+
+    def __iter__(self) -> Iterator[TelemetryRace]:
+        return (TelemetryRace(self._buf, off) for off in self._offsets)
+
+    def close(self) -> None:
+        self._buf.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "TelemetryFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _descartar_cola_rota(path: str) -> None:
+    """Si el último registro quedó a medias, lo corta para no anexar detrás de basura."""
+    if not os.path.exists(path):
+        return
+    with TelemetryFile(path) as tf:
+        end = tf.end
+    if end != os.path.getsize(path):
+        os.truncate(path, end)
+
+
+def abrir_telemetria(path: str = TELEMETRY_FILE) -> Optional[TelemetryFile]:
+    """Abre el archivo si existe (None si todavía no se guardó ninguna carrera)."""
+    if not os.path.exists(path):
+        return None
+    return TelemetryFile(path)
@@ -0,0 +1,7 @@
+from .race import (
+    GOAL_DISTANCE, PHYSICS_HZ, PHYSICS_DT, OFFLINE_DT, CLIMATE_SETTINGS, OPPONENT_POOL,
+    Competitor, RaceInputs, RaceState, nueva_carrera, nueva_serie, step, simular,
+)
+from .leaderboard import Leaderboard
+from .replay import InputRecorder, resimular, verificar, verificar_varias
+from .events import simular_eventos
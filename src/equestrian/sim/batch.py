@@ -0,0 +1,276 @@
+"""
+Motor de carreras por lotes con NumPy.
+
+Guarda el estado de todos los competidores como arreglos (carreras × competidores)
+y avanza todas las carreras en un solo paso vectorizado, con las mismas reglas
+que `race.step` aplica a los caballos IA. La columna 0 es el caballo del jugador
+manejado por el piloto automático.
+
+Los taps de la IA son, como en `race.TapSchedule`, un proceso de Poisson: cada
+celda guarda el instante de su próximo tap y en cada paso sólo se tocan las
+celdas cuyo tap ya llegó (no se sortea un número por celda y por paso).
+
+Cada tap entra en su instante y la distancia se integra con los promedios
+exactos del tap meter y el combo en cada tramo, como en `race.step`. La
+llegada se interpola dentro del paso: `t` es el instante del cruce del ganador.
+"""
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from equestrian.domain.caballo import Caballo
+from equestrian.sim.race import (
+    GOAL_DISTANCE, DIST_SCALE, FINAL_STRETCH, FINAL_RATE_BONUS,
+    TAP_GAIN, TAP_DECAY, COMBO_DECAY, COMBO_MAX, TAP_ENERGY_COST,
+    REGEN_THRESHOLD, PLAYER_REGEN, AI_REGEN, OFFLINE_DT,
+    CLIMATE_SETTINGS, DEFAULT_CLIMATE, OPPONENT_POOL,
+)
+
+FIELDS = ("dist", "speed", "energia", "resistencia", "tap_meter", "combo",
+          "base_speed", "tap_rate", "tap_gain", "tap_decay")
+
+
+def _flat(a: np.ndarray) -> np.ndarray:
+    # vista 1D de un arreglo en orden Fortran (no copia)
+    return a.reshape(-1, order="F")
+
+
+def _tramo(m: np.ndarray, k: np.ndarray, e: np.ndarray, decay: np.ndarray, regen: np.ndarray,
+           tramo: np.ndarray, bufs: Optional[Sequence[np.ndarray]] = None):
+    """
+    Versión por arreglos de `race._tramo`: devuelve velocidad media × duración
+    (sin la velocidad base ni la fricción) y la energía al final del tramo.
+    Trabaja con áreas en vez de promedios (un tramo de 0 s no divide por 0) y
+    en el lugar sobre tres arreglos (`bufs`, de la forma de `m`): con 100 000
+    celdas, pedir memoria nueva en cada paso cuesta más que las cuentas.
+    """
+    hasta, factor, aux = bufs if bufs is not None else (np.empty_like(m) for _ in range(3))
+    np.divide(m, decay, out=hasta)
+    np.minimum(hasta, tramo, out=hasta)  # el tap meter llega a 0 (o no) dentro del tramo
+    np.multiply(decay, hasta, out=factor)
+    factor *= -0.5
+    factor += m
+    factor *= hasta
+    factor *= 1.35                       # área bajo el tap meter
+    np.multiply(k, 1.0 / COMBO_DECAY, out=aux)
+    np.minimum(aux, tramo, out=hasta)
+    np.multiply(hasta, -0.5 * COMBO_DECAY, out=aux)
+    aux += k
+    aux *= hasta
+    aux *= 0.03                          # área bajo el aporte del combo
+    np.multiply(tramo, 0.35, out=hasta)
+    np.minimum(aux, hasta, out=aux)
+    factor += aux
+    np.multiply(tramo, 0.55, out=aux)
+    factor += aux
+
+    # regenera mientras el tap meter está bajo el umbral
+    np.subtract(m, REGEN_THRESHOLD, out=hasta)
+    hasta /= decay
+    np.maximum(hasta, 0.0, out=hasta)
+    np.minimum(hasta, tramo, out=hasta)
+    np.subtract(tramo, hasta, out=hasta)
+    hasta *= regen
+    hasta += e
+    e_fin = np.minimum(hasta, 100.0, out=hasta)
+    np.add(e, e_fin, out=aux)
+    aux *= 0.0025
+    aux += 0.5
+    factor *= aux
+    return factor, e_fin
+
+
+class BatchRace:
+    """Estado struct-of-arrays de `races` carreras con `competitors` caballos cada una."""
+
+    def __init__(self, races: int, competitors: int, rng: Optional[np.random.Generator] = None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        # Orden Fortran: cada competidor es una columna contigua, así las
+        # operaciones con vectores por carrera (races, 1) recorren memoria lineal.
+        shape = (races, competitors)
+        for name in FIELDS:
+            setattr(self, name, np.zeros(shape, order="F"))
+        self.regen = np.full(shape, AI_REGEN, order="F")
+        self.friction = np.full((races, 1), DEFAULT_CLIMATE["friction"])
+        self.regen_factor = np.full((races, 1), DEFAULT_CLIMATE["regen"])
+        self.t = np.zeros(races)
+        self.finished = np.zeros(races, dtype=bool)
+        self.winner = np.full(races, -1, dtype=np.int64)
+        self.next_tap: Optional[np.ndarray] = None  # se sortea al primer paso (ya con tap_rate)
+        self._regen: Optional[np.ndarray] = None    # regen × clima y base × fricción, idem
+        self._base: Optional[np.ndarray] = None
+        self._bufs: List[np.ndarray] = []
+        self._prev: Optional[np.ndarray] = None
+        self.in_final = np.zeros(shape, dtype=bool, order="F")
+
+    @property
+    def shape(self):
+        return self.dist.shape
+
+    def _preparar(self) -> None:
+        self.next_tap = np.asfortranarray(self.rng.standard_exponential(self.shape) / self.tap_rate)
+        self._regen = np.asfortranarray(self.regen * self.regen_factor)
+        self._base = np.asfortranarray(self.base_speed * self.friction)
+        self._bufs = [np.empty(self.shape, order="F") for _ in range(4)]
+        self._prev = np.empty(self.shape, order="F")  # distancias del paso anterior
+
+    def step(self, dt: float) -> None:
+        """Avanza `dt` segundos todas las carreras que siguen abiertas."""
+        if self.next_tap is None:
+            self._preparar()
+        active = ~self.finished
+        dt_col = np.where(active, dt, 0.0)[:, None]
+        races = self.shape[0]
+        flat_next = _flat(self.next_tap)
+        flat_tap_rate = _flat(self.tap_rate)
+        flat_final = _flat(self.in_final)
+
+        # recta final: a las celdas que entran se les reescala lo que faltaba
+        # para el próximo tap (desde el inicio del paso, como en race.step)
+        entering = np.flatnonzero(_flat(self.dist > GOAL_DISTANCE - FINAL_STRETCH) > flat_final)
+        if entering.size:
+            flat_final[entering] = True
+            t0 = self.t[entering % races]
+            old = flat_tap_rate[entering]
+            flat_next[entering] = t0 + (flat_next[entering] - t0) * old / (old + FINAL_RATE_BONUS)
+        t_end = self.t + dt_col[:, 0]
+
+        flat_meter = _flat(self.tap_meter)
+        flat_combo = _flat(self.combo)
+        flat_energia = _flat(self.energia)
+        flat_decay = _flat(self.tap_decay)
+        regen = self._regen
+        flat_regen = _flat(regen)
+        base = self._base
+
+        # Los taps son pocos por paso: sólo se tocan esas celdas (índices planos
+        # sobre vistas en orden Fortran). Como en race.step, cada tap entra en
+        # su instante y lo anterior del paso se integra como un tramo aparte.
+        tapped = np.flatnonzero(_flat(self.next_tap <= t_end[:, None]))
+        m = flat_meter[tapped]
+        k = flat_combo[tapped]
+        e = flat_energia[tapped]
+        last = self.t[tapped % races]
+        recorrido = np.zeros(tapped.size)
+        pos = np.arange(tapped.size)
+        while pos.size:  # casi siempre una vuelta: dos taps en un paso es raro
+            cells = tapped[pos]
+            tk = flat_next[cells]
+            tramo = tk - last[pos]
+            decay = flat_decay[cells]
+            factor, e_fin = _tramo(m[pos], k[pos], e[pos], decay, flat_regen[cells], tramo)
+            recorrido[pos] += factor * _flat(base)[cells]
+            m[pos] = np.minimum(1.0, np.maximum(0.0, m[pos] - decay * tramo) + _flat(self.tap_gain)[cells])
+            k[pos] = np.minimum(COMBO_MAX, np.maximum(0.0, k[pos] - COMBO_DECAY * tramo) + 1.0)
+            cost = TAP_ENERGY_COST * self.rng.uniform(0.7, 1.1, pos.size)
+            e[pos] = np.clip(e_fin - cost / np.maximum(0.1, _flat(self.resistencia)[cells]), 0.0, 100.0)
+            last[pos] = tk
+            rate = flat_tap_rate[cells] + FINAL_RATE_BONUS * flat_final[cells]
+            flat_next[cells] += self.rng.standard_exponential(pos.size) / rate
+            pos = pos[flat_next[cells] <= t_end[cells % races]]
+        flat_meter[tapped] = m
+        flat_combo[tapped] = k
+        flat_energia[tapped] = e
+
+        # último tramo de cada celda (el paso entero si no hubo taps)
+        tramo = self._bufs[3]
+        tramo[:] = dt_col
+        _flat(tramo)[tapped] = t_end[tapped % races] - last
+        factor, e_fin = _tramo(self.tap_meter, self.combo, self.energia, self.tap_decay, regen, tramo,
+                               self._bufs[:3])
+        self.energia[:] = e_fin
+        prev = self._prev
+        np.copyto(prev, self.dist)
+        factor *= base
+        factor *= DIST_SCALE
+        self.dist += factor
+        _flat(self.dist)[tapped] += recorrido * DIST_SCALE
+        tap_meter = self.tap_meter
+        np.multiply(self.tap_decay, tramo, out=factor)
+        tap_meter -= factor
+        np.maximum(tap_meter, 0.0, out=tap_meter)
+        combo = self.combo
+        tramo *= COMBO_DECAY
+        combo -= tramo
+        np.maximum(combo, 0.0, out=combo)
+        self.t = t_end
+
+        speed = self.speed
+        np.multiply(combo, 0.03, out=speed)
+        np.minimum(speed, 0.35, out=speed)
+        np.multiply(tap_meter, 1.35, out=tramo)
+        speed += tramo
+        speed += 0.55
+        np.multiply(self.energia, 0.005, out=tramo)
+        tramo += 0.5
+        speed *= tramo
+        speed *= base
+
+        done = active & (self.dist.max(axis=1) >= GOAL_DISTANCE)
+        if done.any():
+            # fracción del paso después del cruce (negativa si no cruzó):
+            # gana el que cruzó antes, no el que más se pasó
+            dist = self.dist[done]
+            sobra = (dist - GOAL_DISTANCE) / (dist - prev[done]) * dt
+            winner = np.argmax(sobra, axis=1)
+            self.winner[done] = winner
+            self.t[done] -= sobra[np.arange(winner.size), winner]
+            self.finished |= done
+
+    def run(self, dt: float = OFFLINE_DT, max_time: float = 600.0) -> "BatchRace":
+        """Avanza hasta que todas las carreras terminan (o se llega a `max_time`)."""
+        steps = 0
+        limit = int(max_time / dt)
+        while not self.finished.all() and steps < limit:
+            self.step(dt)
+            steps += 1
+        return self
+
+    def win_rate(self, competitor: int = 0) -> float:
+        done = self.finished
+        if not done.any():
+            return 0.0
+        return float(np.mean(self.winner[done] == competitor))
+
+
+def nueva_batch(caballo: Caballo, clima: Union[str, Sequence[str]], races: int, rivales: int = 3,
+                seed: Optional[int] = None) -> BatchRace:
+    """
+    Arma `races` carreras del `caballo` del jugador contra `rivales` caballos
+    sorteados de OPPONENT_POOL en cada carrera (con más rivales que caballos
+    en el pool se repite, como en `nueva_carrera`). `clima` puede ser un clima
+    fijo o una lista de la que se sortea uno por carrera.
+    """
+    rng = np.random.default_rng(seed)
+    batch = BatchRace(races, rivales + 1, rng)
+
+    climas = [clima] if isinstance(clima, str) else list(clima)
+    clima_idx = rng.integers(0, len(climas), races)
+    friction = np.array([CLIMATE_SETTINGS.get(c, DEFAULT_CLIMATE)["friction"] for c in climas])
+    regen_factor = np.array([CLIMATE_SETTINGS.get(c, DEFAULT_CLIMATE)["regen"] for c in climas])
+    batch.friction = friction[clima_idx][:, None]
+    batch.regen_factor = regen_factor[clima_idx][:, None]
+
+    player_speed = np.array([caballo.velocidad * caballo.bonificacion_terreno(c) for c in climas])
+    batch.base_speed[:, 0] = player_speed[clima_idx]
+    batch.resistencia[:, 0] = caballo.resistencia
+    batch.energia[:, 0] = max(30.0, caballo.energia)
+    batch.tap_rate[:, 0] = rng.uniform(2.4, 3.4, races)
+    batch.tap_gain[:, 0] = TAP_GAIN
+    batch.tap_decay[:, 0] = TAP_DECAY
+    batch.regen[:, 0] = PLAYER_REGEN
+
+    # Sorteo de rivales: una permutación del pool por carrera, repetida si no alcanza
+    pool = [cls(name) for name, cls in OPPONENT_POOL]
+    pool_speed = np.array([[h.velocidad * h.bonificacion_terreno(c) for c in climas] for h in pool])
+    pool_res = np.array([h.resistencia for h in pool])
+    picks = rng.permuted(np.tile(np.arange(len(pool)), (races, 1)), axis=1)[:, np.arange(rivales) % len(pool)]
+    opp = (slice(None), slice(1, None))
+    batch.base_speed[opp] = pool_speed[picks, clima_idx[:, None]] + rng.uniform(-0.25, 0.6, (races, rivales))
+    batch.resistencia[opp] = pool_res[picks]
+    batch.energia[opp] = 100.0
+    batch.tap_meter[opp] = rng.uniform(0.1, 0.3, (races, rivales))
+    batch.tap_rate[opp] = rng.uniform(2.4, 3.4, (races, rivales))
+    batch.tap_gain[opp] = rng.uniform(0.15, 0.22, (races, rivales))
+    batch.tap_decay[opp] = rng.uniform(0.6, 0.9, (races, rivales))
+    return batch
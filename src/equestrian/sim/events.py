@@ -0,0 +1,221 @@
+"""
+Simulación por eventos: salta de un tap al siguiente en vez de avanzar a paso fijo.
+
+Entre dos eventos todo es lineal en el tiempo: el tap meter y el combo bajan
+a ritmo constante, la energía sube a ritmo constante mientras hay
+regeneración y la fricción no cambia. La velocidad es entonces el producto
+de dos rectas y la distancia un polinomio cúbico, que se integra exacto.
+
+Los eventos de cada caballo son: su próximo tap, el tap meter cruzando
+REGEN_THRESHOLD o llegando a 0, el combo llegando a 0 (o al tope de su
+bonificación), la energía llegando a 100, la entrada en la recta final
+(cambia el ritmo de la IA) y la meta. Los caballos no interactúan entre sí,
+así que cada uno tiene a lo sumo un evento pendiente en un heap y la carrera
+cuesta O(eventos · log n) en vez de O(pasos · n). El tiempo de llegada es el
+instante exacto en que el polinomio cruza GOAL_DISTANCE, no un múltiplo de `dt`.
+
+Usa los mismos `TapSchedule` y el mismo `random.Random` por competidor que
+`step`, así que es el límite de `step` cuando `dt` tiende a 0 (con
+PHYSICS_DT la diferencia es de unos pocos milisegundos).
+"""
+import heapq
+import math
+from typing import Iterable, Optional
+
+from .race import (
+    COMBO_DECAY, COMBO_MAX, DIST_SCALE, FINAL_RATE_BONUS, FINAL_STRETCH, GOAL_DISTANCE,
+    REGEN_THRESHOLD, TAP_ENERGY_COST, Competitor, RaceState, _consumir, tap_schedule,
+)
+
+COMBO_CAP = 0.35 / 0.03  # arriba de esto el combo ya no suma velocidad
+
+# tipos de evento
+TAP, UMBRAL, RECTA_FINAL, META = range(4)
+
+
+class _Tramo:
+    """Intervalo sin eventos de un competidor: la distancia es d0 + s·(a·τ + b·τ² + c·τ³)."""
+    __slots__ = ("comp", "t0", "dm", "dc", "de", "s", "a", "b", "c",
+                 "en_final", "taps", "n")
+
+    def __init__(self, comp: Competitor, taps: Optional[Iterable[float]]):
+        self.comp = comp
+        self.t0 = 0.0
+        self.en_final = not comp.auto  # sólo la IA cambia de ritmo en la recta final
+        self.taps = iter(sorted(taps)) if taps is not None else None
+        self.n = self._siguiente_tap()
+
+    def _siguiente_tap(self) -> float:
+        if self.taps is None:
+            return math.inf
+        return next(self.taps, math.inf)
+
+    def proximo_tap(self) -> float:
+        if self.comp.auto:
+            return self.comp.schedule.next_t
+        return self.n
+
+    def abrir(self, t: float, regen: float, friction: float):
+        """Arma el tramo que empieza en `t`; devuelve (instante, tipo) de su fin."""
+        c = self.comp
+        self.t0 = t
+        m, combo, e = c.tap_meter, c.combo, c.energia
+        dm = -c.tap_decay if m > 0.0 else 0.0
+        dc = -COMBO_DECAY if combo > 0.0 else 0.0
+        # el umbral se cruza bajando: en el borde ya regenera
+        de = regen if e < 100.0 and m <= REGEN_THRESHOLD else 0.0
+        self.dm, self.dc, self.de = dm, dc, de
+
+        fin = self.proximo_tap() - t
+        tipo = TAP
+        if dm:
+            dt = (m - REGEN_THRESHOLD if m > REGEN_THRESHOLD else m) / -dm
+            if dt < fin:
+                fin, tipo = dt, UMBRAL
+        if dc:
+            dt = (combo - COMBO_CAP if combo > COMBO_CAP else combo) / -dc
+            if dt < fin:
+                fin, tipo = dt, UMBRAL
+        if de:
+            dt = (100.0 - e) / de
+            if dt < fin:
+                fin, tipo = dt, UMBRAL
+
+        # velocidad = k · (p0 + p1·τ) · (q0 + q1·τ)
+        p0 = 0.55 + m * 1.35 + min(0.35, combo * 0.03)
+        p1 = 1.35 * dm + (0.03 * dc if combo <= COMBO_CAP else 0.0)
+        q0 = 0.5 + 0.5 * (e / 100.0)
+        q1 = 0.005 * de
+        self.s = c.base_speed * friction * DIST_SCALE
+        self.a = p0 * q0
+        self.b = (p0 * q1 + p1 * q0) / 2.0
+        self.c = p1 * q1 / 3.0
+
+        meta = GOAL_DISTANCE if self.en_final else GOAL_DISTANCE - FINAL_STRETCH
+        if self.dist(fin) >= meta:
+            fin = self._cruce(meta, fin)
+            tipo = META if self.en_final else RECTA_FINAL
+        return t + fin, tipo
+
+    def dist(self, tau: float) -> float:
+        if tau == math.inf:
+            return math.inf if self.a > 0.0 else self.comp.dist
+        return self.comp.dist + self.s * tau * (self.a + tau * (self.b + tau * self.c))
+
+    def _cruce(self, meta: float, hi: float) -> float:
+        """Primer τ en [0, hi] con dist(τ) = meta (la distancia nunca baja)."""
+        falta = meta - self.comp.dist
+        if falta <= 0.0:
+            return 0.0
+        if hi == math.inf:
+            # sin eventos por delante la velocidad es constante
+            return falta / (self.s * self.a)
+        lo = 0.0
+        tau = min(hi, falta / (self.s * self.a))
+        for _ in range(60):
+            f = self.dist(tau) - meta
+            if f >= 0.0:
+                hi = tau
+            else:
+                lo = tau
+            if hi - lo < 1e-12:
+                break
+            v = self.s * (self.a + tau * (2.0 * self.b + 3.0 * tau * self.c))
+            nuevo = tau - f / v if v > 0.0 else lo
+            tau = nuevo if lo < nuevo < hi else (lo + hi) / 2.0
+        return hi
+
+    def avanzar(self, t: float, friction: float) -> None:
+        """Lleva el estado del competidor al instante `t` dentro del tramo."""
+        c = self.comp
+        tau = t - self.t0
+        c.prev_dist = c.dist
+        c.dist = self.dist(tau)
+        m = c.tap_meter + self.dm * tau
+        # lo que cae en un umbral (con error de redondeo) queda justo en el umbral
+        c.tap_meter = 0.0 if m < 1e-9 else (REGEN_THRESHOLD if abs(m - REGEN_THRESHOLD) < 1e-9 else m)
+        combo = c.combo + self.dc * tau
+        c.combo = 0.0 if combo < 1e-9 else (COMBO_CAP if abs(combo - COMBO_CAP) < 1e-9 else combo)
+        e = c.energia + self.de * tau
+        c.energia = 100.0 if e > 100.0 - 1e-9 else e
+        speed_factor = 0.55 + c.tap_meter * 1.35 + min(0.35, c.combo * 0.03)
+        energy_factor = 0.5 + 0.5 * (c.energia / 100.0)
+        c.speed = max(0.0, c.base_speed * speed_factor * energy_factor) * friction
+        self.t0 = t
+
+    def tap(self, t: float) -> None:
+        c = self.comp
+        if c.auto:
+            # mismo orden de sorteos que step: primero los intervalos, después los costos
+            for _ in c.schedule.taps_until(t):
+                c.tap_meter = min(1.0, c.tap_meter + c.tap_gain)
+                _consumir(c, TAP_ENERGY_COST * c.rng.uniform(0.7, 1.1))
+                c.combo = min(COMBO_MAX, c.combo + 1.0)
+            return
+        while self.n <= t:
+            c.tap_meter = min(1.0, c.tap_meter + c.tap_gain)
+            c.combo = min(COMBO_MAX, c.combo + 1.0)
+            _consumir(c, TAP_ENERGY_COST)
+            self.n = self._siguiente_tap()
+
+
+def simular_eventos(state: RaceState, taps_jugador: Optional[Iterable[float]] = None,
+                    max_time: float = 600.0) -> RaceState:
+    """
+    Corre la carrera sin ventana saltando de evento en evento.
+
+    `taps_jugador` son los instantes (en segundos de carrera) en que tapea el
+    jugador si no es automático; sin taps el jugador sólo se deja llevar.
+    `state.t` queda en el instante exacto de llegada y `state.steps` cuenta
+    los eventos procesados.
+    """
+    if state.finished:
+        return state
+    regen_factor = state.regen_factor
+    friction = state.friction
+    tramos = []
+    heap = []
+    for i, c in enumerate(state.competitors):
+        if c.auto and c.schedule is None:
+            c.schedule = tap_schedule(c, state.t)
+        tr = _Tramo(c, taps_jugador if c.is_player and not c.auto else None)
+        tramos.append(tr)
+        t, tipo = tr.abrir(state.t, c.regen * regen_factor, friction)
+        heap.append((t, i, tipo))
+    heapq.heapify(heap)
+
+    eventos = 0
+    fin = max_time
+    while heap:
+        t, i, tipo = heap[0]
+        if t > max_time:
+            break
+        tr = tramos[i]
+        tr.avanzar(t, friction)
+        eventos += 1
+        if tipo == META:
+            tr.comp.dist = GOAL_DISTANCE
+            tr.comp.finish_t = t
+            fin = t
+            state.finished = True
+            break
+        if tipo == TAP:
+            tr.tap(t)
+        elif tipo == RECTA_FINAL:
+            tr.en_final = True
+            c = tr.comp
+            c.schedule.set_rate(t, c.tap_rate + FINAL_RATE_BONUS)
+        nuevo, tipo = tr.abrir(t, tr.comp.regen * regen_factor, friction)
+        heapq.heapreplace(heap, (nuevo, i, tipo))
+
+    # el resto queda donde estaba en el instante de llegada (o al agotar el tiempo)
+    for tr in tramos:
+        if tr.t0 != fin:
+            tr.avanzar(fin, friction)
+    state.t = fin
+    state.steps = eventos
+    leaderboard = state.leaderboard
+    leaderboard.update()
+    if state.finished:
+        state.ranking = list(leaderboard)
+    return state
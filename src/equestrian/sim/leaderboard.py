@@ -0,0 +1,69 @@
+"""
+Clasificación en vivo mantenida de forma incremental.
+
+Entre un paso y el siguiente los puestos casi no cambian, así que en vez de
+reordenar todo se hace una pasada de inserción sobre el orden anterior:
+O(n) si nadie se adelantó, O(n·k) si hubo k adelantamientos.
+"""
+from typing import TYPE_CHECKING, Iterator, List, Sequence
+
+if TYPE_CHECKING:  # race.py importa este módulo
+    from .race import Competitor
+
+
+class Leaderboard:
+    """Competidores ordenados por distancia recorrida (el primero es el líder)."""
+
+    def __init__(self, competitors: Sequence["Competitor"]):
+        self._order: List["Competitor"] = sorted(competitors, key=lambda c: c.dist, reverse=True)
+
+    def update(self) -> bool:
+        """Reacomoda tras un paso de física; devuelve True si cambió algún puesto."""
+        order = self._order
+        changed = False
+        for i in range(1, len(order)):
+            c = order[i]
+            d = c.dist
+            j = i
+            # estricto: ante empate conserva el puesto anterior
+            while j > 0 and order[j - 1].dist < d:
+                order[j] = order[j - 1]
+                j -= 1
+            if j != i:
+                order[j] = c
+                changed = True
+        return changed
+
+    @property
+    def leader(self) -> "Competitor":
+        return self._order[0]
+
+    def top(self, n: int) -> List["Competitor"]:
+        return self._order[:n]
+
+    def _first_below(self, dist: float, inclusive: bool) -> int:
+        # bisección sobre el orden descendente: primer índice con dist < `dist`
+        # (o <= si `inclusive`)
+        order = self._order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            d = order[mid].dist
+            if d < dist or (inclusive and d == dist):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def window(self, lo: float, hi: float) -> List["Competitor"]:
+        """Competidores con `lo <= dist <= hi` (de adelante hacia atrás), en O(log n + k)."""
+        return self._order[self._first_below(hi, True):self._first_below(lo, False)]
+
+    def __iter__(self) -> Iterator["Competitor"]:
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, idx):
+        return self._order[idx]
@@ -0,0 +1,372 @@
+import math
+import random
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple, Optional, Sequence, Type
+
+from equestrian.domain.caballo import Caballo, Yegua, PuraSangre
+from .leaderboard import Leaderboard
+
+# --- Reglas de la carrera (sin pygame) ---
+GOAL_DISTANCE = 3500.0  # metros virtuales para ganar
+PHYSICS_HZ = 120        # la física avanza a paso fijo, independiente de los FPS
+PHYSICS_DT = 1.0 / PHYSICS_HZ
+OFFLINE_DT = 0.1        # paso para simulaciones sin ventana (ms de diferencia con PHYSICS_DT)
+DIST_SCALE = 10.0       # metros virtuales por unidad de velocidad y segundo
+FINAL_STRETCH = 260.0   # en los últimos metros la IA acelera el ritmo
+FINAL_RATE_BONUS = 0.8
+TAP_BATCH = 64          # intervalos exponenciales sorteados de una vez por caballo IA
+PHYSICS_VERSION = 4     # cambia si la misma semilla y entradas ya no dan la misma carrera
+
+TAP_GAIN = 0.18
+TAP_DECAY = 0.75
+COMBO_DECAY = 1.6
+COMBO_MAX = 10.0
+TAP_ENERGY_COST = 4.0
+REGEN_THRESHOLD = 0.4
+PLAYER_REGEN = 5.0
+AI_REGEN = 4.5 * 0.9
+WATER_BONUS = 20.0
+WATER_USES = 2
+
+CLIMATE_SETTINGS: Dict[str, Dict[str, float]] = {
+    "Soleado": {"friction": 0.99, "regen": 1.05},
+    "Lluvioso": {"friction": 0.96, "regen": 0.9},
+    "Ventoso": {"friction": 0.97, "regen": 0.95},
+    "Barro": {"friction": 0.94, "regen": 0.85},
+}
+DEFAULT_CLIMATE = {"friction": 0.97, "regen": 1.0}
+
+OPPONENT_POOL: List[Tuple[str, Type[Caballo]]] = [
+    ("Centella", PuraSangre),
+    ("Aurora", Yegua),
+    ("Relampago", PuraSangre),
+    ("Canela", Yegua),
+    ("Orion", PuraSangre),
+    ("Bruma", Yegua),
+]
+
+
+class TapSchedule:
+    """
+    Taps de un caballo IA como proceso de Poisson: los tiempos entre taps se
+    sortean por tandas como Exp(1) y se escalan por el ritmo vigente. Si el
+    ritmo cambia (recta final), lo que faltaba para el próximo tap se
+    reescala (cambio de tiempo), sin volver a sortear. El resultado no
+    depende del paso de física ni de los FPS.
+
+    Tiene su propio `random.Random` (ver `tap_schedule`): si compartiera el
+    del competidor con los costos de cada tap, el orden de los sorteos (y con
+    él los taps) cambiaría según cuántos taps caen en un mismo paso.
+    """
+    __slots__ = ("rng", "rate", "next_t", "_buf", "_i")
+
+    def __init__(self, rng: random.Random, rate: float, t0: float = 0.0):
+        self.rng = rng
+        self.rate = rate
+        self._buf: List[float] = []
+        self._i = 0
+        self.next_t = t0 + self._exp() / rate if rate > 0 else math.inf
+
+    def _exp(self) -> float:
+        if self._i == len(self._buf):
+            expo = self.rng.expovariate
+            self._buf = [expo(1.0) for _ in range(TAP_BATCH)]
+            self._i = 0
+        self._i += 1
+        return self._buf[self._i - 1]
+
+    def set_rate(self, t: float, rate: float) -> None:
+        """Nuevo ritmo a partir de `t` (la espera restante se escala)."""
+        if rate <= 0:
+            self.next_t = math.inf
+        elif self.rate > 0 and self.next_t != math.inf:
+            self.next_t = t + (self.next_t - t) * self.rate / rate
+        else:
+            self.next_t = t + self._exp() / rate
+        self.rate = rate
+
+    def taps_until(self, t: float) -> List[float]:
+        """Instantes de los taps que caen hasta `t` inclusive; deja listo el siguiente."""
+        taps = []
+        while self.next_t <= t:
+            taps.append(self.next_t)
+            self.next_t += self._exp() / self.rate
+        return taps
+
+
+@dataclass
+class Competitor:
+    """Estado físico de un caballo en pista (sin nada de dibujo)."""
+    name: str
+    is_player: bool
+    base_speed: float
+    resistencia: float
+    energia: float = 100.0
+    dist: float = 0.0
+    speed: float = 0.0
+    tap_meter: float = 0.0
+    combo: float = 0.0
+    tap_rate: float = 0.0
+    tap_gain: float = TAP_GAIN
+    tap_decay: float = TAP_DECAY
+    regen: float = PLAYER_REGEN
+    auto: bool = False  # True: los taps los decide el simulador (IA)
+    prev_dist: float = 0.0  # distancia al inicio del último paso (para interpolar el dibujo)
+    finish_t: Optional[float] = None  # instante exacto en que cruzó la meta (si la cruzó)
+    rng: random.Random = field(default_factory=random.Random, repr=False, compare=False)
+    schedule: Optional[TapSchedule] = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class RaceInputs:
+    """Entradas del jugador acumuladas durante un paso."""
+    taps: int = 0
+    agua: int = 0
+
+
+@dataclass
+class RaceState:
+    competitors: List[Competitor]
+    clima: str
+    friction: float
+    regen_factor: float
+    seed: int
+    t: float = 0.0
+    steps: int = 0
+    agua: int = WATER_USES
+    finished: bool = False
+    ranking: List[Competitor] = field(default_factory=list)
+    leaderboard: Leaderboard = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.leaderboard = Leaderboard(self.competitors)
+
+    @property
+    def player(self) -> Competitor:
+        return self.competitors[0]
+
+    @property
+    def won(self) -> bool:
+        return bool(self.ranking) and self.ranking[0].is_player
+
+
+def _consumir(c: Competitor, cantidad: float) -> None:
+    # misma fórmula que Caballo.consumir_energia
+    c.energia = max(0.0, min(100.0, c.energia - max(0.0, cantidad / max(0.1, c.resistencia))))
+
+
+def _recuperar(c: Competitor, cantidad: float) -> None:
+    c.energia = max(0.0, min(100.0, c.energia + cantidad))
+
+
+def competitor_rng(seed: int, idx: int) -> random.Random:
+    """Flujo aleatorio propio de cada competidor, derivado de la semilla de la carrera."""
+    return random.Random(f"{seed}/{idx}")
+
+
+def tap_schedule(c: Competitor, t0: float = 0.0) -> TapSchedule:
+    """Agenda de taps de un caballo IA, con un flujo aleatorio derivado del suyo."""
+    return TapSchedule(random.Random(c.rng.getrandbits(64)), c.tap_rate, t0)
+
+
+def _sortear_rivales(rivales: int, rng: random.Random) -> List[Tuple[str, Type[Caballo]]]:
+    """
+    Sortea `rivales` caballos de OPPONENT_POOL. Con más rivales que nombres
+    (modo de campo grande) el pool se repite numerando: "Centella 2", ...
+    """
+    pool = list(OPPONENT_POOL)
+    rng.shuffle(pool)
+    picks = []
+    for i in range(rivales):
+        name, cls = pool[i % len(pool)]
+        vuelta = i // len(pool)
+        picks.append((f"{name} {vuelta + 1}" if vuelta else name, cls))
+    return picks
+
+
+def nueva_carrera(caballo: Caballo, clima: str, rivales: int = 3,
+                  seed: Optional[int] = None,
+                  jugador_automatico: bool = False,
+                  elenco: Optional[Sequence[Caballo]] = None) -> RaceState:
+    """
+    Arma el estado inicial: el caballo del jugador (carril 0) y `rivales`
+    caballos IA sorteados de OPPONENT_POOL (pueden ser cientos), o los de
+    `elenco` si se pasan (las series de la temporada). Con la misma `seed`
+    (y las mismas entradas) la carrera es idéntica bit a bit.
+    """
+    if seed is None:
+        seed = random.getrandbits(32)
+    rng = random.Random(seed)
+
+    player = Competitor(
+        name=caballo.nombre,
+        is_player=True,
+        base_speed=caballo.velocidad * caballo.bonificacion_terreno(clima),
+        resistencia=caballo.resistencia,
+        energia=max(30.0, caballo.energia),  # la segunda carrera no arranca sin energía
+    )
+    if jugador_automatico:
+        player.auto = True
+        player.tap_rate = rng.uniform(2.4, 3.4)
+
+    if elenco is None:
+        elenco = [cls(name) for name, cls in _sortear_rivales(rivales, rng)]
+    competitors = [player] + [_rival(opp, clima, rng) for opp in elenco]
+    return _armar(competitors, clima, seed)
+
+
+def nueva_serie(caballos: Sequence[Caballo], clima: str, seed: int) -> RaceState:
+    """Carrera sin jugador: todos los caballos corren como IA (series de la temporada)."""
+    rng = random.Random(seed)
+    return _armar([_rival(c, clima, rng) for c in caballos], clima, seed)
+
+
+def _rival(opp: Caballo, clima: str, rng: random.Random) -> Competitor:
+    return Competitor(
+        name=opp.nombre,
+        is_player=False,
+        base_speed=opp.velocidad * opp.bonificacion_terreno(clima) + rng.uniform(-0.25, 0.6),
+        resistencia=opp.resistencia,
+        energia=opp.energia,
+        tap_meter=rng.uniform(0.1, 0.3),
+        tap_rate=rng.uniform(2.4, 3.4),
+        tap_gain=rng.uniform(0.15, 0.22),
+        tap_decay=rng.uniform(0.6, 0.9),
+        regen=AI_REGEN,
+        auto=True,
+    )
+
+
+def _armar(competitors: List[Competitor], clima: str, seed: int) -> RaceState:
+    settings = CLIMATE_SETTINGS.get(clima, DEFAULT_CLIMATE)
+    state = RaceState(
+        competitors=competitors,
+        clima=clima,
+        friction=settings["friction"],
+        regen_factor=settings["regen"],
+        seed=seed,
+    )
+    for idx, c in enumerate(state.competitors):
+        c.rng = competitor_rng(seed, idx)
+        if c.auto:
+            c.schedule = tap_schedule(c)
+    return state
+
+
+def step(state: RaceState, dt: float, inputs: Optional[RaceInputs] = None) -> None:
+    """Avanza la carrera `dt` segundos aplicando las entradas del jugador."""
+    if state.finished:
+        return
+    t0 = state.t
+    state.t += dt
+    state.steps += 1
+    t = state.t
+    friction = state.friction
+    regen_factor = state.regen_factor
+
+    for c in state.competitors:
+        c.prev_dist = c.dist
+        recorrido = 0.0  # velocidad × tiempo de los tramos antes del último tap
+        last = t0
+        tap_meter, combo = c.tap_meter, c.combo
+        regen = c.regen * regen_factor
+        if c.auto:
+            schedule = c.schedule
+            if schedule is None:
+                schedule = c.schedule = tap_schedule(c, t0)
+            if schedule.rate == c.tap_rate and GOAL_DISTANCE - c.dist < FINAL_STRETCH:
+                # entra en la recta final (la distancia no baja: pasa una sola vez)
+                schedule.set_rate(t0, c.tap_rate + FINAL_RATE_BONUS)
+            if schedule.next_t <= t:
+                # cada tap entra en su instante y el paso se integra por tramos:
+                # con pasos largos la IA no adelanta el efecto de sus taps
+                for tk in schedule.taps_until(t):
+                    tramo = tk - last
+                    recorrido += _tramo(c, tap_meter, combo, tramo, regen, friction)
+                    tap_meter = min(1.0, max(0.0, tap_meter - c.tap_decay * tramo) + c.tap_gain)
+                    combo = min(COMBO_MAX, max(0.0, combo - COMBO_DECAY * tramo) + 1.0)
+                    _consumir(c, TAP_ENERGY_COST * c.rng.uniform(0.7, 1.1))
+                    last = tk
+        elif inputs is not None:
+            for _ in range(inputs.taps):
+                tap_meter = min(1.0, tap_meter + c.tap_gain)
+                combo = min(COMBO_MAX, combo + 1.0)
+                _consumir(c, TAP_ENERGY_COST)
+            for _ in range(inputs.agua):
+                if state.agua > 0 and c.energia < 100:
+                    _recuperar(c, WATER_BONUS)
+                    state.agua -= 1
+
+        tramo = t - last
+        c.dist += (recorrido + _tramo(c, tap_meter, combo, tramo, regen, friction)) * DIST_SCALE
+        tap_meter = c.tap_meter = max(0.0, tap_meter - c.tap_decay * tramo)
+        combo = c.combo = max(0.0, combo - COMBO_DECAY * tramo)
+        speed_factor = 0.55 + tap_meter * 1.35 + min(0.35, combo * 0.03)
+        energy_factor = 0.5 + 0.5 * (c.energia / 100.0)
+        c.speed = max(0.0, c.base_speed * speed_factor * energy_factor) * friction
+
+    # la llegada la decide el líder: basta mirar el primer puesto
+    leaderboard = state.leaderboard
+    leaderboard.update()
+    if leaderboard.leader.dist >= GOAL_DISTANCE:
+        _llegada(state, list(leaderboard), dt)
+
+
+def _tramo(c: Competitor, tap_meter: float, combo: float, tramo: float, regen: float,
+           friction: float) -> float:
+    """
+    Un tramo sin taps de `tramo` segundos: el tap meter y el combo bajan
+    linealmente (hasta 0), la energía se recupera mientras el tap meter está
+    bajo el umbral. Deja la energía al final del tramo y devuelve velocidad
+    media × duración. La velocidad es lineal en el tap meter y el combo, así
+    que alcanza con sus promedios exactos en el tramo.
+    """
+    decay = c.tap_decay
+    fin = tap_meter - decay * tramo
+    m = (tap_meter + fin) * 0.5 if fin >= 0.0 else tap_meter * tap_meter / (2.0 * decay * tramo)
+    fin = combo - COMBO_DECAY * tramo
+    k = (combo + fin) * 0.015 if fin >= 0.0 else combo * combo * 0.03 / (2.0 * COMBO_DECAY * tramo)
+    if k > 0.35:
+        k = 0.35
+    energia = c.energia
+    if energia < 100.0:
+        bajo = tramo if tap_meter < REGEN_THRESHOLD else tramo - (tap_meter - REGEN_THRESHOLD) / decay
+        if bajo > 0.0:
+            nueva = energia + regen * bajo
+            if nueva > 100.0:
+                nueva = 100.0
+            c.energia = nueva
+            energia = (energia + nueva) * 0.5
+    # los factores son siempre positivos (no hace falta el max(0, ...))
+    return c.base_speed * (0.55 + m * 1.35 + k) * (0.5 + energia * 0.005) * friction * tramo
+
+
+def _llegada(state: RaceState, orden: List[Competitor], dt: float) -> None:
+    """
+    Cierra la carrera en el paso en que alguien cruzó la meta. El instante de
+    cruce se interpola dentro del paso; los que cruzaron se ordenan por ese
+    instante (no por quién se pasó más) y `state.t` queda en el cruce del
+    ganador, no al final del paso. Los demás se ordenan por la distancia que
+    llevaban en ese instante, así el orden no depende del `dt`.
+    """
+    cruzaron = []
+    for c in orden:
+        if c.dist < GOAL_DISTANCE:
+            break
+        c.finish_t = state.t - dt * (c.dist - GOAL_DISTANCE) / (c.dist - c.prev_dist)
+        cruzaron.append(c)
+    cruzaron.sort(key=lambda c: c.finish_t)  # estable: ante empate queda el de más distancia
+    cruce = cruzaron[0].finish_t
+    frac = 1.0 - (state.t - cruce) / dt
+    resto = sorted(orden[len(cruzaron):], key=lambda c: c.prev_dist + (c.dist - c.prev_dist) * frac,
+                   reverse=True)
+    state.ranking = cruzaron + resto
+    state.t = cruce
+    state.finished = True
+
+
+def simular(state: RaceState, dt: float = OFFLINE_DT, max_time: float = 600.0) -> RaceState:
+    """Corre la carrera sin ventana hasta que alguien cruza la meta."""
+    while not state.finished and state.t < max_time:
+        step(state, dt)
+    return state
@@ -0,0 +1,186 @@
+"""
+Registro compacto de entradas de una carrera y re-simulación sin ventana.
+
+La física es determinista (paso fijo + un `random.Random` por competidor),
+así que para reproducir una carrera alcanza con la semilla, los datos del
+caballo del jugador y en qué paso de física se aplicó cada tap o cada
+trago de agua. No se guarda ningún estado por frame.
+
+Formato (dict JSON, va dentro de la entrada del historial como "inputs"):
+
+- `taps` / `agua`: pasos de física en que se aplicaron, codificados como
+  diferencias con el anterior (varios en el mismo paso repiten un 0);
+- `pausas`: pares (t de carrera, segundos reales en pausa), sólo para auditar:
+  la pausa no cambia la física;
+- `tiempo` y `ranking`: el resultado que vio el jugador, para verificar;
+- `fisica`: `PHYSICS_VERSION` con que se corrió (falta en los registros de
+  la versión 1). Un registro de otra física no se puede reproducir y se omite;
+- `elenco`: sólo en las series de la temporada, los rivales (raza, sexo y
+  números) en vez de sortearlos de la semilla.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from equestrian.domain.caballo import Caballo, PuraSangre, crear_caballo
+from .race import PHYSICS_DT, PHYSICS_VERSION, RaceInputs, RaceState, nueva_carrera, step
+
+LOG_VERSION = 1
+MAX_TIME = 600.0
+
+
+def _deltas(steps: Sequence[int]) -> List[int]:
+    out, prev = [], 0
+    for s in steps:
+        out.append(s - prev)
+        prev = s
+    return out
+
+
+def _acumular(deltas: Sequence[int]) -> List[int]:
+    out, acc = [], 0
+    for d in deltas:
+        acc += d
+        out.append(acc)
+    return out
+
+
+class InputRecorder:
+    """Lo usa `_carrera`: anota las entradas en el paso en que las aplica la física."""
+
+    def __init__(self, state: RaceState, rivales: int, elenco: Optional[Sequence[Caballo]] = None):
+        player = state.player
+        self.header = {
+            "v": LOG_VERSION,
+            "fisica": PHYSICS_VERSION,
+            "seed": state.seed,
+            "clima": state.clima,
+            "rivales": rivales,
+            "dt": PHYSICS_DT,
+            "jugador": {
+                "name": player.name,
+                "base_speed": player.base_speed,
+                "resistencia": player.resistencia,
+                "energia": player.energia,
+            },
+        }
+        if elenco is not None:
+            self.header["elenco"] = [_caballo_log(c) for c in elenco]
+        self.taps: List[int] = []
+        self.agua: List[int] = []
+        self.pausas: List[Tuple[float, float]] = []
+
+    def aplicar(self, paso: int, inputs: RaceInputs) -> None:
+        """`paso` es el número del paso que va a consumir `inputs` (state.steps + 1)."""
+        self.taps.extend([paso] * inputs.taps)
+        self.agua.extend([paso] * inputs.agua)
+
+    def pausa(self, t: float, segundos: float) -> None:
+        self.pausas.append((round(t, 3), round(segundos, 2)))
+
+    def log(self, state: RaceState) -> Dict[str, Any]:
+        return dict(
+            self.header,
+            taps=_deltas(self.taps),
+            agua=_deltas(self.agua),
+            pausas=self.pausas,
+            tiempo=state.t,
+            ranking=[c.name for c in state.ranking],
+        )
+
+
+def _caballo_log(c: Caballo) -> Dict[str, Any]:
+    return {
+        "name": c.nombre,
+        "raza": getattr(c, "raza_base", "Pura Sangre"),
+        "sexo": getattr(c, "sexo", "Yegua"),
+        "velocidad": c.velocidad,
+        "resistencia": c.resistencia,
+        "energia": c.energia,
+    }
+
+
+def _caballo_desde_log(d: Dict[str, Any]) -> Caballo:
+    c = crear_caballo(d["name"], d["raza"], d["sexo"])
+    c.velocidad = d["velocidad"]
+    c.resistencia = d["resistencia"]
+    c.energia = d["energia"]
+    return c
+
+
+def carrera_desde_log(log: Dict[str, Any]) -> RaceState:
+    """Estado inicial idéntico al de la carrera registrada."""
+    jug = log["jugador"]
+    elenco = log.get("elenco")
+    if elenco is not None:
+        elenco = [_caballo_desde_log(d) for d in elenco]
+    state = nueva_carrera(PuraSangre(jug["name"]), log["clima"], rivales=log["rivales"], seed=log["seed"],
+                          elenco=elenco)
+    # los rivales sólo dependen de la semilla (o del elenco); el jugador se pisa con lo registrado
+    player = state.player
+    player.name = jug["name"]
+    player.base_speed = jug["base_speed"]
+    player.resistencia = jug["resistencia"]
+    player.energia = jug["energia"]
+    return state
+
+
+def resimular(log: Dict[str, Any], max_time: float = MAX_TIME) -> RaceState:
+    """Corre la carrera aplicando las entradas registradas, sin ventana."""
+    if log.get("v") != LOG_VERSION:
+        raise ValueError(f"versión de registro no soportada: {log.get('v')}")
+    state = carrera_desde_log(log)
+    pending: Dict[int, RaceInputs] = {}
+    for paso in _acumular(log.get("taps", [])):
+        pending.setdefault(paso, RaceInputs()).taps += 1
+    for paso in _acumular(log.get("agua", [])):
+        pending.setdefault(paso, RaceInputs()).agua += 1
+
+    dt = log.get("dt", PHYSICS_DT)
+    max_steps = int(max_time / dt)
+    get = pending.get
+    while not state.finished and state.steps < max_steps:
+        step(state, dt, get(state.steps + 1))
+    return state
+
+
+@dataclass
+class Verificacion:
+    ok: bool
+    tiempo_registrado: float
+    tiempo: float
+    ranking_ok: bool
+    pasos: int
+    motivo: str = ""
+    omitida: bool = False  # registro de otra versión de la física: no se compara
+
+
+def verificar(log: Dict[str, Any]) -> Verificacion:
+    """Re-simula y compara tiempo (exacto) y ranking con lo registrado."""
+    fisica = log.get("fisica", 1)
+    if fisica != PHYSICS_VERSION:
+        return Verificacion(True, log.get("tiempo", 0.0), 0.0, True, 0,
+                            f"física v{fisica} (actual v{PHYSICS_VERSION})", omitida=True)
+    try:
+        state = resimular(log)
+    except (KeyError, TypeError, ValueError) as e:
+        return Verificacion(False, log.get("tiempo", 0.0), 0.0, False, 0, f"registro inválido: {e}")
+    ranking_ok = [c.name for c in state.ranking] == list(log.get("ranking", []))
+    tiempo_ok = state.finished and state.t == log.get("tiempo")
+    motivo = ""
+    if not state.finished:
+        motivo = "la re-simulación no terminó"
+    elif not tiempo_ok:
+        motivo = "tiempo distinto"
+    elif not ranking_ok:
+        motivo = "ranking distinto"
+    return Verificacion(tiempo_ok and ranking_ok, log.get("tiempo", 0.0), state.t, ranking_ok,
+                        state.steps, motivo)
+
+
+def verificar_varias(logs: Sequence[Dict[str, Any]], procesos: Optional[int] = None) -> List[Verificacion]:
+    """Verifica un corpus; con `procesos` > 1 reparte las carreras en un pool."""
+    if not procesos or procesos <= 1 or len(logs) < 2:
+        return [verificar(log) for log in logs]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return list(pool.map(verificar, logs, chunksize=max(1, len(logs) // (procesos * 4))))
@@ -0,0 +1,56 @@
+"""Banco de balance: clave del caché, memo en disco y pool."""
+import pytest
+
+from equestrian.services import balance as B
+
+pytest.importorskip("numpy")
+
+CARRERAS = 20
+
+
+def test_clave_cambia_con_lo_que_cambia_el_resultado(monkeypatch):
+    base = B.parametros_actuales()
+    clave = B.clave(base, CARRERAS, 3, 0)
+    nombre = next(iter(base))
+    assert B.clave(dict(base), CARRERAS, 3, 0) == clave
+    assert B.clave(dict(base, **{nombre: base[nombre] + 0.1}), CARRERAS, 3, 0) != clave
+    assert B.clave(base, CARRERAS, 3, 1) != clave
+    assert B.clave(base, CARRERAS, 4, 0) != clave
+    assert B.clave(base, CARRERAS + 1, 3, 0) != clave
+    monkeypatch.setattr(B, "PHYSICS_VERSION", B.PHYSICS_VERSION + 1)
+    assert B.clave(base, CARRERAS, 3, 0) != clave
+
+
+def test_aplicado_restaura_las_tablas():
+    base = B.parametros_actuales()
+    nombre = "clima.Barro.friction"
+    with B.aplicado(dict(base, **{nombre: 0.5})):
+        assert B.parametros_actuales()[nombre] == 0.5
+    assert B.parametros_actuales() == base
+
+
+def test_memo_en_disco(tmp_path, monkeypatch):
+    path = str(tmp_path / B.BALANCE_FILE)
+    candidatos = [B.parametros_actuales()]
+    primero = B.barrer(candidatos, CARRERAS, procesos=1, cache=B.BalanceCache(path))
+
+    def no_simular(*args, **kw):
+        raise AssertionError("debió salir del caché")
+
+    monkeypatch.setattr(B, "evaluar", no_simular)
+    avances = []
+    segundo = B.barrer(candidatos, CARRERAS, procesos=1, cache=B.BalanceCache(path),
+                       avance=lambda hechos, total: avances.append(hechos))
+    assert segundo == primero
+    assert avances == []
+
+
+def test_pool_igual_que_serie():
+    base = B.parametros_actuales()
+    candidatos = [base, dict(base, **{"raza.Árabe.velocidad": 0.0})]
+    serie = B.barrer(candidatos, CARRERAS, seed=3, procesos=1)
+    pool = B.barrer(candidatos, CARRERAS, seed=3, procesos=2)
+    assert pool == serie
+    # el orden de las celdas es el de las tablas, no el de llegada
+    assert [list(m) for _, m in pool] == [list(m) for _, m in serie]
+    assert [list(m[B.RAZAS[0]]) for _, m in pool] == [B.CLIMAS] * 2
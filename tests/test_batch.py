@@ -0,0 +1,45 @@
+"""El motor vectorizado da el mismo win rate que el escalar."""
+import random
+
+import pytest
+
+from equestrian import sim
+from equestrian.domain import PuraSangre, Yegua
+
+np = pytest.importorskip("numpy")
+from equestrian.sim.batch import nueva_batch  # noqa: E402
+
+ESCALARES = 400
+VECTORIZADAS = 4000
+TOLERANCIA = 0.07  # ~3 desvíos con 400 carreras escalares
+
+
+@pytest.mark.parametrize("cls, clima", [(PuraSangre, "Soleado"), (Yegua, "Barro")])
+def test_win_rate_batch_vs_escalar(cls, clima):
+    caballo = cls("Simulado")
+    rng = random.Random(5)
+    wins = 0
+    for _ in range(ESCALARES):
+        caballo.energia = 100.0
+        state = sim.simular(sim.nueva_carrera(caballo, clima, seed=rng.getrandbits(32),
+                                              jugador_automatico=True))
+        wins += state.won
+    batch = nueva_batch(cls("Simulado"), clima, VECTORIZADAS, seed=5).run()
+    assert batch.finished.all()
+    assert batch.win_rate() == pytest.approx(wins / ESCALARES, abs=TOLERANCIA)
+
+
+def test_batch_misma_semilla():
+    a = nueva_batch(PuraSangre("Luna"), ["Soleado", "Barro"], 500, seed=9).run()
+    b = nueva_batch(PuraSangre("Luna"), ["Soleado", "Barro"], 500, seed=9).run()
+    assert np.array_equal(a.winner, b.winner)
+    assert np.array_equal(a.t, b.t)
+
+
+def test_mas_rivales_que_el_pool():
+    from equestrian.sim.race import OPPONENT_POOL
+
+    rivales = len(OPPONENT_POOL) + 4
+    batch = nueva_batch(PuraSangre("Luna"), "Soleado", 200, rivales=rivales, seed=2)
+    assert batch.shape == (200, rivales + 1)
+    assert batch.run().finished.all()
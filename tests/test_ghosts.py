@@ -0,0 +1,63 @@
+"""Fantasma: interpolación de la trayectoria y mejor tiempo por (jugador, clima)."""
+from array import array
+
+import pytest
+
+from equestrian.services import ghosts as G
+
+
+def _fantasma(tiempo: float, velocidad: float = 50.0, hz: int = 4) -> G.GhostTrajectory:
+    rec = G.GhostRecorder(physics_hz=hz * 2, hz=hz)
+    paso = 1 / (hz * 2)
+    steps = 0
+    while (steps + 1) * paso < tiempo:
+        steps += 1
+        rec.record(steps, steps * paso * velocidad)
+    return rec.cerrar(tiempo, tiempo * velocidad)
+
+
+def test_dist_at_interpola():
+    ghost = G.GhostTrajectory(1.3, array("f", [0.0, 10.0, 30.0, 60.0, 70.0, 100.0]), hz=4)
+    assert ghost.dist_at(-1.0) == 0.0
+    assert ghost.dist_at(0.0) == 0.0
+    assert ghost.dist_at(0.25) == 10.0
+    assert ghost.dist_at(0.125) == pytest.approx(5.0)
+    assert ghost.dist_at(0.625) == pytest.approx(45.0)
+    # tramo final: de la última muestra (t = 1.0) a la meta (t = 1.3)
+    assert ghost.dist_at(1.0) == pytest.approx(70.0)
+    assert ghost.dist_at(1.15) == pytest.approx(85.0)
+    assert ghost.dist_at(1.3) == 100.0
+    assert ghost.dist_at(5.0) == 100.0
+
+
+def test_grabador_a_velocidad_constante():
+    ghost = _fantasma(2.1)
+    for t in (0.0, 0.3, 1.0, 1.9, 2.05, 2.1):
+        assert ghost.dist_at(t) == pytest.approx(t * 50.0, abs=1e-3)
+
+
+def test_solo_se_guarda_si_mejora(tmp_path):
+    path = str(tmp_path / G.GHOSTS_DB)
+    assert G.cargar_fantasma("Luna", "Soleado", path) is None
+    assert G.guardar_fantasma("Luna", "Soleado", _fantasma(2.0), path)
+    assert not G.guardar_fantasma("Luna", "Soleado", _fantasma(2.5), path)
+    assert not G.guardar_fantasma("Luna", "Soleado", _fantasma(2.0), path)
+    assert G.cargar_fantasma("Luna", "Soleado", path).tiempo == 2.0
+    assert G.guardar_fantasma("Luna", "Soleado", _fantasma(1.5), path)
+    mejor = G.cargar_fantasma("Luna", "Soleado", path)
+    assert mejor.tiempo == 1.5 and mejor.dist_at(1.5) == pytest.approx(75.0)
+
+    # cada jugador y cada clima tienen el suyo
+    assert G.guardar_fantasma("Luna", "Barro", _fantasma(3.0), path)
+    assert G.guardar_fantasma("Sol", "Soleado", _fantasma(3.0), path)
+    assert G.cargar_fantasma("Luna", "Soleado", path).tiempo == 1.5
+    assert G.cargar_fantasma("Luna", "Barro", path).tiempo == 3.0
+    assert G.cargar_fantasma("Sol", "Barro", path) is None
+
+
+def test_ruta_relativa_sigue_al_directorio(tmp_path, monkeypatch):
+    for carpeta in ("a", "b"):
+        (tmp_path / carpeta).mkdir()
+        monkeypatch.chdir(tmp_path / carpeta)
+        assert G.guardar_fantasma("Luna", "Soleado", _fantasma(2.0))
+        assert G.cargar_fantasma("Luna", "Soleado").tiempo == 2.0
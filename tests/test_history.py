@@ -0,0 +1,48 @@
+"""Historial en SQLite: orden, límite y migración del JSON viejo."""
+import json
+import os
+
+from equestrian.services import history as H
+
+
+def _entrada(i: int) -> dict:
+    return {"timestamp": f"2025-11-07 10:00:{i:02d}", "jugador": "Luna", "clima": "Soleado",
+            "tiempo": 60.0 + i, "gano": i % 2 == 0}
+
+
+def test_anexar_y_leer_en_orden(tmp_path):
+    path = str(tmp_path / H.HISTORY_DB)
+    for i in range(8):
+        H.append_history(_entrada(i), path)
+    assert [e["tiempo"] for e in H.load_history(path=path)] == [60.0 + i for i in range(8)]
+    # las últimas N, igual en orden cronológico
+    assert [e["tiempo"] for e in H.load_history(limit=3, path=path)] == [65.0, 66.0, 67.0]
+    assert len(H.load_history(limit=50, path=path)) == 8
+
+
+def test_timestamp_por_defecto(tmp_path):
+    path = str(tmp_path / H.HISTORY_DB)
+    H.append_history({"jugador": "Luna"}, path)
+    assert H.load_history(path=path)[0]["timestamp"]
+
+
+def test_migra_el_json_una_sola_vez(tmp_path):
+    with open(tmp_path / H.HISTORY_FILE, "w", encoding="utf-8") as f:
+        json.dump([_entrada(i) for i in range(3)] + ["basura"], f)
+    path = str(tmp_path / H.HISTORY_DB)
+    H.append_history(_entrada(9), path)
+    assert [e["tiempo"] for e in H.load_history(path=path)] == [60.0, 61.0, 62.0, 69.0]
+    assert os.path.exists(tmp_path / H.HISTORY_FILE)  # el JSON no se toca
+
+    # otro proceso (o un `_ready` vacío) no vuelve a importar
+    H._ready.clear()
+    assert len(H.load_history(path=path)) == 4
+
+
+def test_ruta_relativa_sigue_al_directorio(tmp_path, monkeypatch):
+    # la misma ruta relativa en otro directorio es otra base: hay que crearla
+    for carpeta in ("a", "b"):
+        (tmp_path / carpeta).mkdir()
+        monkeypatch.chdir(tmp_path / carpeta)
+        H.append_history(_entrada(1))
+        assert len(H.load_history()) == 1
@@ -0,0 +1,54 @@
+"""Clasificación incremental contra `sorted()` y un filtro por fuerza bruta."""
+import random
+from types import SimpleNamespace
+
+from equestrian.sim.leaderboard import Leaderboard
+
+
+def _campo(n: int, rng: random.Random):
+    # distancias enteras: muchos empates
+    return [SimpleNamespace(name=f"c{i}", dist=float(rng.randint(0, 20))) for i in range(n)]
+
+
+def test_update_igual_que_sorted():
+    rng = random.Random(1)
+    for n in (1, 2, 5, 40):
+        comps = _campo(n, rng)
+        lb = Leaderboard(comps)
+        assert list(lb) == sorted(comps, key=lambda c: c.dist, reverse=True)
+        for _ in range(200):
+            antes = list(lb)
+            for c in rng.sample(comps, rng.randint(0, n)):
+                c.dist += rng.choice((0.0, 1.0, 2.0, 5.0, rng.uniform(0, 3)))
+            changed = lb.update()
+            # sorted es estable: ante empate queda el orden anterior, como en update
+            esperado = sorted(antes, key=lambda c: c.dist, reverse=True)
+            assert list(lb) == esperado
+            assert changed == (esperado != antes)
+            assert lb.leader is esperado[0]
+            assert lb.top(3) == esperado[:3]
+
+
+def test_window_igual_que_filtro():
+    rng = random.Random(2)
+    comps = _campo(60, rng)
+    lb = Leaderboard(comps)
+    for _ in range(300):
+        for c in rng.sample(comps, 10):
+            c.dist += rng.randint(0, 3)
+        lb.update()
+        dists = [c.dist for c in comps]
+        # bordes sobre distancias existentes (cotas inclusivas) y al azar
+        lo = rng.choice(dists + [rng.uniform(-5, 80)])
+        hi = lo + rng.choice((0.0, 1.0, rng.uniform(0, 20)))
+        assert lb.window(lo, hi) == [c for c in lb if lo <= c.dist <= hi]
+    assert lb.window(10.0, 5.0) == []
+    assert lb.window(float("-inf"), float("inf")) == list(lb)
+
+
+def test_first_below():
+    comps = [SimpleNamespace(dist=d) for d in (9.0, 7.0, 7.0, 7.0, 3.0)]
+    lb = Leaderboard(comps)
+    for dist in (10.0, 9.0, 8.0, 7.0, 5.0, 3.0, 1.0):
+        assert lb._first_below(dist, False) == sum(c.dist >= dist for c in comps)
+        assert lb._first_below(dist, True) == sum(c.dist > dist for c in comps)
@@ -0,0 +1,118 @@
+"""Probabilidades: intervalo de Wilson, corte temprano y caché LRU versionado."""
+import json
+from concurrent.futures import Future
+
+import pytest
+
+from equestrian.services import odds as O
+from equestrian.services.balance import aplicado, parametros_actuales
+
+
+def test_wilson():
+    assert O.wilson(0, 0) == (0.0, 0.0, 1.0)
+    p, lo, hi = O.wilson(50, 100)
+    assert p == 0.5
+    assert lo == pytest.approx(0.4038, abs=1e-4) and hi == pytest.approx(0.5962, abs=1e-4)
+    assert O.wilson(0, 100)[1] == 0.0 and O.wilson(0, 100)[2] > 0.0
+    assert O.wilson(100, 100)[2] == pytest.approx(1.0) and O.wilson(100, 100)[1] < 1.0
+    anchos = [hi - lo for _, lo, hi in (O.wilson(n // 4, n) for n in (40, 400, 4000))]
+    assert anchos == sorted(anchos, reverse=True)
+
+
+class _Inmediato:
+    """Pool de mentira: cada tanda ya está terminada al encargarla."""
+
+    def __init__(self):
+        self.tandas = 0
+
+    def submit(self, fn, *args):
+        self.tandas += 1
+        fut = Future()
+        fut.set_result(fn(*args))
+        return fut
+
+
+def _estimador(tmp_path, monkeypatch, p: float):
+    monkeypatch.setattr(O, "simular_tanda", lambda key, races, seed: (int(races * p), races))
+    est = O.OddsEstimator(O.OddsCache(str(tmp_path / O.ODDS_FILE)), workers=1)
+    pool = _Inmediato()
+    monkeypatch.setattr(est, "_executor", lambda: pool)
+    return est, pool
+
+
+def _hasta_terminar(est) -> O.Estimacion:
+    for _ in range(100):
+        e = est.consultar("Árabe", "Yegua", "Soleado")
+        if e.done:
+            return e
+    raise AssertionError("no terminó")
+
+
+@pytest.mark.parametrize("p, carreras", [(0.5, 10000), (0.0, O.CHUNK_RACES)])
+def test_corta_al_llegar_al_ancho(tmp_path, monkeypatch, p, carreras):
+    # ±1 punto con p = 0.5 pide 1.96² · 0.25 / 0.01² ≈ 9604 carreras: 5 tandas
+    est, pool = _estimador(tmp_path, monkeypatch, p)
+    e = _hasta_terminar(est)
+    assert e.n == carreras and pool.tandas == carreras // O.CHUNK_RACES
+    _, lo, hi = e.intervalo
+    assert (hi - lo) / 2 <= O.TARGET_HALF_WIDTH
+
+    # después sale del caché, sin tandas nuevas
+    again = est.consultar("Árabe", "Yegua", "Soleado")
+    assert again.done and (again.wins, again.n) == (e.wins, e.n)
+    assert pool.tandas == carreras // O.CHUNK_RACES
+
+
+def test_rivales_en_la_clave(tmp_path, monkeypatch):
+    pedidas = []
+    monkeypatch.setattr(O, "simular_tanda", lambda key, races, seed: pedidas.append(key[-1]) or (0, races))
+    est = O.OddsEstimator(O.OddsCache(str(tmp_path / O.ODDS_FILE)), workers=1)
+    monkeypatch.setattr(est, "_executor", lambda: _Inmediato())
+    for rivales in (3, 7):
+        while not est.consultar("Árabe", "Yegua", "Soleado", rivales).done:
+            pass
+    assert pedidas == [3, 7]
+    assert est.cache.get(O.odds_key("Árabe", "Yegua", "Soleado", 7)) is not None
+
+
+def test_tope_de_carreras(tmp_path, monkeypatch):
+    monkeypatch.setattr(O, "TARGET_HALF_WIDTH", 0.0)
+    est, _ = _estimador(tmp_path, monkeypatch, 0.3)
+    assert _hasta_terminar(est).n == O.MAX_RACES
+
+
+def _clave(i: int) -> O.OddsKey:
+    return ("Árabe", "Yegua", "Soleado", 1.0, float(i), 3)
+
+
+def test_cache_lru(tmp_path):
+    path = str(tmp_path / O.ODDS_FILE)
+    cache = O.OddsCache(path, max_entries=3)
+    for i in range(3):
+        cache.put(_clave(i), {"wins": i, "n": 10})
+    assert cache.get(_clave(0)) == {"wins": 0, "n": 10}  # pasa al final
+    cache.put(_clave(3), {"wins": 3, "n": 10})
+    assert cache.get(_clave(1)) is None
+    otra = O.OddsCache(path, max_entries=3)
+    assert [otra.get(_clave(i)) is not None for i in range(4)] == [True, False, True, True]
+
+
+def test_cache_versionado(tmp_path, monkeypatch):
+    path = str(tmp_path / O.ODDS_FILE)
+    O.OddsCache(path).put(_clave(0), {"wins": 1, "n": 10})
+    assert O.OddsCache(path).get(_clave(0)) == {"wins": 1, "n": 10}
+
+    # otra física
+    with monkeypatch.context() as m:
+        m.setattr(O, "PHYSICS_VERSION", O.PHYSICS_VERSION + 1)
+        assert O.OddsCache(path).get(_clave(0)) is None
+
+    # otras tablas de balance
+    with aplicado(dict(parametros_actuales(), **{"clima.Barro.friction": 0.5})):
+        assert O.OddsCache(path).get(_clave(0)) is None
+    assert O.OddsCache(path).get(_clave(0)) is not None
+
+    # formato viejo: lista sin versión
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([[list(_clave(0)), {"wins": 1, "n": 10}]], f)
+    assert O.OddsCache(path).get(_clave(0)) is None
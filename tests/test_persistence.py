@@ -0,0 +1,52 @@
+"""Snapshot + journal del progreso."""
+import json
+
+import pytest
+
+from equestrian.services import persistence as P
+
+
+@pytest.fixture
+def carpeta(tmp_path, monkeypatch):
+    """Directorio propio y sin hilo escritor (el estado del módulo es global)."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(P, "_writer", None)
+    monkeypatch.setattr(P, "_known", None)
+    yield tmp_path
+    P.flush_progreso()
+
+
+def _escribir(snapshot, lineas):
+    with open(P.SAVE_FILE, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    with open(P.JOURNAL_FILE, "w", encoding="utf-8") as f:
+        f.write("".join(lineas))
+
+
+def test_journal_con_linea_cortada(carpeta):
+    _escribir({"a": 1, "b": 1}, ['{"set":{"b":2}}\n', '{"del":["a"]}\n', '{"set":{"c":'])
+    assert P.cargar_progreso() == {"b": 2}
+    data, aplicados, cortado = P._leer_disco()
+    assert aplicados == 2 and cortado
+
+    # el primer guardado compacta antes de anexar: no queda la línea rota
+    P.guardar_progreso({"b": 2, "d": 4})
+    P.flush_progreso()
+    data, _, cortado = P._leer_disco()
+    assert data == {"b": 2, "d": 4}
+    assert not cortado
+
+
+def test_guardar_y_compactar(carpeta):
+    for i in range(P.COMPACT_EVERY + 3):
+        P.guardar_progreso({"n": i, "fijo": [1, 2]})
+    # sin esperar al hilo: devuelve lo último encolado, en una copia propia
+    leido = P.cargar_progreso()
+    assert leido == {"n": P.COMPACT_EVERY + 2, "fijo": [1, 2]}
+    leido["fijo"].append(3)
+    assert P.cargar_progreso()["fijo"] == [1, 2]
+
+    P.flush_progreso(compactar=True)
+    with open(P.SAVE_FILE, encoding="utf-8") as f:
+        assert json.load(f) == {"n": P.COMPACT_EVERY + 2, "fijo": [1, 2]}
+    assert (carpeta / P.JOURNAL_FILE).stat().st_size == 0
@@ -0,0 +1,72 @@
+"""Perfil de frames: buffer circular, percentiles y traza CSV."""
+import csv
+import os
+
+from equestrian.game import profiler as P
+
+
+def _perfil(monkeypatch, tiempos, phases=P.RACE_PHASES, capacity=P.CAPACITY):
+    """Un frame por elemento de `tiempos` (ms por fase); el reloj es de mentira."""
+    reloj = [0]
+    monkeypatch.setattr(P.time, "perf_counter_ns", lambda: reloj[0])
+    prof = P.FrameProfiler(phases, capacity)
+    for fases in tiempos:
+        prof.begin_frame()
+        for phase, ms in zip(phases, fases):
+            reloj[0] += int(ms * 1e6)
+            prof.mark(phase)
+        prof.end_frame()
+    return prof
+
+
+def test_percentiles_por_rango(monkeypatch):
+    prof = _perfil(monkeypatch, [[float(ms)] for ms in range(1, 101)], phases=("todo",))
+    assert prof.percentiles() == [50.0, 95.0, 99.0]
+    assert prof.percentiles((0, 100)) == [1.0, 100.0]
+    assert prof.percentiles(last=10) == [95.0, 100.0, 100.0]
+    assert P.FrameProfiler(("todo",)).percentiles() == [0.0, 0.0, 0.0]
+
+
+def test_buffer_circular(monkeypatch):
+    prof = _perfil(monkeypatch, [[float(ms), 1.0] for ms in range(1, 11)], phases=("a", "b"), capacity=4)
+    assert len(prof) == 4
+    # sólo quedan los últimos 4, del más viejo al más nuevo
+    assert [list(r) for r in prof.rows()] == [[int((ms + 1) * 1e6), int(ms * 1e6), 1_000_000] for ms in (7, 8, 9, 10)]
+    assert prof.percentiles((50, 100)) == [9.0, 11.0]
+    assert prof.phase_means() == {"a": 8.5, "b": 1.0}
+
+    # un frame sin end_frame no cuenta y se pisa en el próximo
+    prof.begin_frame()
+    prof.mark("a")
+    assert len(list(prof.rows())) == 4
+    prof.begin_frame()
+    prof.end_frame()
+    assert list(prof.rows())[-1].tolist() == [0, 0, 0]
+
+
+def test_csv_de_la_carrera(tmp_path, monkeypatch):
+    fases = [i + 0.5 for i in range(len(P.RACE_PHASES))]
+    prof = _perfil(monkeypatch, [fases] * 5, capacity=3)
+    path = str(tmp_path / "traza.csv")
+    prof.dump_csv(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        filas = list(csv.reader(f))
+    assert filas[0] == ["frame", "total_ms", "eventos_ms", "física_ms", "animación_ms", "fondo_ms",
+                        "sprites_ms", "HUD_ms", "perfil_ms", "flip_ms"]
+    assert [f[0] for f in filas[1:]] == ["2", "3", "4"]
+    assert filas[1][1:] == [f"{sum(fases):.3f}"] + [f"{ms:.3f}" for ms in fases]
+
+
+def test_una_traza_por_carrera(tmp_path):
+    paths = []
+    for i in range(5):
+        path = P.trace_path(str(tmp_path))
+        while path in paths:  # dos carreras en el mismo milisegundo
+            path = P.trace_path(str(tmp_path))
+        open(path, "w").close()
+        paths.append(path)
+    assert paths == sorted(paths)
+    assert all(os.path.basename(p).startswith(P.TRACE_PREFIX) for p in paths)
+    open(tmp_path / "otro.csv", "w").close()
+    P.prune_traces(str(tmp_path), keep=2)
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(p) for p in paths[-2:]] + ["otro.csv"])
@@ -0,0 +1,49 @@
+"""Registro de entradas y re-simulación exacta."""
+import json
+import random
+
+from equestrian import sim
+from equestrian.domain import PuraSangre, crear_caballo
+
+
+def _jugar(seed: int, elenco=None):
+    """Carrera a 120 Hz con taps y agua al azar, registrada como en `_carrera`."""
+    rng = random.Random(seed)
+    state = sim.nueva_carrera(PuraSangre("Luna"), "Ventoso", rivales=3, seed=seed, elenco=elenco)
+    rec = sim.InputRecorder(state, len(state.competitors) - 1, elenco)
+    while not state.finished:
+        inputs = sim.RaceInputs(taps=rng.random() < 0.05, agua=rng.random() < 0.002)
+        if inputs.taps or inputs.agua:
+            rec.aplicar(state.steps + 1, inputs)
+        sim.step(state, sim.PHYSICS_DT, inputs)
+    # el registro va al historial como JSON
+    return state, json.loads(json.dumps(rec.log(state)))
+
+
+def test_registro_y_verificacion():
+    for seed in (1, 2, 3):
+        state, log = _jugar(seed)
+        assert log["taps"]
+        res = sim.verificar(log)
+        assert res.ok, res.motivo
+        assert res.tiempo == state.t
+        assert res.pasos == state.steps
+
+
+def test_registro_con_elenco():
+    elenco = [crear_caballo(n, "Árabe", "Macho") for n in ("Brisa", "Trueno")]
+    _, log = _jugar(4, elenco)
+    assert sim.verificar(log).ok
+
+
+def test_registro_alterado():
+    _, log = _jugar(5)
+    assert not sim.verificar(dict(log, tiempo=log["tiempo"] - 0.5)).ok
+    assert not sim.verificar(dict(log, ranking=list(reversed(log["ranking"])))).ok
+    assert not sim.verificar(dict(log, taps=log["taps"][:len(log["taps"]) // 2])).ok
+
+
+def test_otra_fisica_se_omite():
+    _, log = _jugar(6)
+    res = sim.verificar(dict(log, fisica=1))
+    assert res.ok and res.omitida
@@ -0,0 +1,52 @@
+"""Temporada: reparto en series y puntos de una fecha."""
+import time
+
+from equestrian.domain import PuraSangre
+from equestrian.services.season import PUNTOS, SERIE, Temporada, armar_series
+
+
+def test_armar_series():
+    for n in range(1, 3 * SERIE + 2):
+        orden = list(range(100, 100 + n))
+        series = armar_series(orden)
+        assert [i for s in series for i in s] == orden
+        largos = [len(s) for s in series]
+        assert max(largos) <= SERIE
+        assert max(largos) - min(largos) <= 1
+        assert len(series) == -(-n // SERIE)
+
+
+def _puntos(puesto: int) -> int:
+    return PUNTOS[puesto] if puesto < len(PUNTOS) else 0
+
+
+def test_fecha_reparte_puntos():
+    temporada = Temporada.nueva("Luna", caballos=20, seed=4)
+    try:
+        assert [len(s) for s in temporada.series] == [7, 7, 6]
+        serie = temporada.series[temporada.serie_jugador]
+        rivales, _ = temporada.preparar_serie(PuraSangre("Luna"), "Soleado")
+        assert len(rivales) == len(serie) - 1
+
+        assert not temporada.registrar([0, 1])  # no es esta serie
+        # el jugador llega segundo, detrás del último rival
+        orden = [len(serie) - 1, 0] + list(range(1, len(serie) - 1))
+        assert temporada.registrar(orden)
+
+        limite = time.monotonic() + 60
+        while not temporada.actualizar():
+            assert time.monotonic() < limite, "el pool no devolvió las series"
+            time.sleep(0.05)
+    finally:
+        temporada.cerrar()
+
+    assert temporada.fecha == 1 and temporada.lista
+    inscriptos = temporada.inscriptos
+    assert all(i.carreras == 1 for i in inscriptos)
+    assert sum(i.victorias for i in inscriptos) == 3
+    assert sum(i.puntos for i in inscriptos) == sum(_puntos(p) for n in (7, 7, 6) for p in range(n))
+    jugador = next(i for i in inscriptos if i.jugador)
+    assert jugador.puntos == _puntos(1) and jugador.victorias == 0
+    # la fecha siguiente se arma por tabla: el puntero corre en la primera serie
+    lider = temporada.tabla()[0]
+    assert inscriptos.index(lider) in temporada.series[0]
@@ -0,0 +1,76 @@
+"""Física sin ventana: determinismo, entradas del jugador y motores equivalentes."""
+import pytest
+
+from equestrian import sim
+from equestrian.domain import PuraSangre, Yegua
+from equestrian.sim.race import WATER_BONUS, WATER_USES
+
+SEMILLAS = range(12)
+CLIMAS = ("Soleado", "Barro")
+
+
+def _carrera(seed: int, clima: str = "Soleado") -> sim.RaceState:
+    return sim.nueva_carrera(PuraSangre("Luna"), clima, seed=seed, jugador_automatico=True)
+
+
+def _ranking(state: sim.RaceState):
+    return [c.name for c in state.ranking]
+
+
+def test_misma_semilla_misma_carrera():
+    a = sim.simular(_carrera(7), dt=sim.PHYSICS_DT)
+    b = sim.simular(_carrera(7), dt=sim.PHYSICS_DT)
+    assert a.finished and a.t == b.t and a.steps == b.steps
+    assert _ranking(a) == _ranking(b)
+    assert [c.dist for c in a.competitors] == [c.dist for c in b.competitors]
+
+
+def test_taps_del_jugador():
+    con, sin = (sim.nueva_carrera(PuraSangre("Luna"), "Soleado", seed=3) for _ in range(2))
+    sim.step(con, sim.PHYSICS_DT, sim.RaceInputs(taps=3))
+    sim.step(sin, sim.PHYSICS_DT)
+    assert con.player.tap_meter > sin.player.tap_meter
+    assert con.player.combo > sin.player.combo
+    assert con.player.energia < sin.player.energia
+    assert con.player.speed > sin.player.speed
+    # los rivales no dependen de las entradas del jugador
+    assert [c.dist for c in con.competitors[1:]] == [c.dist for c in sin.competitors[1:]]
+
+
+def test_agua_limitada():
+    state = sim.nueva_carrera(Yegua("Luna"), "Soleado", seed=3)
+    state.player.energia = 40.0
+    sim.step(state, sim.PHYSICS_DT, sim.RaceInputs(agua=1))
+    assert state.agua == WATER_USES - 1
+    assert state.player.energia == pytest.approx(40.0 + WATER_BONUS, abs=0.5)
+
+    # con la energía llena no se gasta
+    state.player.energia = 100.0
+    sim.step(state, sim.PHYSICS_DT, sim.RaceInputs(agua=1))
+    assert state.agua == WATER_USES - 1
+
+    state.player.energia = 10.0
+    sim.step(state, sim.PHYSICS_DT, sim.RaceInputs(agua=WATER_USES + 3))
+    assert state.agua == 0
+    energia = state.player.energia
+    sim.step(state, sim.PHYSICS_DT, sim.RaceInputs(agua=1))
+    assert state.agua == 0
+    assert state.player.energia <= energia + 1.0  # sólo la regeneración del paso
+
+
+@pytest.mark.parametrize("clima", CLIMAS)
+def test_ranking_no_depende_del_dt(clima):
+    for seed in SEMILLAS:
+        rankings = [_ranking(sim.simular(_carrera(seed, clima), dt=dt))
+                    for dt in (sim.PHYSICS_DT, 1 / 30, sim.OFFLINE_DT)]
+        assert rankings[0] == rankings[1] == rankings[2], f"semilla {seed}"
+
+
+@pytest.mark.parametrize("clima", CLIMAS)
+def test_eventos_igual_que_pasos(clima):
+    for seed in SEMILLAS:
+        pasos = sim.simular(_carrera(seed, clima), dt=sim.PHYSICS_DT)
+        eventos = sim.simular_eventos(_carrera(seed, clima))
+        assert _ranking(eventos) == _ranking(pasos), f"semilla {seed}"
+        # la llegada por eventos es exacta; la interpolada, casi
+        assert eventos.t == pytest.approx(pasos.t, abs=0.05)
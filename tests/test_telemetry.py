@@ -0,0 +1,51 @@
+"""Archivo de telemetría: anexado, lectura con mmap y cola cortada."""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from equestrian.services import telemetry as T
+
+
+@pytest.fixture
+def archivo(tmp_path, monkeypatch):
+    monkeypatch.setattr(T, "_fin_conocido", {})
+    return str(tmp_path / T.TELEMETRY_FILE)
+
+
+def _carrera(muestras: int, nombres=("Luna", "Brisa")) -> T.TelemetryRecorder:
+    rec = T.TelemetryRecorder(nombres, 0.5)
+    for i in range(muestras):
+        rec.record(i * 0.5, [SimpleNamespace(speed=i + k, energia=100 - i) for k in range(len(nombres))])
+    return rec
+
+
+def test_anexar_y_leer(archivo):
+    _carrera(3).guardar(archivo)
+    _carrera(5, ["Luna"]).guardar(archivo)
+    with T.TelemetryFile(archivo) as tf:
+        assert len(tf) == 2
+        assert tf[0].names == ["Luna", "Brisa"]
+        assert list(tf[0].column("vel", 1)) == [1.0, 2.0, 3.0]
+        assert list(tf[1].column("t")) == [0.0, 0.5, 1.0, 1.5, 2.0]
+        assert tf.end == os.path.getsize(archivo)
+
+
+def test_cola_cortada_se_descarta_al_anexar(archivo, monkeypatch):
+    _carrera(4).guardar(archivo)
+    sano = os.path.getsize(archivo)
+    with open(archivo, "ab") as f:
+        f.write(b"EQTR\x01")  # el juego se cerró escribiendo la cabecera
+    with T.TelemetryFile(archivo) as tf:
+        assert len(tf) == 1 and tf.end == sano
+
+    # otro proceso (sin fin conocido) y este mismo proceso: ambos lo notan
+    for fin in ({}, dict(T._fin_conocido)):
+        monkeypatch.setattr(T, "_fin_conocido", fin)
+        _carrera(2).guardar(archivo)
+        with T.TelemetryFile(archivo) as tf:
+            assert tf.end == os.path.getsize(archivo)
+            assert [r.samples for r in tf] == [4, 2]
+        os.truncate(archivo, sano)
+        with open(archivo, "ab") as f:
+            f.write(b"EQTR\x01")